@@ -1,10 +1,22 @@
 import copy
-from typing import Any, Dict, List
+import tracemalloc
+from dataclasses import field, make_dataclass
+from typing import Any, Callable, Dict, List
 
+import yaml
 from pytest import fixture, mark, param
 
-from omegaconf import OmegaConf
+from omegaconf import (
+    AnyNode,
+    OmegaConf,
+    grammar_compiler,
+    grammar_parser,
+    open_dict,
+)
 from omegaconf._utils import ValueKind, _is_missing_literal, get_value_kind, split_key
+from omegaconf.grammar_parser import OmegaConfGrammarLexer, OmegaConfGrammarParser
+from omegaconf.grammar_visitor import GrammarVisitor
+from omegaconf.vendor.antlr4.dfa.DFA import DFA
 
 
 def build_dict(
@@ -26,6 +38,19 @@ def build_list(length: int, val: Any = 1) -> List[int]:
     return [val] * length
 
 
+def bytes_per_node(build: Callable[[], Any], nodes: int) -> float:
+    """Return the memory allocated by `build()` (and kept alive), divided by `nodes`."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del obj
+    return (after - before) / nodes
+
+
 @fixture(scope="module")
 def large_dict() -> Any:
     return build_dict({}, 11, 2)
@@ -189,3 +214,347 @@ def test_update_force_add(
     recursive_is_struct(cfg)
 
     benchmark(OmegaConf.update, cfg, key, 10, force_add=force_add)
+
+
+@mark.parametrize("cache_size", [param(0, id="no_cache"), param(4096, id="cache")])
+def test_access_interpolation(cache_size: int, benchmark: Any) -> None:
+    cfg = OmegaConf.create({"a": 1, "b": "${a}", "c": "x_${a}_${b}"})
+    grammar_parser.set_parse_cache_size(cache_size)
+    try:
+        benchmark(lambda: (cfg.b, cfg.c))
+    finally:
+        grammar_parser.set_parse_cache_size(grammar_parser.DEFAULT_PARSE_CACHE_SIZE)
+
+
+@mark.parametrize("value", ["${a.b}", "${foo:bar,baz}", "prefix_${x}_suffix"])
+@mark.parametrize(
+    "compile_function",
+    [
+        param(grammar_compiler.compile_simple, id="fast_path"),
+        param(grammar_parser._parse, id="antlr"),
+    ],
+)
+def test_compile_simple_interpolation(
+    compile_function: Any, value: str, benchmark: Any
+) -> None:
+    if compile_function is grammar_parser._parse:
+        benchmark(compile_function, value, "configValue", "DEFAULT_MODE")
+    else:
+        assert benchmark(compile_function, value) is not None
+
+
+@mark.parametrize("use_plan", [param(False, id="visitor"), param(True, id="plan")])
+def test_resolve_parse_tree(use_plan: bool, benchmark: Any) -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}, "k": "b"})
+    tree = grammar_parser.parse("${a.${k}}_${oc.env:HOME,'x'}")
+    node = AnyNode(None, parent=cfg)
+
+    def visit() -> Any:
+        return GrammarVisitor(
+            node_interpolation_callback=lambda inter_key, memo: (
+                cfg._resolve_node_interpolation(inter_key=inter_key, memo=memo)
+            ),
+            resolver_interpolation_callback=lambda name, args, args_str: (
+                cfg._evaluate_custom_resolver(
+                    key=None,
+                    node=node,
+                    inter_type=name,
+                    inter_args=args,
+                    inter_args_str=args_str,
+                )
+            ),
+            memo=None,
+        ).visit(tree)
+
+    if use_plan:
+        benchmark(cfg.resolve_parse_tree, tree, node=node)
+    else:
+        benchmark(visit)
+
+
+@mark.parametrize(
+    "shared_dfa",
+    [param(False, id="cold_process"), param(True, id="new_thread")],
+)
+def test_cold_parse(shared_dfa: bool, benchmark: Any) -> None:
+    # First parse in a new thread, i.e. without the thread-local lexer / parser.
+    # With `cold_process`, the DFA shared by all threads is also discarded, as
+    # if it was the first parse in the process (see `grammar_parser.warm_up()`).
+    lexer_dfa = OmegaConfGrammarLexer.decisionsToDFA
+    parser_dfa = OmegaConfGrammarParser.decisionsToDFA
+
+    def setup() -> None:
+        grammar_parser._grammar_cache.__dict__.clear()
+        if not shared_dfa:
+            for cls in OmegaConfGrammarLexer, OmegaConfGrammarParser:
+                cls.decisionsToDFA = [
+                    DFA(ds, i) for i, ds in enumerate(cls.atn.decisionToState)
+                ]
+
+    grammar_parser.warm_up()
+    try:
+        benchmark.pedantic(
+            grammar_parser._parse,
+            args=("${foo:${bar},[1,2],{a:'b'}}", "configValue", "DEFAULT_MODE"),
+            setup=setup,
+            rounds=100,
+        )
+    finally:
+        OmegaConfGrammarLexer.decisionsToDFA = lexer_dfa
+        OmegaConfGrammarParser.decisionsToDFA = parser_dfa
+        grammar_parser._grammar_cache.__dict__.clear()
+
+
+@mark.parametrize("value", ["${a:${b},[1,2],{k:${c}}}", "x_${a.${b}}_${oc.env:X,'d'}"])
+@mark.parametrize("strategy", list(grammar_parser.ParseStrategy), ids=lambda s: s.name)
+def test_parse_strategy(
+    strategy: grammar_parser.ParseStrategy, value: str, benchmark: Any
+) -> None:
+    grammar_parser.warm_up()
+    grammar_parser.set_parse_strategy(strategy)
+    try:
+        benchmark(grammar_parser._parse, value, "configValue", "DEFAULT_MODE")
+    finally:
+        grammar_parser.set_parse_strategy(grammar_parser.ParseStrategy.LL)
+
+
+@mark.parametrize("memoized", [param(False, id="plain"), param(True, id="memoized")])
+def test_access_memoized_interpolation(memoized: bool, benchmark: Any) -> None:
+    cfg = OmegaConf.create(
+        {"a": {"b": {"c": 1}}, "x": "${a.b.c}", "y": "http://${x}:${a.b.c}/${x}"}
+    )
+    OmegaConf.set_memoized(cfg, memoized)
+    benchmark(lambda: (cfg.x, cfg.y))
+
+
+def test_analyze(benchmark: Any) -> None:
+    cfg = OmegaConf.create(
+        {
+            "paths": {"root": "/data"},
+            "groups": [
+                {f"k{i}": f"${{paths.root}}/{i}", "ref": f"${{.k{i}}}"}
+                for i in range(5000)
+            ],
+        }
+    )
+    report = benchmark(OmegaConf.analyze, cfg)
+    assert len(report.resolution_order) == 10000
+
+
+@mark.parametrize("size", [1000, 5000])
+def test_resolve_fan_in(size: int, benchmark: Any) -> None:
+    data = {
+        "paths": {"root": "/data", "out": "${.root}/out"},
+        "leaves": {f"k{i}": f"${{paths.out}}/{i}" for i in range(size)},
+    }
+    benchmark.pedantic(
+        OmegaConf.resolve, setup=lambda: ((OmegaConf.create(data),), {}), rounds=10
+    )
+
+
+@mark.parametrize("leaf_value", [param(1, id="int"), param("${key_0}", id="inter")])
+def test_create_memory(leaf_value: Any, benchmark: Any) -> None:
+    data = build_dict({}, 0, 10000, leaf_value=leaf_value)
+    benchmark.extra_info["bytes_per_leaf"] = bytes_per_node(
+        lambda: OmegaConf.create(data), 10000
+    )
+    benchmark(OmegaConf.create, data)
+
+
+# A structured config with 1000 `int` fields.
+Structured1000 = make_dataclass(
+    "Structured1000", [(f"key_{i}", int, field(default=i)) for i in range(1000)]
+)
+
+
+@mark.parametrize(
+    "data, nodes",
+    [
+        param(build_dict({}, 0, 10000), 10000, id="dict"),
+        param(build_list(10000), 10000, id="list"),
+        param(Structured1000, 1000, id="structured"),
+    ],
+)
+def test_node_memory(data: Any, nodes: int, benchmark: Any) -> None:
+    benchmark.extra_info["bytes_per_node"] = bytes_per_node(
+        lambda: OmegaConf.create(data), nodes
+    )
+    benchmark(OmegaConf.create, data)
+
+
+@mark.parametrize("lazy", [param(False, id="eager"), param(True, id="lazy")])
+@mark.parametrize(
+    "data, leaves",
+    [
+        param(build_dict({}, 0, 10000), 10000, id="dict"),
+        param(build_list(10000), 10000, id="list"),
+        param(build_dict({}, 3, 10), 10000, id="nested"),
+    ],
+)
+def test_create_lazy_leaves(data: Any, leaves: int, lazy: bool, benchmark: Any) -> None:
+    flags = {"lazy": lazy}
+    benchmark.extra_info["bytes_per_leaf"] = bytes_per_node(
+        lambda: OmegaConf.create(data, flags=flags), leaves
+    )
+    benchmark(OmegaConf.create, data, flags=flags)
+
+
+@fixture(scope="module")
+def catalog_1m() -> Any:
+    # 1000 subtrees of 1000 leaves, e.g. a model zoo or a dataset catalog.
+    return build_dict({}, 1, 1000)
+
+
+@fixture(scope="module")
+def catalog_1m_yaml(catalog_1m: Any, tmp_path_factory: Any) -> Any:
+    path = tmp_path_factory.mktemp("catalog") / "catalog.yaml"
+    path.write_text(yaml.dump(catalog_1m))
+    return path
+
+
+@mark.parametrize("lazy", [param(False, id="eager"), param(True, id="lazy")])
+@mark.parametrize("source", ["create", "load"])
+def test_time_to_first_access(
+    source: str,
+    lazy: bool,
+    catalog_1m: Any,
+    catalog_1m_yaml: Any,
+    benchmark: Any,
+) -> None:
+    flags = {"lazy": lazy}
+
+    def first_access() -> Any:
+        if source == "create":
+            cfg = OmegaConf.create(catalog_1m, flags=flags)
+        else:
+            cfg = OmegaConf.load(
+                catalog_1m_yaml, flags=flags, max_yaml_expanded_nodes=None
+            )
+        return cfg.key_500.key_500
+
+    assert benchmark.pedantic(first_access, rounds=1) == 1
+
+
+@mark.parametrize(
+    "copy_function",
+    [param(copy.copy, id="copy_on_write"), param(copy.deepcopy, id="deepcopy")],
+)
+def test_copy_and_modify(
+    copy_function: Any, large_dict_config: Any, benchmark: Any
+) -> None:
+    def copy_and_modify() -> None:
+        cfg = copy_function(large_dict_config)
+        cfg.key_0.key_0.key_0.key_0 = {"key_0": 2}
+        cfg.key_1.key_1.key_1 = 2
+
+    benchmark(copy_and_modify)
+
+
+@mark.parametrize("shared", [param(False, id="merge"), param(True, id="with_updates")])
+def test_derive_variant(shared: bool, large_dict: Any, benchmark: Any) -> None:
+    base = OmegaConf.create(large_dict)
+    if shared:
+        OmegaConf.set_readonly(base, True)
+
+        def derive() -> Any:
+            return OmegaConf.with_updates(base, {"key_0.key_1.key_0": 2})
+
+    else:
+
+        def derive() -> Any:
+            return OmegaConf.merge(base, {"key_0": {"key_1": {"key_0": 2}}})
+
+    benchmark.extra_info["bytes_per_variant"] = bytes_per_node(
+        lambda: [derive() for _ in range(10)], 10
+    )
+    benchmark(derive)
+
+
+def cache_flags(node: Any) -> None:
+    """Fill the flags cache of all the nodes of a config."""
+    node._get_flag("struct")
+    if OmegaConf.is_dict(node):
+        for key in node:
+            cache_flags(node._get_node(key))
+
+
+@mark.parametrize("cached", [param(False, id="uncached"), param(True, id="cached")])
+def test_open_dict(cached: bool, large_dict_config: Any, benchmark: Any) -> None:
+    def enter_and_exit() -> None:
+        with open_dict(large_dict_config):
+            pass
+
+    setup = (lambda: cache_flags(large_dict_config)) if cached else None
+    benchmark.pedantic(enter_and_exit, setup=setup, rounds=100)
+
+
+@fixture(scope="module")
+def dict_100k() -> Any:
+    return build_dict({}, 0, 100000)
+
+
+def test_create_100k_leaves(dict_100k: Any, benchmark: Any) -> None:
+    benchmark.pedantic(OmegaConf.create, (dict_100k,), rounds=5)
+
+
+@fixture(scope="module")
+def layered_configs() -> Any:
+    # Defaults, 8 overlay files overriding all their keys, and command line overrides.
+    defaults = OmegaConf.create(build_dict({}, 2, 10))
+    overlays = [OmegaConf.create(build_dict({}, 2, 10, leaf_value=i)) for i in range(8)]
+    cli = OmegaConf.from_dotlist([f"key_{i}.key_0.key_0={i}" for i in range(10)])
+    return [defaults, *overlays, cli]
+
+
+@mark.parametrize("folded", [param(False, id="pairwise"), param(True, id="folded")])
+def test_merge_layers(folded: bool, layered_configs: Any, benchmark: Any) -> None:
+    defaults, *others = layered_configs
+
+    def pairwise_merge() -> Any:
+        # The configs merged one after the other, without folding them first.
+        target = copy.deepcopy(defaults)
+        target._merge_with(*others)
+        return target
+
+    if folded:
+        benchmark(OmegaConf.merge, *layered_configs)
+    else:
+        benchmark(pairwise_merge)
+
+
+@mark.parametrize("prepared", [param(False, id="merge"), param(True, id="prepared")])
+def test_prepared_merge(prepared: bool, merge_data: Any, benchmark: Any) -> None:
+    schema, *others = merge_data
+    if prepared:
+        benchmark(OmegaConf.prepare_merge(schema).merge, *others)
+    else:
+        benchmark(OmegaConf.merge, schema, *others)
+
+
+@fixture
+def updated_variant(large_dict_config: Any) -> Any:
+    return OmegaConf.with_updates(large_dict_config, {"key_0.key_0.key_0": "updated"})
+
+
+@mark.parametrize(
+    "other",
+    [param("unshared", id="unshared"), param("variant", id="copy_on_write_variant")],
+)
+def test_diff(
+    other: str, large_dict_config: Any, updated_variant: Any, benchmark: Any
+) -> None:
+    if other == "unshared":
+        updated_variant = OmegaConf.create(OmegaConf.to_container(updated_variant))
+    benchmark(OmegaConf.diff, large_dict_config, updated_variant)
+
+
+@mark.parametrize("apply", [param(False, id="merge"), param(True, id="apply_patch")])
+def test_apply_patch(
+    apply: bool, large_dict_config: Any, updated_variant: Any, benchmark: Any
+) -> None:
+    patch = OmegaConf.diff(large_dict_config, updated_variant)
+    cfg = copy.deepcopy(large_dict_config)
+    if apply:
+        benchmark(OmegaConf.apply_patch, cfg, patch)
+    else:
+        benchmark.pedantic(OmegaConf.merge, (cfg, updated_variant), rounds=3)
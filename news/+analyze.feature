@@ -0,0 +1 @@
+Add `OmegaConf.analyze()` to report the references, resolvers, dangling references and cycles of the interpolations of a config without resolving them
@@ -0,0 +1 @@
+Custom resolvers can be coroutine functions, awaited by the new `OmegaConf.resolve_async()` and `OmegaConf.to_container_async()`
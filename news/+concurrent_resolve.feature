@@ -0,0 +1 @@
+Add `OmegaConf.resolve(cfg, executor=...)` to run independent calls to custom resolvers registered with `thread_safe=True` concurrently
@@ -0,0 +1 @@
+`copy.copy()` and `copy()` of `DictConfig` and `ListConfig` now return copy-on-write copies, sharing the nodes of the original config until they are accessed
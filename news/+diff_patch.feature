@@ -0,0 +1 @@
+Add `OmegaConf.diff()` and `OmegaConf.apply_patch()`, computing a serializable patch of the key paths added, removed or changed between two configs and applying it in place
@@ -0,0 +1 @@
+Add ``grammar_parser.warm_up()`` to build the (process-wide) ANTLR parsing tables ahead of time, reducing the latency of the first interpolations parsed in a process
@@ -0,0 +1 @@
+Add `omegaconf.counters`, opt-in counters of parses, parse cache hits, selections, node creations and copies, merges and container conversions
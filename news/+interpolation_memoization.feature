@@ -0,0 +1 @@
+Add `OmegaConf.set_memoized()` to memoize resolved interpolations until the nodes they depend on are modified
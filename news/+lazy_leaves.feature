@@ -0,0 +1 @@
+Add a `lazy` flag storing the primitive values of untyped configs without wrapping them in nodes until needed, making the creation of large configs faster and the configs smaller
@@ -0,0 +1 @@
+With the `lazy` flag, nested dicts and lists are only converted to configs when first accessed, and `OmegaConf.load()` accepts `flags`
@@ -0,0 +1 @@
+Interpolation parse trees are now cached in a process-wide, size-bounded LRU cache (see omegaconf.grammar_parser.set_parse_cache_size()).
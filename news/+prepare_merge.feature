@@ -0,0 +1 @@
+Add `OmegaConf.prepare_merge()`, preparing a config (e.g. a structured config schema) to be merged with many other configs faster than with `OmegaConf.merge()`
@@ -0,0 +1 @@
+Resolver caches can be bounded (`cache_max_size`), expire their outputs (`cache_ttl`) and be shared by all configs (`shared_cache`), and report hit, miss, eviction and expiration counters
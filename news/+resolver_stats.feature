@@ -0,0 +1 @@
+Add opt-in per-resolver call statistics (calls, cache hits, errors, wall time) with `OmegaConf.enable_resolver_stats()`, `OmegaConf.resolver_stats()` and `omegaconf.resolver_stats.add_callback()`
@@ -0,0 +1 @@
+Add an opt-in two-stage parse strategy (``grammar_parser.set_parse_strategy(ParseStrategy.SLL)``) that parses interpolations in ANTLR's faster SLL mode, falling back to full LL parsing only on failure
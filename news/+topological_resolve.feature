@@ -0,0 +1 @@
+`OmegaConf.resolve()` now resolves each interpolation once, after the interpolations it depends on, and reports cycles between interpolations before resolving anything
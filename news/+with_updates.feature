@@ -0,0 +1 @@
+Add `OmegaConf.with_updates()`, returning a readonly variant of a config that shares its untouched subtrees with the config; `OmegaConf.merge()` of a readonly config shares them too
@@ -0,0 +1,114 @@
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from . import resolver_stats
+
+T = TypeVar("T")
+
+# Resolution with asynchronous resolvers (see `OmegaConf.resolve_async()`).
+#
+# Interpolations are always resolved synchronously. When an asynchronous resolver is
+# called during `run()`, the resolution is aborted (with `AwaitRequired`), the
+# awaitable returned by the resolver is awaited, and the resolution starts over.
+# Results of all resolver calls made so far are recorded in a `Replay`, so that each
+# resolver is called once: on the next attempt, the n-th call of a resolver with the
+# same arguments returns the n-th result recorded for them instead of calling the
+# resolver again. Calls are identified by their arguments rather than by their
+# position, as cached resolvers may not be called on every attempt.
+
+# (resolver name, arguments as strings)
+CallKey = Tuple[str, Tuple[str, ...]]
+
+
+class Replay:
+    __slots__ = ("results", "positions")
+
+    def __init__(self) -> None:
+        self.results: Dict[CallKey, List[Any]] = {}
+        # Number of calls made with each key in the current attempt.
+        self.positions: Dict[CallKey, int] = {}
+
+    def record(self, key: CallKey, result: Any) -> None:
+        self.results.setdefault(key, []).append(result)
+
+
+class Failure:
+    """An exception raised by an awaitable, to be re-raised when replayed."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+
+
+class AwaitRequired(BaseException):
+    """
+    Raised to abort the resolution in progress until `awaitable` is awaited.
+
+    This is a `BaseException` so that it goes through the exception handling of the
+    resolution unchanged.
+    """
+
+    def __init__(self, key: CallKey, awaitable: Awaitable[Any]) -> None:
+        super().__init__()
+        self.key = key
+        self.awaitable = awaitable
+
+
+_replay: ContextVar[Optional[Replay]] = ContextVar("_replay", default=None)
+
+
+def call_resolver(
+    name: str, args_str: Tuple[str, ...], call: Callable[[], Any], is_async: bool
+) -> Any:
+    """
+    Call a resolver with the arguments `args_str`, `call()` being the actual call.
+
+    Outside of `run()`, asynchronous resolvers cannot be called.
+    """
+    replay = _replay.get()
+    if replay is None:
+        if is_async:
+            raise TypeError(
+                f"Resolver '{name}' is asynchronous, interpolations using it can only "
+                f"be resolved with `OmegaConf.resolve_async()` or "
+                f"`OmegaConf.to_container_async()`"
+            )
+        return call()
+
+    key = (name, args_str)
+    position = replay.positions.get(key, 0)
+    replay.positions[key] = position + 1
+    results = replay.results.get(key, ())
+    if position < len(results):
+        result = results[position]
+        if resolver_stats.enabled:
+            resolver_stats.note_replay()
+        if isinstance(result, Failure):
+            raise result.exc
+        return result
+    if is_async:
+        raise AwaitRequired(key, call())
+    result = call()
+    replay.record(key, result)
+    return result
+
+
+async def run(resolve: Callable[[], T]) -> T:
+    """Run `resolve()`, awaiting the results of the asynchronous resolvers it calls."""
+    replay = Replay()
+    token = _replay.set(replay)
+    try:
+        while True:
+            replay.positions.clear()
+            try:
+                return resolve()
+            except AwaitRequired as request:
+                try:
+                    result = await request.awaitable
+                except Exception as exc:
+                    # Re-raised on the next attempt, from within the resolution.
+                    result = Failure(exc)
+                replay.record(request.key, result)
+    finally:
+        _replay.reset(token)
@@ -0,0 +1,103 @@
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .base import Node
+    from .basecontainer import BaseContainer
+
+# Copy-on-write copies of `DictConfig` and `ListConfig` (see `copy.copy()`).
+#
+# The copy of a container gets a `Shared` reference to each child of the source,
+# instead of a copy of the child. A `Shared` child is replaced with a copy-on-write
+# copy of the child (sharing its own children in the same way) when it is first
+# accessed through `_get_node()` (see `BaseContainer._materialize()`): only the paths
+# to the nodes that are accessed in the copy are ever copied, and the parents of
+# these nodes point into the copy.
+#
+# Nodes shared by copies may still be modified through the source config: the copies
+# sharing a node must then copy it before it is modified (see `before_write()`).
+
+# id(node) -> `Shared` references to this node. When empty, modifications can skip
+# `before_write()`. A node is alive as long as it is shared.
+_shared: Dict[int, "weakref.WeakSet[Shared]"] = {}
+
+
+class Shared:
+    """A child of another container, shared by a copy-on-write copy."""
+
+    __slots__ = ("node", "holder", "__weakref__")
+
+    def __init__(self, node: "Node", holder: "BaseContainer") -> None:
+        self.node = node
+        # The copy holding this reference in its `_content`.
+        self.holder = weakref.ref(holder)
+        refs = _shared.get(id(node))
+        if refs is None:
+            refs = _shared[id(node)] = weakref.WeakSet()
+        refs.add(self)
+
+    def release(self) -> None:
+        """Stop tracking this reference, once it is no longer in its holder."""
+        refs = _shared.get(id(self.node))
+        if refs is not None:
+            refs.discard(self)
+            if not refs:
+                del _shared[id(self.node)]
+
+    def __del__(self) -> None:
+        # The module globals may already be cleared at interpreter exit.
+        if _shared is not None:  # pragma: no branch
+            self.release()
+
+    def __repr__(self) -> str:
+        return repr(self.node)
+
+
+def share(value: Any, holder: "BaseContainer") -> Any:
+    """
+    Return what the copy-on-write copy `holder` stores for `value`, an element of the
+    `_content` of the source.
+    """
+    from .base import Node
+
+    if isinstance(value, Shared):
+        return Shared(value.node, holder)
+    if isinstance(value, Node):
+        return Shared(value, holder)
+    # Raw leaves and subtrees (see `BaseContainer._stores_raw_leaves()`) are never
+    # modified in place.
+    return value
+
+
+def before_write(node: "Node") -> None:
+    """
+    Prepare `node` for a modification (of its value, content or flags): the copies
+    sharing `node` or one of its ancestors copy them first.
+    """
+    if not _shared:
+        return
+    path: List["Node"] = []
+    current: Optional["Node"] = node
+    while current is not None:
+        path.append(current)
+        current = current._parent
+    # From the root: copying a shared node shares its children with the copies.
+    for current in reversed(path):
+        refs = _shared.get(id(current))
+        if refs:
+            for ref in list(refs):
+                _unshare(ref)
+
+
+def _unshare(ref: Shared) -> None:
+    holder = ref.holder()
+    if holder is None:
+        ref.release()
+        return
+    content = holder.__dict__["_content"]
+    keys = content.keys() if isinstance(content, dict) else range(len(content))
+    for key in keys:
+        if content[key] is ref:
+            holder._materialize(key, ref)
+            return
+    ref.release()  # pragma: no cover (removed from its holder, but still alive)
@@ -0,0 +1,196 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from ._copy_on_write import Shared
+from ._utils import _ESCAPABLE, _ensure_container, split_key
+from .base import Container, Node, UnionNode
+from .dictconfig import DictConfig
+from .listconfig import ListConfig
+from .tupleconfig import TupleConfig
+
+# Structural diffs of configs (see `OmegaConf.diff()` and `OmegaConf.apply_patch()`).
+#
+# A patch is a primitive dict, that can be saved to YAML or JSON:
+#   {"added": {path: value}, "removed": [path], "changed": {path: value}}
+# where paths are key paths (see `OmegaConf.update()`) and values are primitive
+# values or containers, with unresolved interpolations (as strings) and enums
+# converted to their names. Flags and types are not part of the patch.
+#
+# Dicts are compared key by key (dicts with keys that cannot be key paths, e.g. that
+# are not strings, are changed as a whole). Lists of the same length are compared
+# item by item, other lists are changed as a whole. Subtrees that are the same object
+# in both configs are skipped without being visited: copy-on-write copies of a config
+# (see `copy.copy()` and `OmegaConf.with_updates()`) share their untouched subtrees
+# with the config, so diffing them only visits the paths to the modified nodes.
+
+_SPECIAL_CHARS = _ESCAPABLE | {"\\"}
+
+_DICT = "dict"
+_LIST = "list"
+_LEAF = "leaf"
+
+
+def diff(a: Any, b: Any) -> Dict[str, Any]:
+    """Return the patch turning `a` into `b` (see `OmegaConf.diff()`)."""
+    if not isinstance(a, Container):
+        a = _ensure_container(a)
+    if not isinstance(b, Container):
+        b = _ensure_container(b)
+    patch: Dict[str, Any] = {"added": {}, "removed": [], "changed": {}}
+    a_kind, a_content = _classify(a)
+    b_kind, b_content = _classify(b)
+    if a_kind != b_kind or a_kind == _LEAF:
+        raise ValueError(
+            f"Cannot diff a {type(a).__name__} and a {type(b).__name__} that are not"
+            " both dicts or both lists"
+        )
+    if a_kind == _LIST and len(a_content) != len(b_content):
+        raise ValueError("Cannot diff lists of different lengths")
+    if not _diff_content(patch, "", a_kind, a_content, b_content) and not _same(
+        _to_primitive(a), _to_primitive(b)
+    ):
+        raise ValueError("Cannot diff dicts with keys that are not key paths")
+    return patch
+
+
+def apply_patch(cfg: Container, patch: Any) -> None:
+    """Apply `patch` to `cfg` in place (see `OmegaConf.apply_patch()`)."""
+    from .omegaconf import OmegaConf, _select_one, open_dict
+
+    if OmegaConf.is_config(patch):
+        patch = OmegaConf.to_container(patch)
+    # Keys are removed and added regardless of the struct flag, as in the config the
+    # patch was computed from.
+    for path in patch.get("removed", ()):
+        *parents, last = split_key(path)
+        parent: Any = cfg
+        for key in parents:
+            parent, _ = _select_one(parent, key, throw_on_missing=False)
+        with open_dict(parent):
+            del parent[int(last) if isinstance(parent, ListConfig) else last]
+    for path, value in patch.get("changed", {}).items():
+        OmegaConf.update(cfg, path, value, merge=False)
+    for path, value in patch.get("added", {}).items():
+        OmegaConf.update(cfg, path, value, merge=False, force_add=True)
+
+
+def _diff_content(patch: Dict[str, Any], path: str, kind: str, a: Any, b: Any) -> bool:
+    """
+    Add the differences between the contents `a` and `b` (of the given kind) at
+    `path` to `patch`. Return False, leaving `patch` unchanged, if the keys of a dict
+    cannot be key paths.
+    """
+    if kind == _LIST:
+        for index, (a_item, b_item) in enumerate(zip(a, b)):
+            _diff_item(patch, f"{path}[{index}]", a_item, b_item)
+        return True
+
+    keys: List[Tuple[Any, str]] = []
+    for key in b:
+        key_path = _format_key(key)
+        if key_path is None:
+            return False
+        keys.append((key, key_path))
+    removed = []
+    for key in a:
+        if key not in b:
+            key_path = _format_key(key)
+            if key_path is None:
+                return False
+            removed.append(_join(path, key_path))
+    patch["removed"].extend(removed)
+    for key, key_path in keys:
+        if key in a:
+            _diff_item(patch, _join(path, key_path), a[key], b[key])
+        else:
+            patch["added"][_join(path, key_path)] = _to_primitive(b[key])
+    return True
+
+
+def _diff_item(patch: Dict[str, Any], path: str, a: Any, b: Any) -> None:
+    if type(a) is Shared:
+        a = a.node
+    if type(b) is Shared:
+        b = b.node
+    if a is b:
+        return
+    a_kind, a_content = _classify(a)
+    b_kind, b_content = _classify(b)
+    if a_kind == b_kind == _LEAF:
+        if not _same(a_content, b_content):
+            patch["changed"][path] = _to_primitive(b)
+        return
+    if a_kind == b_kind and (a_kind == _DICT or len(a_content) == len(b_content)):
+        if _diff_content(patch, path, a_kind, a_content, b_content):
+            return
+        # The dicts have keys that cannot be key paths.
+        if _same(_to_primitive(a), _to_primitive(b)):
+            return
+    patch["changed"][path] = _to_primitive(b)
+
+
+def _classify(value: Any) -> Tuple[str, Any]:
+    """
+    Return the kind of `value` (a child in the `_content` of a container) and its
+    content: the mapping or sequence of its children, or its leaf value.
+    """
+    if type(value) is Shared:
+        value = value.node
+    if isinstance(value, UnionNode):
+        value = value._value()
+    if isinstance(value, (DictConfig, ListConfig)):
+        content = value.__dict__["_content"]
+        if type(content) is dict:
+            return _DICT, content
+        if type(content) is list:
+            return _LIST, content
+        return _LEAF, content
+    if isinstance(value, TupleConfig):
+        content = value.__dict__["_content"]
+        if type(content) is list:
+            return _LEAF, [_to_primitive(item) for item in content]
+        return _LEAF, content
+    if isinstance(value, Node):
+        value = value._value()
+    if type(value) is dict:
+        return _DICT, value
+    if type(value) is list:
+        return _LIST, value
+    return _LEAF, value
+
+
+def _to_primitive(value: Any) -> Any:
+    kind, content = _classify(value)
+    if kind == _DICT:
+        return {key: _to_primitive(item) for key, item in content.items()}
+    if kind == _LIST:
+        return [_to_primitive(item) for item in content]
+    if isinstance(content, Enum):
+        return content.name
+    return content
+
+
+def _same(a: Any, b: Any) -> bool:
+    if type(a) is not type(b):
+        return False
+    if type(a) is list:
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if type(a) is dict:
+        return a.keys() == b.keys() and all(_same(a[key], b[key]) for key in a)
+    return bool(a == b)
+
+
+def _format_key(key: Any) -> Optional[str]:
+    """Return `key` as a key path, or None if it cannot be one."""
+    if type(key) is not str or not key:
+        return None
+    if _SPECIAL_CHARS.isdisjoint(key):
+        return key
+    escaped = "".join(f"\\{c}" if c in _ESCAPABLE else c for c in key)
+    if split_key(f"{escaped}.x") != [key, "x"]:
+        return None
+    return escaped
+
+
+def _join(path: str, key_path: str) -> str:
+    return f"{path}.{key_path}" if path else key_path
@@ -1,9 +1,22 @@
-from typing import Any
+import asyncio
+import functools
+import sys
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from omegaconf import Container, DictConfig, ListConfig, Node, TupleConfig, ValueNode
+from omegaconf import (
+    Container,
+    DictConfig,
+    ListConfig,
+    Node,
+    TupleConfig,
+    ValueNode,
+    resolver_stats,
+)
 from omegaconf.errors import (
     ConfigKeyError,
     ConfigTypeError,
+    InterpolationResolutionError,
     InterpolationToMissingValueError,
 )
 from omegaconf.nodes import InterpolationResultNode
@@ -16,40 +29,48 @@ from ._utils import (
     is_primitive_container,
     is_structured_config,
 )
+from ._async_resolution import run
+from .analysis import InterpolationGraph
+from .base import UnionNode, _to_resolution_error
+from .grammar_compiler import ResolverInterpolation
 
 
 def _resolve_container_value(cfg: Container, key: Any) -> None:
     node = cfg._get_child(key)
     assert isinstance(node, Node)
     if node._is_interpolation():
-        resolved = node._dereference_node()
-        if isinstance(resolved, Container):
-            _resolve(resolved)
-        if isinstance(resolved, InterpolationResultNode):
-            resolved_value = _get_value(resolved)
-            if is_primitive_container(resolved_value) or is_structured_config(
-                resolved_value
-            ):
-                resolved = _ensure_container(resolved_value)
-        if isinstance(cfg, TupleConfig) and _is_missing_literal(_get_value(resolved)):
-            cfg._format_and_raise(
-                key=key,
-                value=_get_value(resolved),
-                cause=InterpolationToMissingValueError(
-                    "TupleConfig interpolation resolved to a missing value"
-                ),
-            )
-        if isinstance(resolved, Container) and isinstance(node, ValueNode):
-            if isinstance(cfg, TupleConfig):
-                cfg._set_item_for_resolution(key, resolved)
-            else:
-                cfg[key] = resolved
-        else:
-            node._set_value(_get_value(resolved))
+        _set_resolved_value(cfg, key, node, node._dereference_node())
     else:
         _resolve(node)
 
 
+def _set_resolved_value(cfg: Container, key: Any, node: Node, resolved: Node) -> None:
+    """Replace the interpolation held by `node` (`cfg[key]`) with `resolved`."""
+    if isinstance(resolved, Container):
+        _resolve(resolved)
+    if isinstance(resolved, InterpolationResultNode):
+        resolved_value = _get_value(resolved)
+        if is_primitive_container(resolved_value) or is_structured_config(
+            resolved_value
+        ):
+            resolved = _ensure_container(resolved_value)
+    if isinstance(cfg, TupleConfig) and _is_missing_literal(_get_value(resolved)):
+        cfg._format_and_raise(
+            key=key,
+            value=_get_value(resolved),
+            cause=InterpolationToMissingValueError(
+                "TupleConfig interpolation resolved to a missing value"
+            ),
+        )
+    if isinstance(resolved, Container) and isinstance(node, ValueNode):
+        if isinstance(cfg, TupleConfig):
+            cfg._set_item_for_resolution(key, resolved)
+        else:
+            cfg[key] = resolved
+    else:
+        node._set_value(_get_value(resolved))
+
+
 def _resolve(cfg: Node) -> Node:
     assert isinstance(cfg, Node)
     if cfg._is_interpolation():
@@ -67,6 +88,247 @@ def _resolve(cfg: Node) -> Node:
     return cfg
 
 
+def _resolve_in_order(cfg: Container, executor: Optional[Executor] = None) -> None:
+    """
+    Resolve `cfg` in-place like `_resolve()`, resolving each interpolated node once
+    and after the interpolated nodes it depends on, so that following a chain of
+    interpolations never resolves the same node again.
+
+    Cycles between interpolated nodes are reported before anything is resolved.
+    With an `executor`, see `_resolve_concurrently()`.
+    """
+    order = _resolution_order(cfg)
+    if order is not None:
+        graph, nodes = order
+        if executor is None:
+            for node in nodes:
+                _resolve_in_place(node)
+        else:
+            _resolve_concurrently(graph, nodes, executor)
+
+    # Resolve what is left, e.g. interpolations within containers that were returned
+    # by custom resolvers.
+    _resolve(cfg)
+
+
+async def _resolve_in_order_async(cfg: Container) -> None:
+    """
+    Like `_resolve_in_order()`, awaiting asynchronous resolvers: the nodes of each
+    batch of `_batches()` are resolved concurrently.
+    """
+    order = _resolution_order(cfg)
+    if order is not None:
+        graph, nodes = order
+        for batch in _batches(graph, nodes):
+            tasks = [
+                asyncio.ensure_future(run(functools.partial(_resolve_in_place, node)))
+                for node in batch
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    await run(functools.partial(_resolve, cfg))
+
+
+def _resolution_order(
+    cfg: Container,
+) -> Optional[Tuple[InterpolationGraph, List[Node]]]:
+    """
+    Return the dependency graph of the interpolations of `cfg`, along with the
+    interpolated nodes within `cfg` sorted by dependencies.
+
+    Return `None` if the nodes of `cfg` cannot be sorted (e.g. `cfg` is itself an
+    interpolation), and raise on cycles between interpolated nodes.
+    """
+    if cfg._is_interpolation():
+        return None
+    graph = InterpolationGraph(cfg._get_root(), stringified_containers=False)
+    if not graph.contains(cfg):
+        return None
+
+    in_cfg = {id(node) for node in graph.within(cfg)}
+    components = [
+        component
+        for component in graph.components()
+        if any(id(node) in in_cfg for node in component)
+    ]
+    for component in components:
+        if graph.is_cycle(component):
+            node = component[0]
+            parent = node._get_parent_container()
+            assert parent is not None
+            keys = ", ".join(graph.full_key(member) for member in component)
+            parent._format_and_raise(
+                key=node._key(),
+                value=node._value(),
+                cause=InterpolationResolutionError(
+                    f"Recursive interpolation detected between: {keys}"
+                ),
+            )
+    return graph, [node for (node,) in components]
+
+
+def _batches(graph: InterpolationGraph, nodes: List[Node]) -> List[List[Node]]:
+    """
+    Split `nodes` (interpolated nodes sorted by dependencies) into batches of nodes
+    that do not depend on each other, each batch depending only on previous ones.
+    """
+    levels: Dict[int, int] = {}
+    batches: List[List[Node]] = []
+    for node in nodes:
+        level = 1 + max(
+            (levels.get(dep, -1) for dep in graph.dependencies[id(node)]), default=-1
+        )
+        levels[id(node)] = level
+        if level == len(batches):
+            batches.append([])
+        batches[level].append(node)
+    return batches
+
+
+def _locate_interpolation(node: Node) -> Tuple[Container, Any, Optional[Node]]:
+    """
+    Return the parent and key of the node of the config that the graph node `node`
+    stands for, along with this node if it still holds its interpolation.
+
+    The nodes of the graph may not be stored in the config (see `_children()` in
+    `analysis`): the node is looked up again from the root by its keys, which stores
+    the nodes on its path. Resolving a node interpolation to a container replaces the
+    interpolated nodes within it, as well as the node itself.
+    """
+    keys = []
+    current = node
+    parent = current._get_parent_container()
+    while parent is not None:
+        # The key of a node wrapped by a `UnionNode` is the key of the `UnionNode`.
+        box = current._get_parent()
+        keys.append((box if isinstance(box, UnionNode) else current)._key())
+        current = parent
+        parent = current._get_parent_container()
+    assert isinstance(current, Container) and keys
+    container = current
+    for key in reversed(keys[1:]):
+        child = container._get_child(key)
+        if not isinstance(child, Container):
+            return container, key, None
+        container = child
+    key = keys[0]
+    live = container._get_child(key)
+    if not isinstance(live, Node) or not live._is_interpolation():
+        live = None
+    return container, key, live
+
+
+def _resolve_in_place(node: Node) -> None:
+    parent, key, live = _locate_interpolation(node)
+    if live is not None:
+        _resolve_container_value(parent, key)
+
+
+def _resolve_concurrently(
+    graph: InterpolationGraph, nodes: List[Node], executor: Executor
+) -> None:
+    """
+    Resolve `nodes` (interpolated nodes sorted by dependencies) like
+    `_resolve_in_place()`, calling resolvers registered with `thread_safe=True`
+    concurrently on `executor`.
+
+    The nodes are processed in batches (see `_batches()`). For each batch, the nodes
+    that are a call to a thread-safe resolver have their arguments evaluated, and
+    the calls of the resolvers themselves are submitted to `executor`: only these
+    calls run on other threads, the config (including the resolver caches) is only
+    accessed on the calling thread. Their results are then written back in order,
+    before the other nodes of the batch are resolved as usual.
+    """
+    for batch in _batches(graph, nodes):
+        calls: List[Tuple[Node, "Future[Any]", Callable[[Any], Any]]] = []
+        others: List[Node] = []
+        try:
+            for node in batch:
+                call = _submit_resolver_call(node, executor)
+                if call is None:
+                    others.append(node)
+                else:
+                    calls.append(call)
+            for node, future, end in calls:
+                _set_resolver_call_result(node, future, end)
+        finally:
+            for _, future, _ in calls:
+                future.cancel()
+        for node in others:
+            _resolve_in_place(node)
+
+
+def _submit_resolver_call(
+    node: Node, executor: Executor
+) -> "Optional[Tuple[Node, Future[Any], Callable[[Any], Any]]]":
+    """
+    Submit the resolver call of `node` to `executor`, if it is a call to a thread-safe
+    resolver. Return the node of the config that `node` stands for (see
+    `_locate_interpolation()`), the future of its output, and the function validating
+    (and caching) this output.
+    """
+    from .omegaconf import OmegaConf, _thread_safe_resolvers
+
+    parent, key, live = _locate_interpolation(node)
+    if live is None:
+        return None
+    node = live
+    plan = node._get_interpolation_plan()
+    if not isinstance(plan, ResolverInterpolation) or not isinstance(plan.name, str):
+        return None
+    resolver = OmegaConf._get_resolver(plan.name)
+    steps = _thread_safe_resolvers.get(resolver) if resolver is not None else None
+    if steps is None:
+        return None
+    begin, end = steps
+    root = parent._get_root()
+    try:
+        args = plan.evaluate_args(
+            parent, node, key, memo=None, resolved_node_cache=None
+        )
+        ret, call = begin(root, parent, node, args, plan.args_str)
+    except InterpolationResolutionError:
+        raise
+    except Exception as exc:
+        raise _to_resolution_error(exc).with_traceback(sys.exc_info()[2])
+    future: "Future[Any]"
+    if call is None:
+        future = Future()
+        future.set_result(ret)
+    else:
+        if resolver_stats.enabled:
+            call = functools.partial(resolver_stats.call, plan.name, call)
+        future = executor.submit(call)
+    return node, future, functools.partial(end, root, node, plan.args_str)
+
+
+def _set_resolver_call_result(
+    node: Node, future: "Future[Any]", end: Callable[[Any], Any]
+) -> None:
+    parent, key, live = _locate_interpolation(node)
+    try:
+        result = end(future.result())
+    except InterpolationResolutionError:
+        raise
+    except Exception as exc:
+        raise _to_resolution_error(exc).with_traceback(sys.exc_info()[2])
+    if live is not node:
+        return
+    resolved = parent._validate_and_convert_interpolation_result(
+        parent=parent,
+        value=node,
+        key=key,
+        resolved=result,
+        throw_on_resolution_failure=True,
+    )
+    assert resolved is not None
+    _set_resolved_value(parent, key, node, resolved)
+
+
 def select_value(
     cfg: Container,
     key: str,
@@ -0,0 +1,300 @@
+import copy
+from typing import Any, Dict, Optional, Sequence, Set, Union
+
+from ._utils import ValueKind, _ensure_container, _is_missing_literal, get_value_kind
+from .base import Node
+from .dictconfig import DictConfig
+from .errors import (
+    ConfigKeyError,
+    ConfigTypeError,
+    KeyValidationError,
+    ReadonlyConfigError,
+    ValidationError,
+)
+from .listconfig import ListConfig
+from .nodes import AnyNode, ValueNode
+from .tupleconfig import TupleConfig
+
+# Single-pass merge of several configs into a `DictConfig` (see `OmegaConf.merge()`).
+#
+# Merging N configs one after the other walks every key of each of them, wrapping
+# and copying values that later configs may override again. When the configs are
+# plain (primitive dicts, or untyped dict and list configs holding primitive values
+# and no flags), they are first folded into a single primitive dict holding the
+# winning value of each key path, which is then merged once.
+#
+# The fold must give the result of the pairwise merges. Dicts merged at the same key
+# path are folded recursively, and any other value replaces the previous one (or is
+# ignored if it is "???"), as in `BaseContainer._map_merge()`. The fold is abandoned
+# whenever the pairwise merges could behave differently:
+#   - a dict replaces a value that is not a dict, or the other way around,
+#   - a value is replaced where the destination would validate it (a typed node or
+#     container), since the pairwise merge would also validate the replaced value,
+#   - the destination node is an interpolation: merging dereferences it, seeing the
+#     configs merged so far.
+# Errors raised by the merge of the folded dict (`MERGE_ERRORS`) may be raised by the
+# pairwise merges at another key path (or at all, for a fold of configs that is partly
+# invalid): `OmegaConf.merge()` then merges the configs one after the other again.
+
+# Minimum number of configs merged into the first one to fold them: folding a single
+# config only adds a conversion to a primitive dict.
+_MIN_CONFIGS = 2
+
+# Errors of the merge of a folded dict that are raised again by the pairwise merges.
+MERGE_ERRORS = (
+    ValidationError,
+    KeyValidationError,
+    ReadonlyConfigError,
+    ConfigKeyError,
+    ConfigTypeError,
+)
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class _NotFoldable(Exception):
+    pass
+
+
+def fold_configs(
+    dest: DictConfig, configs: Sequence[Any], min_configs: int = _MIN_CONFIGS
+) -> Optional[Dict[str, Any]]:
+    """
+    Return a primitive dict whose merge into `dest` has the same result as merging
+    `configs` one after the other, or None if the configs cannot be folded (or are
+    fewer than `min_configs`).
+    """
+    if len(configs) < min_configs:
+        return None
+    folded: Dict[str, Any] = {}
+    try:
+        for config in configs:
+            content = _to_primitive(config)
+            if type(content) is not dict:
+                return None
+            _fold_dict(folded, content, dest)
+    except _NotFoldable:
+        return None
+    return folded
+
+
+def _to_primitive(value: Any) -> Any:
+    """Return the primitive content of a plain config or value."""
+    value_type = type(value)
+    if value_type in _SCALARS:
+        return value
+    if value_type is dict:
+        if not all(type(key) is str for key in value):
+            raise _NotFoldable
+        return {key: _to_primitive(item) for key, item in value.items()}
+    if value_type is list:
+        return [_to_primitive(item) for item in value]
+    if not isinstance(value, Node):
+        raise _NotFoldable
+    metadata = value._metadata
+    if metadata.flags is not None or metadata.ref_type is not Any:
+        raise _NotFoldable
+    if value_type is AnyNode:
+        return _to_primitive(value._value())
+    if value_type is DictConfig:
+        content = value.__dict__["_content"]
+        if (
+            type(content) is not dict
+            or metadata.object_type is not dict
+            or metadata.key_type is not Any
+            or metadata.element_type is not Any
+            or not all(type(key) is str for key in content)
+        ):
+            raise _NotFoldable
+        return {key: _to_primitive(value._get_node(key)) for key in content}
+    if value_type is ListConfig:
+        content = value.__dict__["_content"]
+        if type(content) is not list or metadata.element_type is not Any:
+            raise _NotFoldable
+        return [_to_primitive(value._get_node(index)) for index in range(len(content))]
+    raise _NotFoldable
+
+
+def _fold_dict(folded: Dict[str, Any], src: Dict[str, Any], dest: Any) -> None:
+    """
+    Fold `src` into `folded`. `dest` is the node at the same key path in the
+    destination (None if there is none).
+    """
+    for key, value in src.items():
+        dest_node = _get_child(dest, key)
+        if dest_node is not None and dest_node._is_interpolation():
+            raise _NotFoldable
+        if key not in folded:
+            if type(value) is dict:
+                if dest_node is None and not _creates_untyped(dest):
+                    raise _NotFoldable
+                folded[key] = {}
+                _fold_dict(folded[key], value, dest_node)
+            else:
+                folded[key] = value
+            continue
+
+        previous = folded[key]
+        if type(previous) is dict and type(value) is dict:
+            _fold_dict(previous, value, dest_node)
+        elif (
+            type(previous) is dict
+            or type(value) is dict
+            or not _can_replace(dest, dest_node, previous)
+            or get_value_kind(previous) is ValueKind.INTERPOLATION
+        ):
+            raise _NotFoldable
+        elif not _is_missing_literal(value):
+            folded[key] = value
+
+
+def _get_child(dest: Any, key: str) -> Optional[Node]:
+    if type(dest) is not DictConfig:
+        return None
+    content = dest.__dict__["_content"]
+    if type(content) is not dict or key not in content:
+        return None
+    return dest._get_node(key, validate_access=False)
+
+
+def _creates_untyped(dest: Any) -> bool:
+    """Whether the nodes created in `dest` (or replacing it) by a merge are untyped."""
+    if dest is None or type(dest) is AnyNode:
+        return True
+    return type(dest) is DictConfig and _is_untyped(dest)
+
+
+def _can_replace(dest: Any, node: Optional[Node], value: Any) -> bool:
+    """
+    Whether merging `value` into `node` (the child of `dest`) succeeds, and the
+    result can then be replaced by any other value.
+    """
+    if node is None:
+        return _creates_untyped(dest)
+    if type(node) is AnyNode:
+        return True
+    if type(node) is DictConfig:
+        # A list cannot be merged into a dict.
+        return _is_untyped(node) and type(value) is not list
+    return type(node) is ListConfig and _is_untyped(node)
+
+
+def _is_untyped(container: Any) -> bool:
+    metadata = container._metadata
+    return (
+        metadata.ref_type is Any
+        and metadata.element_type is Any
+        and metadata.object_type in (dict, list, None)
+    )
+
+
+# Prepared merges (see `OmegaConf.prepare_merge()`).
+#
+# Merging a plain config into a `DictConfig` (see `BaseContainer._map_merge()`)
+# inspects each destination node before merging the value of the same key: typed
+# value nodes are assigned the value in place (with their own validation), dict
+# configs are merged recursively, and other nodes go through the rest of the merge
+# logic. A `_MergePlan` records this for the nodes of a prototype config, which is
+# never modified: each merge starts from a copy-on-write copy of the prototype, and
+# only looks up the plan for the keys of the merged config.
+
+
+class _MergePlan:
+    __slots__ = ("values", "dicts")
+
+    def __init__(self, dest: DictConfig) -> None:
+        # Keys of the value nodes assigned in place.
+        self.values: Set[str] = set()
+        # Plans of the dict configs.
+        self.dicts: Dict[str, _MergePlan] = {}
+        for key in dest.__dict__["_content"]:
+            if type(key) is not str:
+                continue
+            node = dest._get_node(key)
+            assert node is not None
+            if node._is_interpolation():
+                continue
+            # Merging a value into an `AnyNode` replaces it with a node of the same
+            # value (and without flags).
+            if isinstance(node, ValueNode) and (
+                type(node) is not AnyNode or node._metadata.flags is None
+            ):
+                self.values.add(key)
+            elif type(node) is DictConfig and type(node.__dict__["_content"]) is dict:
+                self.dicts[key] = _MergePlan(node)
+
+    def apply(self, dest: DictConfig, src: Dict[str, Any]) -> None:
+        """Merge `src`, a primitive dict, into `dest` (a copy of the prototype)."""
+        # As in `BaseContainer._merge_with()`, readonly destinations are merged.
+        readonly_overridden = dest._get_flag("readonly") is True
+        prev_readonly = dest._get_node_flag("readonly")
+        if readonly_overridden:
+            dest._set_flag("readonly", False)
+        try:
+            for key, value in src.items():
+                value_type = type(value)
+                if key in self.values and value_type not in (dict, list):
+                    if _is_missing_literal(value):
+                        continue
+                    node = dest._get_node(key, validate_access=False)
+                    assert isinstance(node, ValueNode)
+                    try:
+                        node._set_value(value)
+                    except (ValidationError, ReadonlyConfigError) as e:
+                        dest._format_and_raise(key=key, value=value, cause=e)
+                elif key in self.dicts and value_type is dict:
+                    child = dest._get_node(key, validate_access=False)
+                    assert isinstance(child, DictConfig)
+                    self.dicts[key].apply(child, value)
+                else:
+                    dest._merge_with({key: value}, _allow_readonly_target=True)
+        finally:
+            if readonly_overridden:
+                dest._set_flag("readonly", prev_readonly)
+
+
+class PreparedMerge:
+    """
+    A config prepared to be merged with other configs many times (see
+    `OmegaConf.prepare_merge()`).
+    """
+
+    def __init__(self, config: Any) -> None:
+        # Never modified: merges start from copy-on-write copies.
+        self._prototype = _ensure_container(copy.deepcopy(config))
+        self._plan: Optional[_MergePlan] = None
+        if type(self._prototype) is DictConfig and (
+            type(self._prototype.__dict__["_content"]) is dict
+        ):
+            self._plan = _MergePlan(self._prototype)
+
+    def merge(self, *others: Any) -> Union[DictConfig, ListConfig, TupleConfig]:
+        """
+        Return the merge of the prepared config with `others`, as
+        `OmegaConf.merge(config, *others)` would.
+        """
+        from .omegaconf import OmegaConf
+
+        src = self._fold(others)
+        if src is not None:
+            assert self._plan is not None
+            target = copy.copy(self._prototype)
+            try:
+                self._plan.apply(target, src)
+                return target
+            except MERGE_ERRORS:
+                # Raise the error of the pairwise merges.
+                pass
+        return OmegaConf.merge(self._prototype, *others)
+
+    def _fold(self, others: Sequence[Any]) -> Optional[Dict[str, Any]]:
+        """Return the primitive dict to merge, if `others` are plain configs."""
+        if self._plan is None or not others:
+            return None
+        if len(others) > 1:
+            return fold_configs(self._prototype, others)
+        try:
+            content = _to_primitive(others[0])
+        except _NotFoldable:
+            return None
+        return content if type(content) is dict else None
@@ -0,0 +1,235 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Set, Tuple
+from weakref import WeakSet
+
+if TYPE_CHECKING:
+    from .base import Node
+
+# Memoization of resolved interpolations (see `OmegaConf.set_memoized()`).
+#
+# Each memoized root config holds a `ResolutionIndex`, mapping interpolated nodes to
+# their resolved value, along with the dependencies read while resolving them:
+#   - `id(node)` for a node whose own value was read (e.g. the target of "${foo}"),
+#     or for an interpolated node whose memoized value was used,
+#   - `(id(dict_config), key)` for a key of a `DictConfig` that was looked up (keys
+#     of lists, tuples and union nodes are tracked as a whole, with `id(node)`).
+# Mutations of the config invalidate the entries depending on what was modified, as
+# well as (transitively) the entries depending on these entries.
+
+# Indices that are still alive: when empty, mutations can skip invalidation.
+_live_indices: "WeakSet[ResolutionIndex]" = WeakSet()
+
+# Per-thread stack of the `Frame`s of the resolutions in progress.
+_tracking = threading.local()
+
+
+class Frame:
+    """Dependencies read while resolving an interpolated node."""
+
+    __slots__ = (
+        "index",
+        "parent",
+        "version",
+        "deps",
+        "memoizable",
+        "has_container_result",
+    )
+
+    def __init__(
+        self, index: "ResolutionIndex", parent: Optional["Frame"], version: int
+    ) -> None:
+        self.index = index
+        self.parent = parent
+        self.version = version
+        self.deps: Set[Hashable] = set()
+        # Set to `False` when the result depends on something that is not tracked,
+        # e.g. the output of a custom resolver.
+        self.memoizable = True
+        # Whether the result is (or is computed from) a container: the result may then
+        # depend on the whole content of this container.
+        self.has_container_result = False
+
+
+def current_frame() -> Optional[Frame]:
+    return getattr(_tracking, "frame", None)
+
+
+def record_read(
+    container: "Node", child: "Node", resolved: Optional["Node"], is_last: bool
+) -> None:
+    """
+    Record that `child` was looked up in `container` by the current resolution (if
+    any), where `resolved` is the result of resolving `child` if it is an
+    interpolation, and `is_last` tells whether it is the last key of the lookup.
+    """
+    from .base import Container
+    from .dictconfig import DictConfig
+
+    frame = current_frame()
+    if frame is None:
+        return
+    if isinstance(container, DictConfig):
+        frame.deps.add((id(container), child._key()))
+    else:
+        frame.deps.add(id(container))
+    frame.deps.add(id(child))
+    if resolved is not child and not frame.index.contains(child):
+        # The result of this interpolation is not memoized, so we cannot know
+        # when it changes.
+        frame.memoizable = False
+    if is_last and isinstance(resolved, Container):
+        frame.has_container_result = True
+
+
+def record_untracked() -> None:
+    """Record that the current resolution depends on something that is not tracked."""
+    frame = current_frame()
+    if frame is not None:
+        frame.memoizable = False
+
+
+def invalidate(node: "Node", key: Any = None) -> None:
+    """
+    Invalidate the memoized results depending on `node` (if `key` is `None`) or on
+    its child `key`.
+
+    This must be called *after* any modification of the config.
+    """
+    index = get_resolution_index(node)
+    if index is not None:
+        index.invalidate(node, key)
+
+
+def get_resolution_index(node: "Node") -> Optional["ResolutionIndex"]:
+    """Return the index of the root config of `node`, if it is memoized."""
+    if not _live_indices:
+        return None
+    root = node
+    while True:
+        parent = root._parent
+        if parent is None:
+            break
+        root = parent
+    # Only containers can be memoized, value nodes have no `__dict__`.
+    index: Optional[ResolutionIndex] = getattr(root, "__dict__", {}).get(
+        "_resolution_index"
+    )
+    return index
+
+
+class ResolutionIndex:
+    """Memoized results of the interpolations of a config, with their dependencies."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Bumped on each invalidation, so that results that were computed while the
+        # config was being modified are not memoized.
+        self._version = 0
+        # id(node) -> (node, resolved node)
+        self._entries: Dict[int, Tuple["Node", "Node"]] = {}
+        # dependency -> ids of the nodes whose entry depends on it
+        self._dependents: Dict[Hashable, Set[int]] = {}
+        # id(node) -> dependencies of its entry
+        self._dependencies: Dict[int, Set[Hashable]] = {}
+        # id(dict_config) -> keys of this config that are dependencies
+        self._keys: Dict[int, Set[Any]] = {}
+        _live_indices.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, node: "Node") -> bool:
+        return id(node) in self._entries
+
+    def get(self, node: "Node") -> Optional["Node"]:
+        entry = self._entries.get(id(node))
+        return None if entry is None else entry[1]
+
+    def push_frame(self) -> Frame:
+        frame = Frame(index=self, parent=current_frame(), version=self._version)
+        _tracking.frame = frame
+        return frame
+
+    def pop_frame(self, frame: Frame) -> None:
+        _tracking.frame = frame.parent
+
+    def store(
+        self, node: "Node", resolved: "Node", frame: Frame, allow_container: bool
+    ) -> None:
+        """
+        Memoize `resolved` as the result of interpolated node `node`, unless the
+        resolution tracked by `frame` read something that is not tracked.
+
+        Results computed from containers (e.g. "${foo}" or "x_${foo}" where `foo`
+        is a container) depend on the whole content of these containers, and are only
+        memoized if `allow_container` is `True`.
+        """
+        if not frame.memoizable or (frame.has_container_result and not allow_container):
+            return
+
+        deps = frame.deps
+        with self._lock:
+            if self._version != frame.version:
+                return  # the config was modified during the resolution
+            deps.add(id(node))
+            deps.update(_ancestors(node))
+            node_id = id(node)
+            self._entries[node_id] = (node, resolved)
+            self._dependencies[node_id] = deps
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(node_id)
+                if isinstance(dep, tuple):
+                    self._keys.setdefault(dep[0], set()).add(dep[1])
+
+    def invalidate(self, node: "Node", key: Any) -> None:
+        from .dictconfig import DictConfig
+
+        node_id = id(node)
+        with self._lock:
+            self._version += 1
+            todo: List[Hashable] = []
+            if key is not None and isinstance(node, DictConfig):
+                todo.append((node_id, key))
+            else:
+                todo.append(node_id)
+                todo.extend((node_id, k) for k in self._keys.get(node_id, ()))
+            while todo:
+                dep = todo.pop()
+                if isinstance(dep, tuple):
+                    self._discard_key(dep)
+                for entry_id in self._dependents.pop(dep, ()):
+                    del self._entries[entry_id]
+                    for entry_dep in self._dependencies.pop(entry_id):
+                        dependents = self._dependents.get(entry_dep)
+                        if dependents is not None:
+                            dependents.discard(entry_id)
+                            if not dependents:
+                                del self._dependents[entry_dep]
+                                if isinstance(entry_dep, tuple):
+                                    self._discard_key(entry_dep)
+                    # Entries using this entry must be invalidated too.
+                    todo.append(entry_id)
+
+    def _discard_key(self, dep: Tuple[int, Any]) -> None:
+        keys = self._keys.get(dep[0])
+        if keys is not None:
+            keys.discard(dep[1])
+            if not keys:
+                del self._keys[dep[0]]
+
+
+def _ancestors(node: "Node") -> List[Hashable]:
+    # Resolving a node also depends on its position in the config (e.g. for relative
+    # interpolations), i.e. on the keys leading to this node.
+    from .dictconfig import DictConfig
+
+    deps: List[Hashable] = []
+    parent = node._parent
+    while parent is not None:
+        if isinstance(parent, DictConfig):
+            deps.append((id(parent), node._key()))
+        else:
+            deps.append(id(parent))
+        node = parent
+        parent = node._parent
+    return deps
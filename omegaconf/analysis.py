@@ -0,0 +1,434 @@
+"""
+Static analysis of the interpolations of a config (see `OmegaConf.analyze()`).
+
+The analysis only looks at the interpolation strings and at the structure of the
+config: no interpolation is resolved and no resolver is called.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from ._utils import is_int, split_key
+from .base import Container, Node, UnionNode
+from .basecontainer import BaseContainer
+from .dictconfig import DictConfig
+from .errors import KeyValidationError
+from .grammar_compiler import (
+    DictContainer,
+    InterpolatedName,
+    Join,
+    ListContainer,
+    NodeInterpolation,
+    PlanElement,
+    QuotedValue,
+    ResolverInterpolation,
+    TextPlan,
+)
+from .listconfig import ListConfig
+from .tupleconfig import TupleConfig
+
+
+@dataclass
+class InterpolationInfo:
+    """
+    Static information about an interpolated node.
+
+    :ivar key: Full key of the interpolated node.
+    :ivar references: Keys of the node interpolations, as written (e.g. "..foo").
+    :ivar targets: Full keys of the nodes referenced by node interpolations.
+    :ivar dangling: References to nodes that do not exist.
+    :ivar resolvers: Names of the resolvers used.
+    :ivar static: ``False`` if some references could not be followed without
+        resolving interpolations, e.g. "${foo.${bar}}", or references going through
+        a missing container.
+    """
+
+    key: str
+    references: List[str] = field(default_factory=list)
+    targets: List[str] = field(default_factory=list)
+    dangling: List[str] = field(default_factory=list)
+    resolvers: List[str] = field(default_factory=list)
+    static: bool = True
+
+
+@dataclass
+class InterpolationReport:
+    """
+    Result of `OmegaConf.analyze()`.
+
+    :ivar interpolations: Information about each interpolated node, by full key.
+    :ivar dependencies: Full keys of the interpolated nodes that must be resolved to
+        resolve each interpolated node.
+    :ivar cycles: Groups of interpolated nodes depending on each other.
+    :ivar resolution_order: Interpolated nodes that are not part of a cycle, each one
+        coming after its dependencies.
+    """
+
+    interpolations: Dict[str, InterpolationInfo]
+    dependencies: Dict[str, List[str]]
+    cycles: List[List[str]]
+    resolution_order: List[str]
+
+    @property
+    def dangling(self) -> Dict[str, List[str]]:
+        """Dangling references, by full key of the interpolated node."""
+        return {
+            key: info.dangling
+            for key, info in self.interpolations.items()
+            if info.dangling
+        }
+
+    @property
+    def resolvers(self) -> Set[str]:
+        """Names of all the resolvers used."""
+        return {
+            name for info in self.interpolations.values() for name in info.resolvers
+        }
+
+    def reachable(self, key: str) -> Set[str]:
+        """
+        Return the full keys of all the nodes that may be read when resolving the
+        interpolated node `key`, directly or through other interpolations.
+        """
+        seen: Set[str] = set()
+        reachable: Set[str] = set()
+        todo = [key]
+        while todo:
+            current = todo.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            reachable.update(self.interpolations[current].targets)
+            todo.extend(self.dependencies[current])
+        return reachable
+
+
+class InterpolationGraph:
+    """
+    Dependency graph of the interpolated nodes of a config.
+
+    `dependencies[id(node)]` holds the ids of the interpolated nodes that must be
+    resolved in order to resolve `node`.
+
+    Converting a container to a string (e.g. "x_${foo}") does not resolve its
+    content, but it shows it: with `stringified_containers=True` the interpolations
+    within such a container are dependencies too.
+    """
+
+    def __init__(self, cfg: Container, stringified_containers: bool = True) -> None:
+        self._stringified_containers = stringified_containers
+        # Interpolated nodes, in depth-first (pre-)order.
+        self.nodes: List[Node] = []
+        self.info: Dict[int, InterpolationInfo] = {}
+        self.dependencies: Dict[int, List[int]] = {}
+        self._full_keys: Dict[int, str] = {}
+        # Position of each container in the depth-first order, along with the
+        # position following its last descendant: this tells which interpolated nodes
+        # are within a container.
+        self._ranges: Dict[int, Tuple[int, int]] = {}
+        self._positions: List[int] = []
+        # Children of each container, by key (see `_children()`).
+        self._children: Dict[int, Dict[Any, Node]] = {}
+        self._collect(cfg, full_key="", position=0)
+        for node in self.nodes:
+            self._analyze(node)
+
+    def _collect(self, node: Node, full_key: str, position: int) -> int:
+        self._full_keys[id(node)] = full_key
+        value = node._value()
+        if isinstance(node, UnionNode) and isinstance(value, Node):
+            node = value
+            self._full_keys[id(node)] = full_key
+        if node._is_interpolation():
+            if node._get_parent() is not None:
+                self.nodes.append(node)
+                self._positions.append(position)
+            return position + 1
+        start = position
+        position += 1
+        if isinstance(node, Container):
+            children = self._children[id(node)] = dict(_children(node))
+            for key, child in children.items():
+                position = self._collect(
+                    child, full_key=_child_key(node, full_key, key), position=position
+                )
+            self._ranges[id(node)] = (start, position)
+        return position
+
+    def _analyze(self, node: Node) -> None:
+        parent = node._get_parent_container()
+        assert parent is not None
+        info = InterpolationInfo(key=self._full_keys[id(node)])
+        deps: Dict[int, None] = {}
+        for element, stringified in _walk(node._get_interpolation_plan()):
+            if isinstance(element, ResolverInterpolation):
+                if isinstance(element.name, str):
+                    info.resolvers.append(element.name)
+                else:
+                    info.static = False
+            elif isinstance(element, NodeInterpolation):
+                if not isinstance(element.inter_key, str):
+                    info.static = False
+                    continue
+                info.references.append(element.inter_key)
+                found, target = self._lookup(parent, element.inter_key, deps)
+                if not found:
+                    info.dangling.append(element.inter_key)
+                elif target is None:
+                    info.static = False
+                else:
+                    info.targets.append(self._full_keys[id(target)])
+                    if target._is_interpolation():
+                        deps[id(target)] = None
+                    elif (
+                        stringified
+                        and self._stringified_containers
+                        and isinstance(target, Container)
+                    ):
+                        for inner in self.within(target):
+                            deps[id(inner)] = None
+        self.info[id(node)] = info
+        self.dependencies[id(node)] = list(deps)
+
+    def _lookup(
+        self,
+        container: Container,
+        key: str,
+        deps: Dict[int, None],
+        seen: Optional[Set[int]] = None,
+    ) -> Tuple[bool, Optional[Node]]:
+        """
+        Look up the node referenced by `key` from `container`, following node
+        interpolations used as intermediate containers (recorded in `deps`).
+
+        Return `(False, None)` if the node does not exist, and `(True, None)` if
+        it cannot be looked up without resolving interpolations.
+        """
+        current = container
+        if key.startswith("."):
+            key = key[1:]
+            while key.startswith("."):
+                key = key[1:]
+                parent = current._get_parent_container()
+                if parent is None:
+                    return False, None
+                current = parent
+        else:
+            current = container._get_root()
+
+        parts = split_key(key)
+        for i, part in enumerate(parts):
+            if current._is_missing() or current._is_none():
+                return True, None
+            child = self._child(current, part)
+            if child is None:
+                return False, None
+            if i == len(parts) - 1:
+                return True, child
+            if child._is_missing():
+                return True, None
+            if child._is_interpolation():
+                deps[id(child)] = None
+                child = self._follow(child, seen=set() if seen is None else seen)
+                if child is None:
+                    return True, None
+            if isinstance(child, UnionNode) or not isinstance(child, Container):
+                return False, None
+            current = child
+        assert False
+
+    def _child(self, container: Container, key: str) -> Optional[Node]:
+        """Return the child `key` of `container`, as `_select_one()` would."""
+        children = self._children[id(container)]
+        if isinstance(container, (ListConfig, TupleConfig)):
+            if not is_int(key):
+                return None
+            index = int(key)
+            return children.get(index + len(children) if index < 0 else index)
+        assert isinstance(container, DictConfig)
+        try:
+            return children.get(container._validate_and_normalize_key(key))
+        except KeyValidationError:
+            return None
+
+    def _follow(self, node: Node, seen: Set[int]) -> Optional[Node]:
+        # Target of an interpolation "${foo}" used as an intermediate container.
+        if id(node) in seen:
+            return None  # cycles are reported separately
+        seen.add(id(node))
+        plan = node._get_interpolation_plan()
+        parent = node._get_parent_container()
+        if not isinstance(plan, NodeInterpolation) or not isinstance(
+            plan.inter_key, str
+        ):
+            return None
+        assert parent is not None
+        found, target = self._lookup(parent, plan.inter_key, deps={}, seen=seen)
+        if target is not None and target._is_interpolation():
+            return self._follow(target, seen)
+        return target
+
+    def within(self, container: Container) -> List[Node]:
+        """Interpolated nodes within `container`, in depth-first order."""
+        start, end = self._ranges[id(container)]
+        positions = self._positions
+        return self.nodes[bisect_left(positions, start) : bisect_left(positions, end)]
+
+    def contains(self, node: Node) -> bool:
+        return id(node) in self._full_keys
+
+    def full_key(self, node: Node) -> str:
+        return self._full_keys[id(node)]
+
+    def components(self) -> Iterator[List[Node]]:
+        """
+        Yield the strongly connected components of the graph, each component coming
+        after the components it depends on (Tarjan's algorithm).
+        """
+        by_id = {id(node): node for node in self.nodes}
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack: Set[int] = set()
+        for root in self.nodes:
+            if id(root) in index:
+                continue
+            work: List[Tuple[int, Iterator[int]]] = []
+            pending: Optional[int] = id(root)
+            while pending is not None or work:
+                if pending is not None:
+                    index[pending] = lowlink[pending] = len(index)
+                    stack.append(pending)
+                    on_stack.add(pending)
+                    work.append((pending, iter(self.dependencies[pending])))
+                    pending = None
+                node_id, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        pending = dep
+                        break
+                    if dep in on_stack:
+                        lowlink[node_id] = min(lowlink[node_id], index[dep])
+                if pending is not None:
+                    continue
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    lowlink[caller] = min(lowlink[caller], lowlink[node_id])
+                if lowlink[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(by_id[member])
+                        if member == node_id:
+                            break
+                    yield component[::-1]
+
+    def is_cycle(self, component: List[Node]) -> bool:
+        if len(component) > 1:
+            return True
+        node_id = id(component[0])
+        return node_id in self.dependencies[node_id]
+
+
+def analyze(cfg: Container) -> InterpolationReport:
+    # Interpolations may reference nodes outside of `cfg`: the whole config is
+    # analyzed, and the report is limited to the interpolated nodes of `cfg` and the
+    # ones they depend on.
+    graph = InterpolationGraph(cfg._get_root())
+    if graph.contains(cfg) and not cfg._is_interpolation():
+        todo = [id(node) for node in graph.within(cfg)]
+    else:
+        todo = []
+    selected: Set[int] = set()
+    while todo:
+        node_id = todo.pop()
+        if node_id not in selected:
+            selected.add(node_id)
+            todo.extend(graph.dependencies[node_id])
+    cycles: List[List[str]] = []
+    order: List[str] = []
+    for component in graph.components():
+        if id(component[0]) not in selected:
+            continue
+        if graph.is_cycle(component):
+            cycles.append([graph.full_key(node) for node in component])
+        else:
+            order.append(graph.full_key(component[0]))
+    return InterpolationReport(
+        interpolations={
+            info.key: info
+            for node_id, info in graph.info.items()
+            if node_id in selected
+        },
+        dependencies={
+            graph.info[node_id].key: [graph.info[dep].key for dep in deps]
+            for node_id, deps in graph.dependencies.items()
+            if node_id in selected
+        },
+        cycles=cycles,
+        resolution_order=order,
+    )
+
+
+def _children(container: Container) -> Iterator[Tuple[Union[str, int], Node]]:
+    content = container.__dict__["_content"]
+    if isinstance(content, dict):
+        items: Iterable[Tuple[Any, Any]] = list(content.items())
+    elif isinstance(content, list):
+        items = list(enumerate(content))
+    else:
+        return
+    for key, child in items:
+        if not isinstance(child, Node):
+            # Raw leaf or subtree (see `BaseContainer._stores_raw_leaves()`), or child
+            # shared by a copy-on-write copy: interpolations may target it, so it needs
+            # a node, which is not stored in the container (analyzing a config does not
+            # modify it).
+            assert isinstance(container, BaseContainer)
+            child = container._to_node(key, child)
+        yield key, child
+
+
+def _child_key(container: Container, full_key: str, key: Union[str, int]) -> str:
+    # Same as `container._get_full_key(key)`, without walking up to the root.
+    if isinstance(container, (ListConfig, TupleConfig)):
+        return f"{full_key}[{key}]"
+    key = key.name if isinstance(key, Enum) else str(key)
+    return f"{full_key}.{key}" if full_key else key
+
+
+def _walk(
+    element: Union[str, PlanElement], stringified: bool = False
+) -> Iterator[Tuple[PlanElement, bool]]:
+    """
+    Yield the elements of a plan, along with whether their result is converted to
+    a string.
+    """
+    if isinstance(element, str):
+        return
+    yield element, stringified
+    if isinstance(element, NodeInterpolation):
+        yield from _walk(element.inter_key, True)
+    elif isinstance(element, ResolverInterpolation):
+        yield from _walk(element.name, True)
+        for arg in element.args:
+            yield from _walk(arg)
+    elif isinstance(element, TextPlan):
+        for chunk in element.chunks:
+            yield from _walk(chunk, True)
+    elif isinstance(element, Join):
+        for part in element.parts:
+            yield from _walk(part, True)
+    elif isinstance(element, (InterpolatedName, QuotedValue)):
+        yield from _walk(element.interpolation, True)
+    elif isinstance(element, ListContainer):
+        for item in element.items:
+            yield from _walk(item)
+    elif isinstance(element, DictContainer):
+        for key, value in element.items:
+            yield from _walk(key, True)
+            yield from _walk(value)
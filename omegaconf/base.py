@@ -1,12 +1,12 @@
 import copy
 import sys
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import (
     Any,
     Dict,
+    Iterable,
     Iterator,
     List,
     NoReturn,
@@ -17,6 +17,14 @@ from typing import (
     Union,
 )
 
+from . import counters, resolver_stats
+from ._copy_on_write import before_write
+from ._resolution_index import (
+    get_resolution_index,
+    invalidate,
+    record_read,
+    record_untracked,
+)
 from ._utils import (
     _DEFAULT_MARKER_,
     NoneType,
@@ -51,14 +59,28 @@ from .errors import (
     UnsupportedInterpolationType,
     ValidationError,
 )
-from .grammar_parser import parse
-from .grammar_visitor import GrammarVisitor
+from .grammar_compiler import (
+    NodeInterpolation,
+    PlanElement,
+    compile_interpolation,
+    compile_tree,
+)
 from .typing import Antlr4ParserRuleContext
 
 DictKeyType = Union[str, bytes, int, Enum, float, bool]
 
+# The flags cache of a node is only valid at the epoch it was filled in (see
+# `Node._invalidate_flags_cache()`).
+_flags_epoch = 0
+
+
+def _fields(metadata: "Metadata") -> Iterable[str]:
+    return type(metadata).__dataclass_fields__.keys()  # type: ignore
+
 
-@dataclass
+# Metadata is held by every node: it has no `__dict__`, and its `flags` and
+# `resolver_cache` are only allocated once they hold something.
+@dataclass(slots=True)
 class Metadata:
     ref_type: Union[Type[Any], Any]
 
@@ -72,17 +94,32 @@ class Metadata:
     #   unset : inherit from parent (None if no parent specifies)
     #   set to true: flag is true
     #   set to false: flag is false
+    # `None` when no flag is set.
     flags: Optional[Dict[str, bool]] = None
 
     # If True, when checking the value of a flag, if the flag is not set None is returned
     # otherwise, the parent node is queried.
     flags_root: bool = False
 
-    resolver_cache: Dict[str, Any] = field(default_factory=lambda: defaultdict(dict))
+    # `None` until the node caches a resolver output (see `OmegaConf.get_cache()`).
+    resolver_cache: Optional[Dict[str, Any]] = None
 
     def __post_init__(self) -> None:
-        if self.flags is None:
-            self.flags = {}
+        if not self.flags:
+            self.flags = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in _fields(self)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pickles of older versions hold the `__dict__` of the metadata, with empty
+        # `flags` and `resolver_cache` dicts.
+        for name in _fields(self):
+            setattr(self, name, state.get(name))
+        if not self.flags:
+            self.flags = None
+        if not self.resolver_cache:
+            self.resolver_cache = None
 
     @property
     def type_hint(self) -> Union[Type[Any], Any]:
@@ -96,7 +133,7 @@ class Metadata:
             return self.ref_type
 
 
-@dataclass
+@dataclass(slots=True)
 class ContainerMetadata(Metadata):
     key_type: Any = None
     element_type: Any = None
@@ -111,15 +148,22 @@ class ContainerMetadata(Metadata):
                     f"Unsupported value type: '{type_str(self.element_type, include_module_name=True)}'"
                 )
 
-        if self.flags is None:
-            self.flags = {}
+        if not self.flags:
+            self.flags = None
 
 
 class Node(ABC):
+    # Value nodes hold their attributes in slots (see `ValueNode`), while containers
+    # hold them in their `__dict__`, bypassing their `__setattr__()`. Code handling
+    # any node thus reads attributes directly, and writes them with
+    # `object.__setattr__()`.
+    __slots__ = ()
+
     _metadata: Metadata
 
     _parent: Optional["Box"]
-    _flags_cache: Optional[Dict[str, Optional[bool]]]
+    # (epoch, flag -> value inherited by this node)
+    _flags_cache: Optional[Tuple[int, Dict[str, Optional[bool]]]]
 
     def __init__(self, parent: Optional["Box"], metadata: Metadata):
         self.__dict__["_metadata"] = metadata
@@ -138,14 +182,23 @@ class Node(ABC):
 
     def _set_parent(self, parent: Optional["Box"]) -> None:
         assert parent is None or isinstance(parent, Box)
-        self.__dict__["_parent"] = parent
+        object.__setattr__(self, "_parent", parent)
+        if parent is not None and isinstance(self, Container):
+            # Only root configs can be memoized (see `OmegaConf.set_memoized()`).
+            self.__dict__.pop("_resolution_index", None)
         self._invalidate_flags_cache()
 
     def _invalidate_flags_cache(self) -> None:
-        self.__dict__["_flags_cache"] = None
+        # The flags cached by the descendants of this node were looked up through its
+        # own cache, at the same epoch: if its cache is stale, so are theirs. Otherwise,
+        # starting a new epoch makes all the caches stale at once, in O(1).
+        global _flags_epoch
+        cache = self._flags_cache
+        if cache is not None and cache[0] == _flags_epoch:
+            _flags_epoch += 1
 
     def _get_parent(self) -> Optional["Box"]:
-        parent = self.__dict__["_parent"]
+        parent = self._parent
         assert parent is None or isinstance(parent, Box)
         return parent
 
@@ -154,7 +207,7 @@ class Node(ABC):
         Like _get_parent, but returns the grandparent
         in the case where `self` is wrapped by a UnionNode.
         """
-        parent = self.__dict__["_parent"]
+        parent = self._parent
         assert parent is None or isinstance(parent, Box)
 
         if isinstance(parent, UnionNode):
@@ -182,15 +235,19 @@ class Node(ABC):
         if len(flags) != len(values):
             raise ValueError("Inconsistent lengths of input flag names and values")
 
+        before_write(self)
+        metadata = self._metadata
         for idx, flag in enumerate(flags):
             value = values[idx]
             if value is None:
-                assert self._metadata.flags is not None
-                if flag in self._metadata.flags:
-                    del self._metadata.flags[flag]
+                if metadata.flags is not None and flag in metadata.flags:
+                    del metadata.flags[flag]
+                    if not metadata.flags:
+                        metadata.flags = None
+            elif metadata.flags is None:
+                metadata.flags = {flag: value}
             else:
-                assert self._metadata.flags is not None
-                self._metadata.flags[flag] = value
+                metadata.flags[flag] = value
         self._invalidate_flags_cache()
         return self
 
@@ -199,18 +256,20 @@ class Node(ABC):
         :param flag: flag to inspect
         :return: the state of the flag on this node.
         """
-        assert self._metadata.flags is not None
-        return self._metadata.flags.get(flag)
+        flags = self._metadata.flags
+        return None if flags is None else flags.get(flag)
 
     def _get_flag(self, flag: str) -> Optional[bool]:
-        cache = self.__dict__["_flags_cache"]
-        if cache is None:
-            cache = self.__dict__["_flags_cache"] = {}
+        cache = self._flags_cache
+        if cache is None or cache[0] != _flags_epoch:
+            cache = (_flags_epoch, {})
+            object.__setattr__(self, "_flags_cache", cache)
 
-        ret = cache.get(flag, _DEFAULT_MARKER_)
+        values = cache[1]
+        ret = values.get(flag, _DEFAULT_MARKER_)
         if ret is _DEFAULT_MARKER_:
             ret = self._get_flag_no_cache(flag)
-            cache[flag] = ret
+            values[flag] = ret
         assert ret is None or isinstance(ret, bool)
         return ret
 
@@ -222,8 +281,7 @@ class Node(ABC):
         :return:
         """
         flags = self._metadata.flags
-        assert flags is not None
-        if flag in flags and flags[flag] is not None:
+        if flags is not None and flags.get(flag) is not None:
             return flags[flag]
 
         if self._is_flags_root():
@@ -303,11 +361,10 @@ class Node(ABC):
             return None
         assert parent is not None
         key = self._key()
-        return parent._resolve_interpolation_from_parse_tree(
+        return parent._resolve_interpolation_string(
             parent=parent,
             key=key,
             value=self,
-            parse_tree=parse(_get_value(self)),
             throw_on_resolution_failure=throw_on_resolution_failure,
             memo=memo,
             resolved_node_cache=resolved_node_cache,
@@ -360,6 +417,10 @@ class Node(ABC):
     @abstractmethod
     def _is_interpolation(self) -> bool: ...
 
+    def _get_interpolation_plan(self) -> PlanElement:
+        """Return the resolution plan of the interpolation held by this node."""
+        return compile_interpolation(_get_value(self))
+
     def _key(self) -> Any:
         return self._metadata.key
 
@@ -405,7 +466,7 @@ class Box(Node):
             content = self.__dict__["_content"]
             if isinstance(content, dict):
                 for _key, value in self.__dict__["_content"].items():
-                    if value is not None:
+                    if isinstance(value, Node):
                         value._set_parent(self)
                     if isinstance(value, Box):
                         value._re_parent()
@@ -413,7 +474,7 @@ class Box(Node):
             content = self.__dict__["_content"]
             if isinstance(content, list):
                 for item in self.__dict__["_content"]:
-                    if item is not None:
+                    if isinstance(item, Node):
                         item._set_parent(self)
                     if isinstance(item, Box):
                         item._re_parent()
@@ -495,6 +556,8 @@ class Container(Box):
         """
         from .omegaconf import _select_one
 
+        if counters.enabled:
+            counters.incr("select")
         if key == "":
             return self, "", self
 
@@ -512,11 +575,13 @@ class Container(Box):
                 throw_on_type_error=throw_on_resolution_failure,
             )
             if isinstance(ret, Node):
-                ret = ret._maybe_dereference_node(
+                child = ret
+                ret = child._maybe_dereference_node(
                     throw_on_resolution_failure=throw_on_resolution_failure,
                     memo=memo,
                     resolved_node_cache=resolved_node_cache,
                 )
+                record_read(root, child, ret, is_last=False)
 
             if ret is not None and not isinstance(ret, Container):
                 parent_key = ".".join(split[0 : i + 1])
@@ -542,7 +607,9 @@ class Container(Box):
 
         value_id = id(value)
         if resolved_node_cache is not None and value_id in resolved_node_cache:
-            return root, last_key, resolved_node_cache[value_id]
+            resolved = resolved_node_cache[value_id]
+            record_read(root, value, resolved, is_last=True)
+            return root, last_key, resolved
 
         if memo is not None:
             if value_id in memo:
@@ -551,7 +618,7 @@ class Container(Box):
             memo.add(value_id)
 
         try:
-            value = root._maybe_resolve_interpolation(
+            resolved = root._maybe_resolve_interpolation(
                 parent=root,
                 key=last_key,
                 value=value,
@@ -564,29 +631,31 @@ class Container(Box):
                 # pop from memo "stack"
                 memo.remove(value_id)
 
-        if resolved_node_cache is not None and value is not None:
-            resolved_node_cache[value_id] = value
+        record_read(root, value, resolved, is_last=True)
+        if resolved_node_cache is not None and resolved is not None:
+            resolved_node_cache[value_id] = resolved
 
-        return root, last_key, value
+        return root, last_key, resolved
 
-    def _resolve_interpolation_from_parse_tree(
+    def _resolve_interpolation_string(
         self,
         parent: Optional["Container"],
         value: "Node",
         key: Any,
-        parse_tree: Antlr4ParserRuleContext,
         throw_on_resolution_failure: bool,
         memo: Optional[Set[int]],
         resolved_node_cache: Optional[Dict[int, "Node"]] = None,
     ) -> Optional["Node"]:
         """
-        Resolve an interpolation.
+        Resolve the interpolation string held by `value`.
 
         This happens in two steps:
-            1. The parse tree is visited, which outputs either a `Node` (e.g.,
-               for node interpolations "${foo}"), a string (e.g., for string
-               interpolations "hello ${name}", or any other arbitrary value
-               (e.g., or custom interpolations "${foo:bar}").
+            1. The resolution plan of the interpolation is evaluated, which outputs
+               either a `Node` (e.g., for node interpolations "${foo}"), a string
+               (e.g., for string interpolations "hello ${name}", or any other
+               arbitrary value (e.g., or custom interpolations "${foo:bar}").
+               The plan is compiled on first use (see
+               `grammar_compiler.compile_interpolation()`) and kept by `value`.
             2. This output is potentially validated and converted when the node
                being resolved (`value`) is typed.
 
@@ -597,7 +666,6 @@ class Container(Box):
         :param parent: Parent of the node being resolved.
         :param value: Node being resolved.
         :param key: The associated key in the parent.
-        :param parse_tree: The parse tree as obtained from `grammar_parser.parse()`.
         :param throw_on_resolution_failure: If `False`, then exceptions raised during
             the resolution of the interpolation are silenced, and instead `None` is
             returned.
@@ -607,10 +675,56 @@ class Container(Box):
             node that is created to wrap the interpolated value. It is `None` if and only if
             `throw_on_resolution_failure` is `False` and an error occurs during resolution.
         """
+        index = get_resolution_index(value)
+        if index is None:
+            return self._resolve_interpolation_string_impl(
+                parent=parent,
+                value=value,
+                key=key,
+                throw_on_resolution_failure=throw_on_resolution_failure,
+                memo=memo,
+                resolved_node_cache=resolved_node_cache,
+            )
 
+        resolved = index.get(value)
+        if resolved is not None:
+            return resolved
+        frame = index.push_frame()
+        try:
+            resolved = self._resolve_interpolation_string_impl(
+                parent=parent,
+                value=value,
+                key=key,
+                throw_on_resolution_failure=throw_on_resolution_failure,
+                memo=memo,
+                resolved_node_cache=resolved_node_cache,
+            )
+        finally:
+            index.pop_frame(frame)
+        if resolved is not None:
+            # The result of "${foo}" is the node `foo` itself, which may be a container
+            # whose content can change: this is fine as long as `foo` is returned as is.
+            plan = value._get_interpolation_plan()
+            index.store(
+                value,
+                resolved,
+                frame,
+                allow_container=isinstance(plan, NodeInterpolation),
+            )
+        return resolved
+
+    def _resolve_interpolation_string_impl(
+        self,
+        parent: Optional["Container"],
+        value: "Node",
+        key: Any,
+        throw_on_resolution_failure: bool,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]] = None,
+    ) -> Optional["Node"]:
         try:
-            resolved = self.resolve_parse_tree(
-                parse_tree=parse_tree,
+            resolved = self._resolve_plan(
+                plan=value._get_interpolation_plan(),
                 node=value,
                 key=key,
                 memo=memo,
@@ -757,7 +871,16 @@ class Container(Box):
 
         resolver = OmegaConf._get_resolver(inter_type)
         if resolver is not None:
+            # The output of custom resolvers is not tracked.
+            record_untracked()
             root_node = self._get_root()
+            if resolver_stats.enabled:
+                return resolver_stats.call(
+                    inter_type,
+                    lambda: resolver(  # type: ignore
+                        root_node, self, node, inter_args, inter_args_str
+                    ),
+                )
             return resolver(
                 root_node,
                 self,
@@ -783,12 +906,10 @@ class Container(Box):
         if value_kind != ValueKind.INTERPOLATION:
             return value
 
-        parse_tree = parse(_get_value(value))
-        return self._resolve_interpolation_from_parse_tree(
+        return self._resolve_interpolation_string(
             parent=parent,
             value=value,
             key=key,
-            parse_tree=parse_tree,
             throw_on_resolution_failure=throw_on_resolution_failure,
             memo=memo if memo is not None else set(),
             resolved_node_cache=resolved_node_cache,
@@ -808,61 +929,41 @@ class Container(Box):
         We make no assumption here on the type of the tree's root, so that the
         return value may be of any type.
         """
-
-        def node_interpolation_callback(
-            inter_key: str, memo: Optional[Set[int]]
-        ) -> Optional["Node"]:
-            return self._resolve_node_interpolation(
-                inter_key=inter_key,
-                memo=memo,
-                resolved_node_cache=resolved_node_cache,
-            )
-
-        def resolver_interpolation_callback(
-            name: str, args: Tuple[Any, ...], args_str: Tuple[str, ...]
-        ) -> Any:
-            return self._evaluate_custom_resolver(
-                key=key,
-                node=node,
-                inter_type=name,
-                inter_args=args,
-                inter_args_str=args_str,
-            )
-
-        visitor = GrammarVisitor(
-            node_interpolation_callback=node_interpolation_callback,
-            resolver_interpolation_callback=resolver_interpolation_callback,
+        return self._resolve_plan(
+            plan=compile_tree(parse_tree),
+            node=node,
+            key=key,
             memo=memo,
+            resolved_node_cache=resolved_node_cache,
         )
+
+    def _resolve_plan(
+        self,
+        plan: PlanElement,
+        node: Node,
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        """
+        Resolve a given resolution plan into its value.
+
+        Plans are built by `grammar_compiler` (see `resolve_parse_tree()` to
+        resolve a parse tree instead).
+        """
         try:
-            return visitor.visit(parse_tree)
+            return plan.evaluate(self, node, key, memo, resolved_node_cache)
         except InterpolationResolutionError:
             raise
         except Exception as exc:
             # Other kinds of exceptions are wrapped in an `InterpolationResolutionError`.
-            raise InterpolationResolutionError(
-                f"{type(exc).__name__} raised while resolving interpolation: {exc}"
-            ).with_traceback(sys.exc_info()[2])
+            raise _to_resolution_error(exc).with_traceback(sys.exc_info()[2])
 
-    def _invalidate_flags_cache(self) -> None:
-        from .dictconfig import DictConfig
-        from .listconfig import ListConfig
-        from .tupleconfig import TupleConfig
-
-        # invalidate subtree cache only if the cache is initialized in this node.
 
-        if self.__dict__["_flags_cache"] is not None:
-            self.__dict__["_flags_cache"] = None
-            if isinstance(self, DictConfig):
-                content = self.__dict__["_content"]
-                if isinstance(content, dict):
-                    for value in self.__dict__["_content"].values():
-                        value._invalidate_flags_cache()
-            elif isinstance(self, (ListConfig, TupleConfig)):
-                content = self.__dict__["_content"]
-                if isinstance(content, list):
-                    for item in self.__dict__["_content"]:
-                        item._invalidate_flags_cache()
+def _to_resolution_error(exc: Exception) -> InterpolationResolutionError:
+    return InterpolationResolutionError(
+        f"{type(exc).__name__} raised while resolving interpolation: {exc}"
+    )
 
 
 class SCMode(Enum):
@@ -927,13 +1028,6 @@ class UnionNode(Box):
         else:
             return parent._get_full_key(self._metadata.key)
 
-    def _invalidate_flags_cache(self) -> None:
-        if self.__dict__["_flags_cache"] is not None:
-            super()._invalidate_flags_cache()
-            content = self.__dict__["_content"]
-            if isinstance(content, Node):
-                content._invalidate_flags_cache()
-
     def __eq__(self, other: Any) -> bool:
         content = self.__dict__["_content"]
         if isinstance(content, Node):
@@ -960,6 +1054,7 @@ class UnionNode(Box):
         return content
 
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
+        before_write(self)
         previous_content = self.__dict__["_content"]
         previous_metadata = self.__dict__["_metadata"]
         try:
@@ -968,6 +1063,7 @@ class UnionNode(Box):
             self.__dict__["_content"] = previous_content
             self.__dict__["_metadata"] = previous_metadata
             raise e
+        invalidate(self)
 
     def _set_value_impl(
         self, value: Any, flags: Optional[Dict[str, bool]] = None
@@ -1251,6 +1347,8 @@ class UnionNode(Box):
         return repr(self.__dict__["_content"])
 
     def __deepcopy__(self, memo: Dict[int, Any]) -> "UnionNode":
+        if counters.enabled:
+            counters.incr("deepcopy")
         res = object.__new__(type(self))
         for key, value in self.__dict__.items():
             if key not in ("_content", "_parent"):
@@ -1258,13 +1356,13 @@ class UnionNode(Box):
 
         src_content = self.__dict__["_content"]
         if isinstance(src_content, Node):
-            old_parent = src_content.__dict__["_parent"]
+            old_parent = src_content._parent
             try:
-                src_content.__dict__["_parent"] = None
+                object.__setattr__(src_content, "_parent", None)
                 content_copy = copy.deepcopy(src_content, memo=memo)
-                content_copy.__dict__["_parent"] = res
+                object.__setattr__(content_copy, "_parent", res)
             finally:
-                src_content.__dict__["_parent"] = old_parent
+                object.__setattr__(src_content, "_parent", old_parent)
         else:
             # None and strings can be assigned as is
             content_copy = src_content
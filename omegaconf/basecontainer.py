@@ -6,6 +6,9 @@ from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional, Tuple, Un
 
 import yaml
 
+from . import counters
+from ._copy_on_write import Shared, before_write
+from ._resolution_index import invalidate
 from ._utils import (
     _DEFAULT_MARKER_,
     ValueKind,
@@ -120,10 +123,19 @@ class BaseContainer(Container, ABC):
 
     # Support pickle
     def __getstate__(self) -> Dict[str, Any]:
+        # Shared children (see `_copy_on_write`) are pickled as nodes.
+        content = self.__dict__["_content"]
+        if isinstance(content, (dict, list)):
+            items = content.items() if isinstance(content, dict) else enumerate(content)
+            for key, value in list(items):
+                if type(value) is Shared:
+                    self._materialize(key, value)
         dict_copy = copy.copy(self.__dict__)
 
         # no need to serialize the flags cache, it can be re-constructed later
         dict_copy.pop("_flags_cache", None)
+        # memoization is not preserved by serialization
+        dict_copy.pop("_resolution_index", None)
 
         dict_copy["_metadata"] = copy.copy(dict_copy["_metadata"])
         ref_type = self._metadata.ref_type
@@ -261,6 +273,8 @@ class BaseContainer(Container, ABC):
     ) -> Union[None, Any, str, Dict[DictKeyType, Any], List[Any], Tuple[Any, ...]]:
         from omegaconf import MISSING, DictConfig, ListConfig, TupleConfig
 
+        if counters.enabled:
+            counters.incr("to_content")
         if resolve and resolved_node_cache is None:
             resolved_node_cache = {}
 
@@ -272,6 +286,10 @@ class BaseContainer(Container, ABC):
             return value
 
         def get_node_value(key: Union[DictKeyType, int]) -> Any:
+            raw = conf.__dict__["_content"][key]
+            if not isinstance(raw, Node) and not conf._is_raw_subtree(raw):
+                # Raw leaf, converted as is.
+                return raw
             try:
                 node = conf._get_child(key, throw_on_missing_value=throw_on_missing)
             except MissingMandatoryValue as e:
@@ -370,8 +388,11 @@ class BaseContainer(Container, ABC):
         """merge src into dest and return a new copy, does not modified input"""
         from omegaconf import AnyNode, DictConfig, ListConfig, TupleConfig, ValueNode
 
+        if counters.enabled:
+            counters.incr("map_merge")
         assert isinstance(dest, DictConfig)
         assert isinstance(src, DictConfig)
+        before_write(dest)
         src_type = src._metadata.object_type
         src_ref_type = get_type_hint(src)
         assert src_ref_type is not None
@@ -573,8 +594,7 @@ class BaseContainer(Container, ABC):
         _update_types(node=dest, ref_type=src_ref_type, object_type=src_type)
 
         # explicit flags on the source config are replacing the flag values in the destination
-        flags = src._metadata.flags
-        assert flags is not None
+        flags = src._metadata.flags or {}
         for flag, value in flags.items():
             if value is not None:
                 dest._set_flag(flag, value)
@@ -588,6 +608,7 @@ class BaseContainer(Container, ABC):
 
         assert isinstance(dest, ListConfig)
         assert isinstance(src, ListConfig)
+        before_write(dest)
 
         if src._is_none():
             dest._set_value(None)
@@ -609,11 +630,14 @@ class BaseContainer(Container, ABC):
                         temp_target.__dict__["_metadata"] = copy.deepcopy(
                             dest.__dict__["_metadata"]
                         )
-                        for item in content:
+                        for index, item in enumerate(content):
+                            if not isinstance(item, Node):
+                                item = dest._get_node(index)
                             if isinstance(item, DictConfig):
                                 item = OmegaConf.merge(prototype, item)
                             temp_target.append(item)
                         dest.__dict__["_content"] = temp_target.__dict__["_content"]
+                        invalidate(dest)
         elif src._is_interpolation():
             dest._set_value(src._value())
         else:
@@ -645,10 +669,10 @@ class BaseContainer(Container, ABC):
             if element_type is not None:
                 dest._metadata.element_type = element_type
             dest.__dict__["_content"] = temp_target.__dict__["_content"]
+            invalidate(dest)
 
         # explicit flags on the source config are replacing the flag values in the destination
-        flags = src._metadata.flags
-        assert flags is not None
+        flags = src._metadata.flags or {}
         for flag, value in flags.items():
             if value is not None:
                 dest._set_flag(flag, value)
@@ -662,8 +686,7 @@ class BaseContainer(Container, ABC):
         if not src._is_missing():
             dest._set_value(src)
 
-        flags = src._metadata.flags
-        assert flags is not None
+        flags = src._metadata.flags or {}
         for flag, value in flags.items():
             if value is not None:
                 dest._set_flag(flag, value)
@@ -757,6 +780,7 @@ class BaseContainer(Container, ABC):
         """
         from .nodes import AnyNode, ValueNode
 
+        before_write(self)
         if isinstance(value, Node):
             target_node_ref = self._get_node(key, validate_access=False)
             if target_node_ref is value:
@@ -821,6 +845,7 @@ class BaseContainer(Container, ABC):
             v._set_key(value_key)
             _deep_update_type_hint(node=v, type_hint=self._metadata.element_type)
             self.__dict__["_content"][value_key] = v
+            invalidate(self, value_key)
 
         if input_is_typed_vnode and not is_union_annotation(target_ref_type):
             assign(key, value)
@@ -875,6 +900,7 @@ class BaseContainer(Container, ABC):
         except ValidationError as e:
             self._format_and_raise(key=key, value=val, cause=e)
         self.__dict__["_content"][key] = wrapped
+        invalidate(self, key)
 
     @staticmethod
     def _item_eq(
@@ -936,6 +962,101 @@ class BaseContainer(Container, ABC):
     def _is_interpolation(self) -> bool:
         return _is_interpolation(self.__dict__["_content"])
 
+    # Lazy leaves: with the "lazy" flag, the primitive values assigned to untyped
+    # containers (see `_stores_raw_leaves()`) are stored as is in `_content`, as well
+    # as nested dicts and lists (raw subtrees). They are only wrapped in a node by
+    # `_get_node()`, when something needs the node: for raw subtrees, this includes
+    # any access to their content. Code reading `_content` directly must thus expect
+    # values that are not nodes. Raw values are never modified in place.
+
+    def _stores_raw_leaves(self) -> bool:
+        return self._get_flag("lazy") is True and self._metadata.element_type is Any
+
+    @staticmethod
+    def _is_raw_leaf(value: Any) -> bool:
+        """Whether `value` can be stored unwrapped in a container storing raw leaves."""
+        value_type = type(value)
+        if value_type is str:
+            return "${" not in value and value != "???"
+        return value_type is int or value_type is float or value_type is bool
+
+    @staticmethod
+    def _is_raw_subtree(value: Any) -> bool:
+        """
+        Whether `value` stands for a subtree: a dict or list stored as is, or a child
+        shared by a copy-on-write copy (see `_copy_on_write`).
+        """
+        value_type = type(value)
+        return value_type is dict or value_type is list or value_type is Shared
+
+    @staticmethod
+    def _copy_raw_subtree(value: Any) -> Any:
+        """
+        Return a copy of the dicts and lists of the raw subtree `value`, so that the
+        config never shares them with the caller, or None if `value` holds anything
+        but dicts with string keys, lists, strings, numbers, bools and None. Such a
+        subtree must be wrapped when assigned, to be validated and converted.
+        """
+        value_type = type(value)
+        if value_type is dict:
+            if not all(type(key) is str for key in value):
+                return None
+            items = value.values()
+        elif value_type is list:
+            items = value
+        else:
+            return None
+        copies = []
+        for item in items:
+            if item is None or type(item) in (str, int, float, bool):
+                copies.append(item)
+            else:
+                item = BaseContainer._copy_raw_subtree(item)
+                if item is None:
+                    return None
+                copies.append(item)
+        if value_type is dict:
+            return dict(zip(value, copies))
+        return copies
+
+    def _materialize(self, key: Any, value: Any) -> Node:
+        """Replace the raw leaf or subtree `value` at `key` with its node."""
+        if type(value) is Shared:
+            value.release()
+        node = self._to_node(key, value)
+        self.__dict__["_content"][key] = node
+        return node
+
+    def _to_node(self, key: Any, value: Any) -> Node:
+        """
+        Return the node of the raw leaf or subtree `value` at `key`, without storing
+        it in this container.
+        """
+        from .nodes import AnyNode
+        from .omegaconf import _maybe_wrap
+
+        node: Node
+        if type(value) is Shared:
+            node = copy.copy(value.node)
+            object.__setattr__(node, "_parent", self)
+            node._metadata.key = key
+            node._invalidate_flags_cache()
+        elif self._is_raw_subtree(value):
+            # Wrapped as when assigned, inheriting the flags of this container.
+            try:
+                node = _maybe_wrap(
+                    ref_type=Any, key=key, value=value, is_optional=True, parent=self
+                )
+            except ValidationError as e:
+                self._format_and_raise(key=key, value=value, cause=e)
+        else:
+            # Created detached: materializing a leaf is not a modification of the
+            # config (it must not be read-only checked, nor invalidate memoized
+            # interpolations).
+            node = AnyNode(value=value, key=key)
+            object.__setattr__(node, "_parent", self)
+        return node
+
     @abstractmethod
     def _validate_get(self, key: Any, value: Any = None) -> None: ...
 
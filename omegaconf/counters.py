@@ -0,0 +1,87 @@
+"""
+Opt-in counters of the calls to OmegaConf's hot paths, to find out where time is
+spent under load:
+
+- ``parse``: interpolation strings parsed (`grammar_parser.parse()`), of which
+  ``parse_cache_hits`` were found in the parse cache.
+- ``select``: key selections (`select()`, node interpolations).
+- ``node_wrap``: nodes created from values.
+- ``map_merge``: dict configs merged.
+- ``deepcopy``: nodes copied.
+- ``to_content``: configs converted to primitive containers (`to_container()`, ...).
+
+Counters are disabled by default, in which case each hot path only reads the
+`enabled` flag. They are process-wide: `measure()` also counts the calls made by
+other threads during the block.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Read on every counted call: this is the only cost of the disabled counters.
+enabled = False
+
+_lock = threading.Lock()
+_counts: Dict[str, int] = {}
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop counting calls (the counts are kept)."""
+    global enabled
+    enabled = False
+
+
+def is_enabled() -> bool:
+    return enabled
+
+
+def incr(name: str, count: int = 1) -> None:
+    with _lock:
+        _counts[name] = _counts.get(name, 0) + count
+
+
+def snapshot() -> Dict[str, int]:
+    """Return the current value of the counters incremented since the last reset."""
+    with _lock:
+        return dict(_counts)
+
+
+def reset() -> None:
+    with _lock:
+        _counts.clear()
+
+
+@contextmanager
+def measure() -> Iterator[Dict[str, int]]:
+    """
+    Enable the counters within a block.
+
+    The dict returned by the context manager is filled on exit with the counts
+    incremented within the block:
+
+    >>> from omegaconf import OmegaConf, counters
+    >>> with counters.measure() as counts:
+    ...     cfg = OmegaConf.create({"a": 1, "b": "${a}"})
+    ...     cfg.b
+    1
+    >>> counts["node_wrap"], counts["select"]
+    (2, 1)
+    """
+    global enabled
+    was_enabled = enabled
+    before = snapshot()
+    counts: Dict[str, int] = {}
+    enabled = True
+    try:
+        yield counts
+    finally:
+        enabled = was_enabled
+        for name, value in snapshot().items():
+            if value != before.get(name, 0):
+                counts[name] = value - before.get(name, 0)
@@ -17,6 +17,9 @@ from typing import (
     Union,
 )
 
+from . import counters
+from ._copy_on_write import Shared, before_write, share
+from ._resolution_index import invalidate
 from ._utils import (
     _DEFAULT_MARKER_,
     ValueKind,
@@ -122,6 +125,8 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
             format_and_raise(node=None, key=key, value=None, cause=ex, msg=str(ex))
 
     def __deepcopy__(self, memo: Dict[int, Any]) -> "DictConfig":
+        if counters.enabled:
+            counters.incr("deepcopy")
         res = DictConfig(None)
         res.__dict__["_metadata"] = copy.deepcopy(self.__dict__["_metadata"], memo=memo)
         res.__dict__["_flags_cache"] = copy.deepcopy(
@@ -132,14 +137,23 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
         if isinstance(src_content, dict):
             content_copy = {}
             for k, v in src_content.items():
-                old_parent = v.__dict__["_parent"]
+                if not isinstance(v, Node):
+                    # Raw leaves are immutable, raw subtrees are not shared, and the
+                    # copy can share what this config shares.
+                    content_copy[k] = (
+                        share(v, res)
+                        if type(v) is Shared
+                        else copy.deepcopy(v, memo=memo)
+                    )
+                    continue
+                old_parent = v._parent
                 try:
-                    v.__dict__["_parent"] = None
+                    object.__setattr__(v, "_parent", None)
                     vc = copy.deepcopy(v, memo=memo)
-                    vc.__dict__["_parent"] = res
+                    object.__setattr__(vc, "_parent", res)
                     content_copy[k] = vc
                 finally:
-                    v.__dict__["_parent"] = old_parent
+                    object.__setattr__(v, "_parent", old_parent)
         else:
             # None and strings can be assigned as is
             content_copy = src_content
@@ -149,6 +163,21 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
         res.__dict__["_parent"] = self.__dict__["_parent"]
         return res
 
+    def __copy__(self) -> "DictConfig":
+        # Copy-on-write: the children are shared with this config until they are
+        # accessed in the copy (see `_copy_on_write`).
+        res = DictConfig(None)
+        res.__dict__["_metadata"] = copy.deepcopy(self.__dict__["_metadata"])
+        src_content = self.__dict__["_content"]
+        if isinstance(src_content, dict):
+            res.__dict__["_content"] = {
+                k: share(v, res) for k, v in src_content.items()
+            }
+        else:
+            res.__dict__["_content"] = src_content
+        res.__dict__["_parent"] = self.__dict__["_parent"]
+        return res
+
     def copy(self) -> "DictConfig":
         return copy.copy(self)
 
@@ -408,11 +437,13 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
                     "DictConfig in read-only mode does not support deletion"
                 ),
             )
+        before_write(self)
         try:
             del self.__dict__["_content"][key]
         except KeyError:
             msg = "Attribute not found: '$KEY'"
             self._format_and_raise(key=key, value=None, cause=ConfigAttributeError(msg))
+        invalidate(self, key)
 
     def __delitem__(self, key: DictKeyType) -> None:
         key = self._validate_and_normalize_key(key)
@@ -441,11 +472,13 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
                 ),
             )
 
+        before_write(self)
         try:
             del self.__dict__["_content"][key]
         except KeyError:
             msg = "Key not found: '$KEY'"
             self._format_and_raise(key=key, value=None, cause=ConfigKeyError(msg))
+        invalidate(self, key)
 
     def get(self, key: DictKeyType, default_value: Any = None) -> Any:
         """Return the value for `key` if `key` is in the dictionary, else
@@ -458,6 +491,12 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
     def _get_impl(
         self, key: DictKeyType, default_value: Any, validate_key: bool = True
     ) -> Any:
+        content = self.__dict__["_content"]
+        if type(key) is str and type(content) is dict:
+            value = content.get(key)
+            if self._is_raw_leaf(value):
+                # Raw leaves (see `_stores_raw_leaves()`) are read without a node.
+                return value
         try:
             node = self._get_child(
                 key=key, throw_on_missing_key=True, validate_key=validate_key
@@ -499,6 +538,8 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
             if throw_on_missing_key:
                 msg = f"Missing key {key!s}" + _make_key_suggestion(key, self.keys())
                 raise ConfigKeyError(msg)
+        elif not isinstance(value, Node):
+            value = self._materialize(key, value)
         elif throw_on_missing_value and value._is_missing():
             raise MissingMandatoryValue("Missing mandatory value: $KEY")
         return value
@@ -609,6 +650,8 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
                 value = self[key]
             else:
                 value = self.__dict__["_content"][key]
+                if self._is_raw_subtree(value):
+                    value = self._get_node(key)
                 if isinstance(value, ValueNode):
                     value = value._value()
             if keys is None or key in keys:
@@ -660,12 +703,14 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
         self._metadata.object_type = object_type
 
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
+        before_write(self)
         previous_content = self.__dict__["_content"]
         try:
             self._set_value_impl(value, flags)
         except Exception:
             self.__dict__["_content"] = previous_content
             raise
+        invalidate(self)
 
     def _set_value_impl(
         self, value: Any, flags: Optional[Dict[str, bool]] = None
@@ -702,12 +747,27 @@ class DictConfig(BaseContainer, MutableMapping[Any, Any]):
                 self._metadata.flags = copy.deepcopy(flags)
                 with flag_override(self, ["struct", "readonly"], False):
                     for k, v in value.__dict__["_content"].items():
+                        if type(v) is Shared:
+                            v = value._get_node(k)
                         self.__setitem__(k, v)
                 self._metadata.object_type = value._metadata.object_type
 
             elif isinstance(value, dict):
+                raw_leaves = self._stores_raw_leaves() and self._metadata.key_type in (
+                    Any,
+                    str,
+                )
+                content = self.__dict__["_content"]
                 with flag_override(self, ["struct", "readonly"], False):
                     for k, v in value.items():
+                        if raw_leaves and type(k) is str and self._is_raw_leaf(v):
+                            content[k] = v
+                            continue
+                        if raw_leaves and type(k) is str and self._is_raw_subtree(v):
+                            subtree = self._copy_raw_subtree(v)
+                            if subtree is not None:
+                                content[k] = subtree
+                                continue
                         self.__setitem__(k, v)
                 self._metadata.object_type = dict
 
@@ -0,0 +1,817 @@
+import re
+import warnings
+from abc import ABC, abstractmethod
+from itertools import zip_longest
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+from weakref import WeakKeyDictionary
+
+from ._utils import _get_value
+from .errors import InterpolationResolutionError
+from .grammar_parser import _arg, _id, _node_path, parse
+from .grammar_visitor import (  # type: ignore
+    OmegaConfGrammarLexer,
+    OmegaConfGrammarParser,
+    OmegaConfGrammarParserVisitor,
+)
+from .typing import Antlr4ParserRuleContext
+from .vendor.antlr4 import TerminalNode  # type: ignore[attr-defined]
+
+if TYPE_CHECKING:
+    from .base import Container, Node
+
+# Resolution plans are a lightweight alternative to ANTLR parse trees: they are
+# built once from an interpolation string and can then be evaluated against a
+# config any number of times, without going through the ANTLR runtime.
+#
+# Plans are obtained either directly from the interpolation string for the most
+# common shapes of interpolations (see `compile_simple()`), or by lowering the
+# ANTLR parse tree of any other string (see `compile_tree()`).
+
+
+class PlanElement(ABC):
+    """Base class of all the elements of a resolution plan."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        """
+        Evaluate this element in the context of `container`.
+
+        `container`, `node`, `key`, `memo` and `resolved_node_cache` have the same
+        meaning as in `Container.resolve_parse_tree()`.
+        """
+        ...
+
+
+class Constant(PlanElement):
+    """A constant (non-container) value, e.g. the resolver argument in "${foo:1}"."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return self.value
+
+
+class NodeInterpolation(PlanElement):
+    """
+    A node interpolation, e.g. "${foo.bar}" (`inter_key` is "foo.bar").
+
+    `inter_key` is a plan (see `Join`) if the key contains nested interpolations,
+    e.g. "${foo.${bar}}".
+    """
+
+    __slots__ = ("inter_key",)
+
+    def __init__(self, inter_key: Union[str, PlanElement]) -> None:
+        self.inter_key = inter_key
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        inter_key = self.inter_key
+        if not isinstance(inter_key, str):
+            inter_key = inter_key.evaluate(
+                container, node, key, memo, resolved_node_cache
+            )
+        return container._resolve_node_interpolation(
+            inter_key=inter_key,
+            memo=memo,
+            resolved_node_cache=resolved_node_cache,
+        )
+
+
+class ResolverInterpolation(PlanElement):
+    """
+    A resolver interpolation, e.g. "${foo:bar,1}".
+
+    `name` is a plan (see `Join`) if the name contains nested interpolations, and
+    `args` holds the plans of the arguments, along with their original text in
+    `args_str`. When all arguments are constants, their values are computed once.
+    """
+
+    __slots__ = ("name", "args", "args_str", "_constant_args")
+
+    def __init__(
+        self,
+        name: Union[str, PlanElement],
+        args: Tuple[PlanElement, ...],
+        args_str: Tuple[str, ...],
+    ) -> None:
+        self.name = name
+        self.args = args
+        self.args_str = args_str
+        self._constant_args: Optional[Tuple[Any, ...]] = None
+        if all(isinstance(arg, Constant) for arg in args):
+            self._constant_args = tuple(cast(Constant, arg).value for arg in args)
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        name = self.name
+        if not isinstance(name, str):
+            name = name.evaluate(container, node, key, memo, resolved_node_cache)
+        return container._evaluate_custom_resolver(
+            key=key,
+            node=node,
+            inter_type=name,
+            inter_args=self.evaluate_args(
+                container, node, key, memo, resolved_node_cache
+            ),
+            inter_args_str=self.args_str,
+        )
+
+    def evaluate_args(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Tuple[Any, ...]:
+        """Evaluate the arguments of the resolver, without calling it."""
+        if self._constant_args is not None:
+            return self._constant_args
+        return tuple(
+            _get_value(arg.evaluate(container, node, key, memo, resolved_node_cache))
+            for arg in self.args
+        )
+
+
+class InterpolatedName(PlanElement):
+    """
+    An interpolation used as (part of) a config key or a resolver name, e.g. the
+    "${bar}" in "${foo.${bar}}" or "${${bar}:x}". It must resolve to a string.
+    """
+
+    __slots__ = ("interpolation", "text", "is_resolver_name")
+
+    def __init__(
+        self, interpolation: PlanElement, text: str, is_resolver_name: bool
+    ) -> None:
+        self.interpolation = interpolation
+        self.text = text
+        self.is_resolver_name = is_resolver_name
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        res = _get_value(
+            self.interpolation.evaluate(container, node, key, memo, resolved_node_cache)
+        )
+        if isinstance(res, str):
+            return res
+        if self.is_resolver_name:
+            raise InterpolationResolutionError(
+                f"The name of a resolver must be a string, but the interpolation "
+                f"{self.text} resolved to `{res}` which is of type {type(res)}"
+            )
+        raise InterpolationResolutionError(
+            f"The following interpolation is used to denote a config key and "
+            f"thus should return a string, but instead returned `{res}` of "
+            f"type `{type(res)}`: {self.text}"
+        )
+
+
+class Join(PlanElement):
+    """Join strings and `InterpolatedName` elements with `separator`."""
+
+    __slots__ = ("parts", "separator")
+
+    def __init__(
+        self, parts: Tuple[Union[str, PlanElement], ...], separator: str
+    ) -> None:
+        self.parts = parts
+        self.separator = separator
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return self.separator.join(
+            part
+            if isinstance(part, str)
+            else part.evaluate(container, node, key, memo, resolved_node_cache)
+            for part in self.parts
+        )
+
+
+class TextPlan(PlanElement):
+    """
+    Concatenation of literal strings and interpolations.
+
+    Literal strings are already un-escaped, while the results of interpolations
+    are converted to string (as in `GrammarVisitor._unescape()`).
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Tuple[Union[str, PlanElement], ...]) -> None:
+        self.chunks = chunks
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return "".join(
+            chunk
+            if isinstance(chunk, str)
+            else str(chunk.evaluate(container, node, key, memo, resolved_node_cache))
+            for chunk in self.chunks
+        )
+
+
+class QuotedValue(PlanElement):
+    """A quoted string made of a single interpolation, e.g. "'${foo}'"."""
+
+    __slots__ = ("interpolation",)
+
+    def __init__(self, interpolation: PlanElement) -> None:
+        self.interpolation = interpolation
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return str(
+            self.interpolation.evaluate(container, node, key, memo, resolved_node_cache)
+        )
+
+
+class ListContainer(PlanElement):
+    """A list, e.g. "[1, ${foo}]" (a new list is created on each evaluation)."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: Tuple[PlanElement, ...]) -> None:
+        self.items = items
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return [
+            _get_value(item.evaluate(container, node, key, memo, resolved_node_cache))
+            for item in self.items
+        ]
+
+
+class DictContainer(PlanElement):
+    """A dict, e.g. "{a: 1, b: ${foo}}" (a new dict is created on each evaluation)."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: Tuple[Tuple[PlanElement, PlanElement], ...]) -> None:
+        self.items = items
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        return {
+            k.evaluate(container, node, key, memo, resolved_node_cache): _get_value(
+                v.evaluate(container, node, key, memo, resolved_node_cache)
+            )
+            for k, v in self.items
+        }
+
+
+class MissingElement(PlanElement):
+    """
+    A missing element in a sequence, e.g. in "${foo:a,,b}". It evaluates to an
+    empty string, with a deprecation warning.
+    """
+
+    __slots__ = ("sequence_text",)
+
+    def __init__(self, sequence_text: str) -> None:
+        self.sequence_text = sequence_text
+
+    def evaluate(
+        self,
+        container: "Container",
+        node: "Node",
+        key: Any,
+        memo: Optional[Set[int]],
+        resolved_node_cache: Optional[Dict[int, "Node"]],
+    ) -> Any:
+        # DEPRECATED: remove in 2.2 (revert #571)
+        warnings.warn(
+            f"In the sequence `{self.sequence_text}` some elements are missing: please "
+            f"replace them with empty quoted strings. "
+            f"See https://github.com/omry/omegaconf/issues/572 for details.",  # noqa: E231
+            category=UserWarning,
+        )
+        return ""
+
+
+# Only spaces and tabs are whitespaces according to the grammar (`\s` would also
+# accept e.g. newlines, that the lexer does not treat as whitespaces).
+_ws = "[ \\t]*"
+_simple_args = f"{_arg}(?:{_ws},{_ws}{_arg})*"
+_SIMPLE_INTERPOLATION = re.compile(
+    f"\\${{{_ws}(?:"
+    f"(?P<node>{_node_path})"  # ${foo.bar}
+    f"|(?P<name>{_id}(?:\\.{_id})*){_ws}:{_ws}(?P<args>{_simple_args})?"  # ${foo:bar}
+    f"){_ws}}}",
+    flags=re.ASCII,
+)
+_SIMPLE_ARG_SEPARATOR = re.compile(f"{_ws},{_ws}")
+
+# Lexer rules (from `OmegaConfGrammarLexer.g4`) that may match a whole resolver
+# argument, in the order in which they are defined in the grammar (which is the
+# order used by the lexer to break ties).
+_int_unsigned = "(?:0|[1-9](?:_?[0-9])*)"
+_digits = "[0-9](?:_?[0-9])*"
+_point_float = f"(?:{_int_unsigned}\\.|{_int_unsigned}?\\.{_digits})"
+_exponent_float = f"(?:{_int_unsigned}|{_point_float})[eE][+-]?{_digits}"
+_SIMPLE_ARG_TOKENS = (
+    (
+        re.compile(
+            f"[+-]?(?:{_point_float}|{_exponent_float}|[Ii][Nn][Ff]|[Nn][Aa][Nn])"
+        ),
+        float,
+    ),
+    (re.compile(f"[+-]?{_int_unsigned}"), int),
+    (
+        re.compile("[Tt][Rr][Uu][Ee]|[Ff][Aa][Ll][Ss][Ee]"),
+        lambda s: s.lower() == "true",
+    ),
+    (re.compile("[Nn][Uu][Ll][Ll]"), lambda s: None),
+    (re.compile("[/\\-+.$%*@?|]"), str),
+    (re.compile(f"{_id}", flags=re.ASCII), str),
+)
+
+
+def _convert_simple_arg(text: str) -> Any:
+    # Mimic `GrammarVisitor._createPrimitive()`: an argument made of a single token
+    # is converted according to the type of this token, while an argument made of
+    # multiple tokens is a string (no escape sequence can occur in simple arguments).
+    for pattern, convert in _SIMPLE_ARG_TOKENS:
+        if pattern.fullmatch(text) is not None:
+            return convert(text)
+    return text
+
+
+def compile_simple(value: str) -> Optional[PlanElement]:
+    """
+    Compile `value` into a resolution plan if it is a simple interpolation string.
+
+    Simple interpolation strings are made of node interpolations such as
+    "${foo.bar}" or "${..foo[bar]}", and of resolver interpolations whose
+    arguments are unquoted constants such as "${foo:bar,1}", possibly surrounded
+    by regular text, e.g. "prefix_${x}_suffix".
+
+    :return: The resolution plan, or `None` if `value` is not a simple
+        interpolation string (in which case it must be parsed with ANTLR).
+    """
+    if "\\" in value:
+        # Backslashes may escape interpolations: leave them to the grammar.
+        return None
+
+    chunks: List[Union[str, PlanElement]] = []
+    pos = 0
+    for match in _SIMPLE_INTERPOLATION.finditer(value):
+        start = match.start()
+        if start > pos:
+            text = value[pos:start]
+            if "${" in text:
+                return None
+            chunks.append(text)
+        pos = match.end()
+
+        inter_key = match.group("node")
+        if inter_key is not None:
+            chunks.append(NodeInterpolation(inter_key))
+            continue
+
+        args_text = match.group("args")
+        args_str = (
+            () if args_text is None else tuple(_SIMPLE_ARG_SEPARATOR.split(args_text))
+        )
+        chunks.append(
+            ResolverInterpolation(
+                name=match.group("name"),
+                args=tuple(Constant(_convert_simple_arg(arg)) for arg in args_str),
+                args_str=args_str,
+            )
+        )
+
+    if pos < len(value):
+        text = value[pos:]
+        if "${" in text:
+            return None
+        chunks.append(text)
+
+    if not any(isinstance(chunk, PlanElement) for chunk in chunks):
+        return None
+    if len(chunks) == 1:
+        # A single interpolation: its result is returned "as is".
+        return cast(PlanElement, chunks[0])
+    return TextPlan(tuple(chunks))
+
+
+class PlanCompiler(OmegaConfGrammarParserVisitor):
+    """
+    Lower an ANTLR parse tree into a resolution plan.
+
+    Each `visit*()` method mirrors the corresponding method of `GrammarVisitor`,
+    but returns the plan computing the value instead of the value itself: all
+    the work that does not depend on the config (converting primitives,
+    un-escaping strings...) is thus done once and for all.
+    """
+
+    def aggregateResult(self, aggregate: List[Any], nextResult: Any) -> NoReturn:
+        raise NotImplementedError
+
+    def defaultResult(self) -> NoReturn:
+        raise NotImplementedError
+
+    def visitConfigKey(
+        self, ctx: OmegaConfGrammarParser.ConfigKeyContext
+    ) -> Union[str, PlanElement]:
+        # interpolation | ID | INTER_KEY
+        assert ctx.getChildCount() == 1
+        child = ctx.getChild(0)
+        if isinstance(child, OmegaConfGrammarParser.InterpolationContext):
+            return InterpolatedName(
+                self.visitInterpolation(child),
+                text=child.getText(),
+                is_resolver_name=False,
+            )
+        assert isinstance(child, TerminalNode)
+        return cast(str, child.symbol.text)  # type: ignore[attr-defined]
+
+    def visitConfigValue(
+        self, ctx: OmegaConfGrammarParser.ConfigValueContext
+    ) -> PlanElement:
+        # text EOF
+        assert ctx.getChildCount() == 2
+        return cast(PlanElement, self.visit(ctx.getChild(0)))
+
+    def visitDictKey(self, ctx: OmegaConfGrammarParser.DictKeyContext) -> PlanElement:
+        return self._createPrimitive(ctx)
+
+    def visitDictContainer(
+        self, ctx: OmegaConfGrammarParser.DictContainerContext
+    ) -> PlanElement:
+        # BRACE_OPEN (dictKeyValuePair (COMMA dictKeyValuePair)*)? BRACE_CLOSE
+        assert ctx.getChildCount() >= 2
+        return DictContainer(
+            tuple(
+                self.visitDictKeyValuePair(
+                    cast(
+                        OmegaConfGrammarParser.DictKeyValuePairContext, ctx.getChild(i)
+                    )
+                )
+                for i in range(1, ctx.getChildCount() - 1, 2)
+            )
+        )
+
+    def visitDictKeyValuePair(
+        self, ctx: OmegaConfGrammarParser.DictKeyValuePairContext
+    ) -> Tuple[PlanElement, PlanElement]:
+        # dictKey COLON element
+        assert ctx.getChildCount() == 3
+        return self.visit(ctx.getChild(0)), self.visit(ctx.getChild(2))
+
+    def visitElement(self, ctx: OmegaConfGrammarParser.ElementContext) -> PlanElement:
+        # primitive | quotedValue | listContainer | dictContainer
+        assert ctx.getChildCount() == 1
+        return cast(PlanElement, self.visit(ctx.getChild(0)))
+
+    def visitInterpolation(
+        self, ctx: OmegaConfGrammarParser.InterpolationContext
+    ) -> PlanElement:
+        assert ctx.getChildCount() == 1  # interpolationNode | interpolationResolver
+        return cast(PlanElement, self.visit(ctx.getChild(0)))
+
+    def visitInterpolationNode(
+        self, ctx: OmegaConfGrammarParser.InterpolationNodeContext
+    ) -> PlanElement:
+        # INTER_OPEN DOT* configKey (DOT configKey | BRACKET_OPEN configKey BRACKET_CLOSE)* INTER_CLOSE
+        assert ctx.getChildCount() >= 3
+        parts: List[Union[str, PlanElement]] = []
+        for child in ctx.getChildren():
+            if isinstance(child, TerminalNode):
+                s = child.symbol  # type: ignore[attr-defined]
+                if s.type in (
+                    OmegaConfGrammarLexer.DOT,
+                    OmegaConfGrammarLexer.BRACKET_OPEN,
+                    OmegaConfGrammarLexer.BRACKET_CLOSE,
+                ):
+                    parts.append(s.text)
+                else:
+                    assert s.type in (
+                        OmegaConfGrammarLexer.INTER_OPEN,
+                        OmegaConfGrammarLexer.INTER_CLOSE,
+                    )
+            else:
+                assert isinstance(child, OmegaConfGrammarParser.ConfigKeyContext)
+                parts.append(self.visitConfigKey(child))
+        return NodeInterpolation(_join(parts, ""))
+
+    def visitInterpolationResolver(
+        self, ctx: OmegaConfGrammarParser.InterpolationResolverContext
+    ) -> PlanElement:
+        # INTER_OPEN resolverName COLON sequence? BRACE_CLOSE
+        assert 4 <= ctx.getChildCount() <= 5
+        name = self.visitResolverName(
+            cast(OmegaConfGrammarParser.ResolverNameContext, ctx.getChild(1))
+        )
+        maybe_seq = ctx.getChild(3)
+        args: List[PlanElement] = []
+        args_str: List[str] = []
+        if isinstance(maybe_seq, OmegaConfGrammarParser.SequenceContext):
+            for arg, txt in self.visitSequence(maybe_seq):
+                args.append(arg)
+                args_str.append(txt)
+        return ResolverInterpolation(
+            name=name, args=tuple(args), args_str=tuple(args_str)
+        )
+
+    def visitListContainer(
+        self, ctx: OmegaConfGrammarParser.ListContainerContext
+    ) -> PlanElement:
+        # BRACKET_OPEN sequence? BRACKET_CLOSE
+        assert ctx.getChildCount() in (2, 3)
+        if ctx.getChildCount() == 2:
+            return ListContainer(())
+        sequence = ctx.getChild(1)
+        assert isinstance(sequence, OmegaConfGrammarParser.SequenceContext)
+        return ListContainer(tuple(item for item, _ in self.visitSequence(sequence)))
+
+    def visitPrimitive(
+        self, ctx: OmegaConfGrammarParser.PrimitiveContext
+    ) -> PlanElement:
+        return self._createPrimitive(ctx)
+
+    def visitQuotedValue(
+        self, ctx: OmegaConfGrammarParser.QuotedValueContext
+    ) -> PlanElement:
+        # (QUOTE_OPEN_SINGLE | QUOTE_OPEN_DOUBLE) text? MATCHING_QUOTE_CLOSE
+        n = ctx.getChildCount()
+        assert n in (2, 3)
+        if n == 2:
+            return Constant("")
+        text = self.visit(ctx.getChild(1))
+        if isinstance(text, (Constant, TextPlan)):
+            return cast(PlanElement, text)  # already a string
+        return QuotedValue(text)
+
+    def visitResolverName(
+        self, ctx: OmegaConfGrammarParser.ResolverNameContext
+    ) -> Union[str, PlanElement]:
+        # (interpolation | ID) (DOT (interpolation | ID))*
+        assert ctx.getChildCount() >= 1
+        items: List[Union[str, PlanElement]] = []
+        for child in list(ctx.getChildren())[::2]:
+            if isinstance(child, TerminalNode):
+                assert child.symbol.type == OmegaConfGrammarLexer.ID  # type: ignore[attr-defined]
+                items.append(child.symbol.text)  # type: ignore[attr-defined]
+            else:
+                assert isinstance(child, OmegaConfGrammarParser.InterpolationContext)
+                items.append(
+                    InterpolatedName(
+                        self.visitInterpolation(child),
+                        text=child.getText(),
+                        is_resolver_name=True,
+                    )
+                )
+        return _join(items, ".")
+
+    def visitSequence(
+        self, ctx: OmegaConfGrammarParser.SequenceContext
+    ) -> List[Tuple[PlanElement, str]]:
+        # (element (COMMA element?)*) | (COMMA element?)+
+        assert ctx.getChildCount() >= 1
+        items: List[Tuple[PlanElement, str]] = []
+        is_previous_comma = True  # whether previous child was a comma (init to True)
+        for child in ctx.getChildren():
+            if isinstance(child, OmegaConfGrammarParser.ElementContext):
+                items.append((self.visitElement(child), child.getText()))
+                is_previous_comma = False
+            else:
+                assert (
+                    isinstance(child, TerminalNode)
+                    and child.symbol.type == OmegaConfGrammarLexer.COMMA  # type: ignore[attr-defined]
+                )
+                if is_previous_comma:
+                    items.append((MissingElement(ctx.getText()), ""))
+                else:
+                    is_previous_comma = True
+        if is_previous_comma:
+            # Trailing comma.
+            items.append((MissingElement(ctx.getText()), ""))
+        return items
+
+    def visitSingleElement(
+        self, ctx: OmegaConfGrammarParser.SingleElementContext
+    ) -> PlanElement:
+        # element EOF
+        assert ctx.getChildCount() == 2
+        return cast(PlanElement, self.visit(ctx.getChild(0)))
+
+    def visitText(self, ctx: OmegaConfGrammarParser.TextContext) -> PlanElement:
+        # (interpolation | ANY_STR | ESC | ESC_INTER | TOP_ESC | QUOTED_ESC)+
+
+        # Single interpolation? If yes, its resolved value is returned "as is".
+        if ctx.getChildCount() == 1:
+            c = ctx.getChild(0)
+            if isinstance(c, OmegaConfGrammarParser.InterpolationContext):
+                return self.visitInterpolation(c)
+
+        # Otherwise, string representations are concatenated together.
+        return self._concatenate(list(ctx.getChildren()))
+
+    def _createPrimitive(
+        self,
+        ctx: Union[
+            OmegaConfGrammarParser.PrimitiveContext,
+            OmegaConfGrammarParser.DictKeyContext,
+        ],
+    ) -> PlanElement:
+        # (ID | NULL | INT | FLOAT | BOOL | UNQUOTED_CHAR | COLON | ESC | WS | interpolation)+
+        if ctx.getChildCount() == 1:
+            child = ctx.getChild(0)
+            if isinstance(child, OmegaConfGrammarParser.InterpolationContext):
+                return self.visitInterpolation(child)
+            assert isinstance(child, TerminalNode)
+            symbol = child.symbol  # type: ignore[attr-defined]
+            if symbol.type in (
+                OmegaConfGrammarLexer.ID,
+                OmegaConfGrammarLexer.UNQUOTED_CHAR,
+                OmegaConfGrammarLexer.COLON,
+            ):
+                return Constant(symbol.text)
+            elif symbol.type == OmegaConfGrammarLexer.NULL:
+                return Constant(None)
+            elif symbol.type == OmegaConfGrammarLexer.INT:
+                return Constant(int(symbol.text))
+            elif symbol.type == OmegaConfGrammarLexer.FLOAT:
+                return Constant(float(symbol.text))
+            elif symbol.type == OmegaConfGrammarLexer.BOOL:
+                return Constant(symbol.text.lower() == "true")
+            elif symbol.type == OmegaConfGrammarLexer.ESC:
+                return self._concatenate([child])
+            elif symbol.type == OmegaConfGrammarLexer.WS:  # pragma: no cover
+                # A single WS should have been "consumed" by another token.
+                raise AssertionError("WS should never be reached")
+            assert False, symbol.type
+        # Concatenation of multiple items ==> un-escape the concatenation.
+        return self._concatenate(list(ctx.getChildren()))
+
+    def _concatenate(
+        self,
+        seq: List[Union[TerminalNode, OmegaConfGrammarParser.InterpolationContext]],
+    ) -> PlanElement:
+        """
+        Build the plan concatenating all symbols / interpolations in `seq`.
+
+        Symbols are un-escaped here (see `GrammarVisitor._unescape()`), and
+        adjacent symbols are merged into a single string.
+        """
+        chunks: List[Union[str, PlanElement]] = []
+        for node, next_node in zip_longest(seq, seq[1:]):
+            if isinstance(node, TerminalNode):
+                s = node.symbol  # type: ignore
+                if s.type == OmegaConfGrammarLexer.ESC_INTER:
+                    text = s.text[-(len(s.text) // 2 + 1) :]
+                elif (
+                    s.type == OmegaConfGrammarLexer.ESC
+                    or (
+                        s.type == OmegaConfGrammarLexer.TOP_ESC
+                        and isinstance(
+                            next_node, OmegaConfGrammarParser.InterpolationContext
+                        )
+                    )
+                    or (
+                        s.type == OmegaConfGrammarLexer.QUOTED_ESC
+                        and (
+                            next_node is None
+                            or isinstance(
+                                next_node, OmegaConfGrammarParser.InterpolationContext
+                            )
+                        )
+                    )
+                ):
+                    text = s.text[1::2]  # un-escape the sequence
+                else:
+                    text = s.text  # keep the original text
+                if chunks and isinstance(chunks[-1], str):
+                    chunks[-1] = chunks[-1] + text
+                else:
+                    chunks.append(text)
+            else:
+                assert isinstance(node, OmegaConfGrammarParser.InterpolationContext)
+                chunks.append(self.visitInterpolation(node))
+
+        if len(chunks) == 1 and isinstance(chunks[0], str):
+            return Constant(chunks[0])
+        return TextPlan(tuple(chunks))
+
+
+def _join(
+    parts: List[Union[str, PlanElement]], separator: str
+) -> Union[str, PlanElement]:
+    if all(isinstance(part, str) for part in parts):
+        return separator.join(cast(List[str], parts))
+    return Join(tuple(parts), separator)
+
+
+# Plans of the parse trees compiled by `compile_tree()`. Parse trees being cached
+# by `grammar_parser.parse()`, plans live as long as their parse tree is cached.
+_compiled_trees: "WeakKeyDictionary[Antlr4ParserRuleContext, PlanElement]" = (
+    WeakKeyDictionary()
+)
+
+
+def compile_tree(parse_tree: Antlr4ParserRuleContext) -> PlanElement:
+    """
+    Lower `parse_tree` (as obtained from `grammar_parser.parse()`) into a
+    resolution plan.
+
+    The plan is remembered for as long as `parse_tree` is alive, so that
+    compiling the same tree again is only a lookup.
+    """
+    plan = _compiled_trees.get(parse_tree)
+    if plan is None:
+        plan = cast(PlanElement, PlanCompiler().visit(parse_tree))
+        _compiled_trees[parse_tree] = plan
+    return plan
+
+
+def compile_interpolation(value: str) -> PlanElement:
+    """
+    Compile interpolation string `value` into a resolution plan.
+
+    Simple interpolations are compiled directly (see `compile_simple()`), while
+    other strings are parsed with ANTLR first (see `compile_tree()`).
+    """
+    plan = compile_simple(value)
+    if plan is None:
+        plan = compile_tree(parse(value))
+    return plan
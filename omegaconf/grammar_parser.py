@@ -1,7 +1,10 @@
 import re
 import threading
-from typing import Any
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
 
+from . import counters
 from .errors import GrammarParseError
 
 # Import from visitor in order to check the presence of generated grammar files
@@ -11,13 +14,26 @@ from .grammar_visitor import (  # type: ignore
     OmegaConfGrammarParser,
 )
 from .typing import Antlr4ParserRuleContext
-from .vendor.antlr4 import CommonTokenStream, InputStream  # type: ignore[attr-defined]
+from .vendor.antlr4 import (  # type: ignore[attr-defined]
+    BailErrorStrategy,
+    CommonTokenStream,
+    InputStream,
+    PredictionMode,
+)
 from .vendor.antlr4.error.ErrorListener import ErrorListener
+from .vendor.antlr4.error.Errors import ParseCancellationException
+from .vendor.antlr4.error.ErrorStrategy import DefaultErrorStrategy
 
 # Used to cache grammar objects to avoid re-creating them on each call to `parse()`.
-# We use a per-thread cache to make it thread-safe.
+# We use a per-thread cache to make it thread-safe. Note that these objects are
+# cheap to create: the expensive parts (the ATN deserialized from the grammar and
+# the DFA built from it while parsing) are class attributes of the generated lexer
+# and parser, and are thus shared by all threads (see also `warm_up()`).
 _grammar_cache = threading.local()
 
+# Default maximum number of parse trees kept by the process-wide parse cache.
+DEFAULT_PARSE_CACHE_SIZE = 4096
+
 # Build regex pattern to efficiently identify typical interpolations.
 # See test `test_match_simple_interpolation_pattern` for examples.
 _config_key = r"[$\w]+"  # foo, $0, $bar, $foo_$bar123$
@@ -97,31 +113,218 @@ class OmegaConfErrorListener(ErrorListener):
         raise GrammarParseError("ANTLR error: ContextSensitivity")  # pragma: no cover
 
 
+# The error listener holds no state: it can be shared by all lexers / parsers.
+_error_listener = OmegaConfErrorListener()
+
+
+class ParseCache:
+    """
+    Thread-safe, size-bounded (LRU) cache of parse trees.
+
+    Entries are keyed by `(value, parser_rule, lexer_mode)`. Parse trees are never
+    modified once built, so the same tree can safely be visited by multiple
+    threads. Parse errors are not cached.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple[str, str, str], Antlr4ParserRuleContext]" = (
+            OrderedDict()
+        )
+        self._max_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resize(max_size)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Antlr4ParserRuleContext]:
+        with self._lock:
+            tree = self._data.get(key)
+            if tree is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return tree
+
+    def put(self, key: Tuple[str, str, str], tree: Antlr4ParserRuleContext) -> None:
+        with self._lock:
+            self._data[key] = tree
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, max_size: int) -> None:
+        if not isinstance(max_size, int) or isinstance(max_size, bool) or max_size < 0:
+            raise ValueError("max_size must be a non-negative integer")
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "max_size": self._max_size,
+            }
+
+    def _evict(self) -> None:
+        # Must be called with `self._lock` held.
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+_parse_cache = ParseCache(max_size=DEFAULT_PARSE_CACHE_SIZE)
+
+
+def set_parse_cache_size(max_size: int) -> None:
+    """
+    Set the maximum number of parse trees kept by the process-wide parse cache.
+
+    Least recently used entries are evicted first. Use `0` to disable the cache.
+    """
+    _parse_cache.resize(max_size)
+
+
+def get_parse_cache_stats() -> Dict[str, int]:
+    """
+    Return the statistics of the process-wide parse cache.
+
+    The returned dict holds the `hits`, `misses` and `evictions` counters, along
+    with the current `size` and `max_size` of the cache.
+    """
+    return _parse_cache.stats()
+
+
+def clear_parse_cache() -> None:
+    """Remove all entries from the process-wide parse cache and reset its counters."""
+    _parse_cache.clear()
+
+
+class ParseStrategy(Enum):
+    """Strategy used by the ANTLR parser to parse interpolations."""
+
+    # Full LL(*) parsing (default).
+    LL = 1
+    # Two-stage parsing: try the faster SLL prediction mode first, bailing out at
+    # the first error, and parse again in LL mode only if this fails.
+    SLL = 2
+
+
+_parse_strategy = ParseStrategy.LL
+
+
+def set_parse_strategy(strategy: ParseStrategy) -> None:
+    """
+    Set the strategy used by the ANTLR parser (see `ParseStrategy`).
+
+    Both strategies produce the same parse trees and raise the same errors.
+    """
+    global _parse_strategy
+    if not isinstance(strategy, ParseStrategy):
+        raise ValueError(f"Invalid parse strategy: {strategy!r}")
+    _parse_strategy = strategy
+
+
+def get_parse_strategy() -> ParseStrategy:
+    """Return the strategy used by the ANTLR parser (see `set_parse_strategy()`)."""
+    return _parse_strategy
+
+
+# Expressions covering the constructs of the grammar, parsed by `warm_up()`.
+_WARM_UP_EXPRESSIONS = {
+    ("configValue", "DEFAULT_MODE"): [
+        "${foo}",
+        "${..foo.bar[baz]}",
+        "${foo.${bar}}",
+        "x_${foo}_y \\${bar} $ \\\\${baz}",
+        "${foo:}",
+        "${ns.foo: abc, 1, -2.5e3, true, null, inf, a b c}",
+        "${foo:'quoted ${bar}',\"double\\'s\"}",
+        "${foo:[1, [a, b], {}], {a: 1, b: ${bar}, 3: [x]}}",
+        "${${foo}:a\\,b,${bar.baz}, ${oc.env:X,'y'}}",
+        "${foo:/-+.$%*@?|}",
+    ],
+    ("singleElement", "VALUE_MODE"): [
+        "abc",
+        "1",
+        "-2.5e3",
+        "null",
+        "'quoted ${bar}'",
+        "[1, a, {b: 2}]",
+        "{a: 1, b: [c, ${foo}]}",
+        "a b:c \\, ${foo}",
+    ],
+}
+
+
+def warm_up() -> None:
+    """
+    Build the DFA used by the ANTLR parser ahead of time.
+
+    This DFA is shared by all threads, but is built lazily while parsing: the first
+    few parses in a process are thus much slower than the following ones. This
+    function parses a set of typical expressions in order to pay this cost once,
+    e.g. at application startup or before forking worker processes.
+    Parse trees built by this function are not cached.
+    """
+    for (parser_rule, lexer_mode), expressions in _WARM_UP_EXPRESSIONS.items():
+        for value in expressions:
+            _parse(value, parser_rule, lexer_mode)
+
+
 def parse(
     value: str, parser_rule: str = "configValue", lexer_mode: str = "DEFAULT_MODE"
 ) -> Antlr4ParserRuleContext:
     """
     Parse interpolated string `value` (and return the parse tree).
+
+    Parse trees are cached process-wide (see `set_parse_cache_size()`): the
+    returned tree may thus be shared and must not be modified.
     """
+    if counters.enabled:
+        counters.incr("parse")
+    if _parse_cache.max_size == 0:
+        return _parse(value, parser_rule, lexer_mode)
+
+    key = (value, parser_rule, lexer_mode)
+    tree = _parse_cache.get(key)
+    if tree is None:
+        tree = _parse(value, parser_rule, lexer_mode)
+        _parse_cache.put(key, tree)
+    elif counters.enabled:
+        counters.incr("parse_cache_hits")
+    return tree
+
+
+def _parse(value: str, parser_rule: str, lexer_mode: str) -> Antlr4ParserRuleContext:
     l_mode = getattr(OmegaConfGrammarLexer, lexer_mode)
     istream = InputStream(value)
 
     cached = getattr(_grammar_cache, "data", None)
     if cached is None:
-        error_listener = OmegaConfErrorListener()
         lexer = OmegaConfGrammarLexer(istream)
         lexer.removeErrorListeners()
-        lexer.addErrorListener(error_listener)
+        lexer.addErrorListener(_error_listener)
         lexer.mode(l_mode)
         token_stream = CommonTokenStream(lexer)
         parser = OmegaConfGrammarParser(token_stream)
         parser.removeErrorListeners()
-        parser.addErrorListener(error_listener)
-
-        # The two lines below could be enabled in the future if we decide to switch
-        # to SLL prediction mode. Warning though, it has not been fully tested yet!
-        # from omegaconf.vendor.antlr4 import PredictionMode
-        # parser._interp.predictionMode = PredictionMode.SLL
+        parser.addErrorListener(_error_listener)
 
         # Note that although the input stream `istream` is implicitly cached within
         # the lexer, it will be replaced by a new input next time the lexer is re-used.
@@ -137,6 +340,13 @@ def parse(
         parser.reset()
 
     try:
+        if _parse_strategy is ParseStrategy.SLL:
+            tree = _parse_sll(parser, parser_rule)
+            if tree is not None:
+                return tree
+            # SLL parsing failed: rewind and parse again in LL mode, which reports
+            # actual syntax errors.
+            parser.reset()
         return getattr(parser, parser_rule)()  # type: ignore
     except Exception as exc:
         if type(exc) is Exception and str(exc) == "Empty Stack":
@@ -146,3 +356,24 @@ def parse(
             raise GrammarParseError("Empty Stack")
         else:
             raise
+
+
+def _parse_sll(parser: Any, parser_rule: str) -> Optional[Antlr4ParserRuleContext]:
+    """
+    Parse in SLL mode, returning `None` instead of reporting errors.
+
+    SLL parsing is faster than LL parsing, but may fail on valid inputs: such
+    failures cannot be told apart from syntax errors. Note that lexer errors are
+    still reported, since they do not depend on the prediction mode.
+    """
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    parser.removeErrorListeners()
+    try:
+        return getattr(parser, parser_rule)()  # type: ignore
+    except ParseCancellationException:
+        return None
+    finally:
+        parser._interp.predictionMode = PredictionMode.LL
+        parser._errHandler = DefaultErrorStrategy()
+        parser.addErrorListener(_error_listener)
@@ -18,6 +18,9 @@ from typing import (
 if TYPE_CHECKING:
     from .tupleconfig import TupleConfig
 
+from . import counters
+from ._copy_on_write import Shared, before_write, share
+from ._resolution_index import invalidate
 from ._utils import (
     ValueKind,
     _get_value,
@@ -144,6 +147,8 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 raise ValidationError(msg)
 
     def __deepcopy__(self, memo: Dict[int, Any]) -> "ListConfig":
+        if counters.enabled:
+            counters.incr("deepcopy")
         res = ListConfig(None)
         res.__dict__["_metadata"] = copy.deepcopy(self.__dict__["_metadata"], memo=memo)
         res.__dict__["_flags_cache"] = copy.deepcopy(
@@ -154,14 +159,23 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
         if isinstance(src_content, list):
             content_copy: List[Optional[Node]] = []
             for v in src_content:
-                old_parent = v.__dict__["_parent"]
+                if not isinstance(v, Node):
+                    # Raw leaves are immutable, raw subtrees are not shared, and the
+                    # copy can share what this config shares.
+                    content_copy.append(
+                        share(v, res)
+                        if type(v) is Shared
+                        else copy.deepcopy(v, memo=memo)
+                    )
+                    continue
+                old_parent = v._parent
                 try:
-                    v.__dict__["_parent"] = None
+                    object.__setattr__(v, "_parent", None)
                     vc = copy.deepcopy(v, memo=memo)
-                    vc.__dict__["_parent"] = res
+                    object.__setattr__(vc, "_parent", res)
                     content_copy.append(vc)
                 finally:
-                    v.__dict__["_parent"] = old_parent
+                    object.__setattr__(v, "_parent", old_parent)
         else:
             # None and strings can be assigned as is
             content_copy = src_content
@@ -171,6 +185,19 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
 
         return res
 
+    def __copy__(self) -> "ListConfig":
+        # Copy-on-write: the children are shared with this config until they are
+        # accessed in the copy (see `_copy_on_write`).
+        res = ListConfig(None)
+        res.__dict__["_metadata"] = copy.deepcopy(self.__dict__["_metadata"])
+        src_content = self.__dict__["_content"]
+        if isinstance(src_content, list):
+            res.__dict__["_content"] = [share(v, res) for v in src_content]
+        else:
+            res.__dict__["_content"] = src_content
+        res.__dict__["_parent"] = self.__dict__["_parent"]
+        return res
+
     def copy(self) -> "ListConfig":
         return copy.copy(self)
 
@@ -225,15 +252,20 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 # Normalize the slice using Python's own list-index semantics
                 # before resolving the selected elements one by one.
                 for slice_idx in range(*index.indices(len(self))):
-                    val = self._resolve_with_default(
-                        key=slice_idx, value=self.__dict__["_content"][slice_idx]
-                    )
+                    val = self.__dict__["_content"][slice_idx]
+                    if not isinstance(val, Node) and self._is_raw_subtree(val):
+                        val = self._get_node(slice_idx)
+                    if isinstance(val, Node):
+                        val = self._resolve_with_default(key=slice_idx, value=val)
                     result.append(val)
                 return result
             else:
-                return self._resolve_with_default(
-                    key=index, value=self.__dict__["_content"][index]
-                )
+                value = self.__dict__["_content"][index]
+                if not isinstance(value, Node):
+                    if not self._is_raw_subtree(value):
+                        return value
+                    value = self._get_node(index)
+                return self._resolve_with_default(key=index, value=value)
         except Exception as e:
             self._format_and_raise(key=index, value=None, cause=e)
 
@@ -288,6 +320,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             self._format_and_raise(key=index, value=value, cause=e)
 
     def append(self, item: Any) -> None:
+        before_write(self)
         content = self.__dict__["_content"]
         index = len(content)
         content.append(None)
@@ -299,10 +332,8 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             assert False
 
     def _update_keys(self) -> None:
-        for i in range(len(self)):
-            node = self._get_node(i)
-            if node is not None:
-                assert isinstance(node, Node)
+        for i, node in enumerate(self.__dict__["_content"]):
+            if isinstance(node, Node):
                 node._metadata.key = i
 
     def insert(self, index: int, item: Any) -> None:
@@ -316,6 +347,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             if self._is_missing():
                 raise MissingMandatoryValue("Cannot insert into missing ListConfig")
 
+            before_write(self)
             content = self.__dict__["_content"]
             assert isinstance(content, list)
             index = operator.index(index)
@@ -332,6 +364,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 del content[index]
                 self._update_keys()
                 raise
+            invalidate(self)
         except Exception as e:
             self._format_and_raise(key=index, value=item, cause=e)
             assert False
@@ -359,8 +392,10 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                     "Cannot delete item from read-only ListConfig"
                 ),
             )
+        before_write(self)
         del self.__dict__["_content"][key]
         self._update_keys()
+        invalidate(self)
 
     def clear(self) -> None:
         del self[:]
@@ -420,11 +455,18 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             if value is not None:
                 if isinstance(key, slice):
                     assert isinstance(value, list)
-                    for v in value:
-                        if throw_on_missing_value and v._is_missing():
+                    for pos, (i, v) in enumerate(
+                        zip(range(*key.indices(len(self))), value)
+                    ):
+                        if not isinstance(v, Node):
+                            value[pos] = self._materialize(i, v)
+                        elif throw_on_missing_value and v._is_missing():
                             raise MissingMandatoryValue("Missing mandatory value")
                 else:
-                    assert isinstance(value, Node)
+                    if not isinstance(value, Node):
+                        return self._materialize(
+                            operator.index(key) % len(self), value
+                        )
                     if throw_on_missing_value and value._is_missing():
                         raise MissingMandatoryValue("Missing mandatory value: $KEY")
             return value
@@ -445,10 +487,13 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 raise MissingMandatoryValue("Cannot get from a missing ListConfig")
             self._validate_get(index, None)
             assert isinstance(self.__dict__["_content"], list)
+            value = self.__dict__["_content"][index]
+            if not isinstance(value, Node):
+                if not self._is_raw_subtree(value):
+                    return value
+                value = self._get_node(index)
             return self._resolve_with_default(
-                key=index,
-                value=self.__dict__["_content"][index],
-                default_value=default_value,
+                key=index, value=value, default_value=default_value
             )
         except Exception as e:
             self._format_and_raise(key=index, value=None, cause=e)
@@ -467,8 +512,10 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             node = self._get_child(index)
             assert isinstance(node, Node)
             ret = self._resolve_with_default(key=index, value=node, default_value=None)
+            before_write(self)
             del self.__dict__["_content"][index]
             self._update_keys()
+            invalidate(self)
             return ret
         except KeyValidationError as e:
             self._format_and_raise(
@@ -493,15 +540,20 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             if key is None:
 
                 def key1(x: Any) -> Any:
-                    return x._value()
+                    return x._value() if isinstance(x, Node) else x
 
             else:
 
                 def key1(x: Any) -> Any:
-                    return key(x._value())
+                    return key(x._value() if isinstance(x, Node) else x)
 
             assert isinstance(self.__dict__["_content"], list)
+            before_write(self)
+            for i, x in enumerate(self.__dict__["_content"]):
+                if type(x) is Shared:
+                    self._get_node(i)
             self.__dict__["_content"].sort(key=key1, reverse=reverse)
+            invalidate(self)
 
         except Exception as e:
             self._format_and_raise(key=None, value=None, cause=e)
@@ -532,6 +584,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
     class ListIterator(Iterator[Any]):
         def __init__(self, lst: Any, resolve: bool) -> None:
             self.resolve = resolve
+            self.lst = lst
             self.iterator = iter(lst.__dict__["_content"])
             self.index = 0
             from .base import UnionNode
@@ -542,6 +595,12 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
 
         def __next__(self) -> Any:
             x = next(self.iterator)
+            if not isinstance(x, Node):
+                if not self.lst._is_raw_subtree(x):
+                    # Raw leaf.
+                    self.index = self.index + 1
+                    return x
+                x = self.lst._get_node(self.index)
             if self.resolve:
                 x = x._dereference_node()
                 if x._is_missing():
@@ -605,13 +664,17 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             )
 
         lst = self.__dict__["_content"]
-        for x in lst:
-            x = x._dereference_node()
+        for i, x in enumerate(lst):
+            if not isinstance(x, Node) and self._is_raw_subtree(x):
+                x = self._get_node(i)
+            if isinstance(x, Node):
+                x = x._dereference_node()
             if x == item:
                 return True
         return False
 
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
+        before_write(self)
         previous_content = self.__dict__["_content"]
         previous_metadata = self.__dict__["_metadata"]
         try:
@@ -620,6 +683,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             self.__dict__["_content"] = previous_content
             self.__dict__["_metadata"] = previous_metadata
             raise
+        invalidate(self)
 
     def _set_value_impl(
         self, value: Any, flags: Optional[Dict[str, bool]] = None
@@ -664,8 +728,18 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                     for item in value._iter_ex(resolve=False):
                         self.append(item)
             elif is_primitive_list(value):
+                raw_leaves = self._stores_raw_leaves()
+                content = self.__dict__["_content"]
                 with flag_override(self, ["struct", "readonly"], False):
                     for item in value:
+                        if raw_leaves and self._is_raw_leaf(item):
+                            content.append(item)
+                            continue
+                        if raw_leaves and self._is_raw_subtree(item):
+                            subtree = self._copy_raw_subtree(item)
+                            if subtree is not None:
+                                content.append(subtree)
+                                continue
                         self.append(item)
             self._metadata.object_type = list
 
@@ -6,6 +6,9 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional, Type, Union
 
+from omegaconf import counters
+from omegaconf._copy_on_write import before_write
+from omegaconf._resolution_index import invalidate
 from omegaconf._utils import (
     NoneType,
     ValueKind,
@@ -18,17 +21,25 @@ from omegaconf._utils import (
 )
 from omegaconf.base import Box, DictKeyType, Metadata, Node
 from omegaconf.errors import ReadonlyConfigError, UnsupportedValueType, ValidationError
+from omegaconf.grammar_compiler import PlanElement, compile_interpolation
 
 
 class ValueNode(Node):
+    # Value nodes are by far the most numerous nodes: they have no `__dict__`.
+    # Subclasses must also define `__slots__` (empty unless they add attributes).
+    __slots__ = ("_metadata", "_parent", "_flags_cache", "_val", "_plan")
+
     _val: Any
+    # Resolution plan of the interpolation held by `_val` (compiled on first use).
+    _plan: Optional[PlanElement]
 
     def __init__(self, parent: Optional[Box], value: Any, metadata: Metadata):
-        from omegaconf import read_write
-
-        super().__init__(parent=parent, metadata=metadata)
-        with read_write(self):
-            self._set_value(value)  # lgtm [py/init-calls-subclass]
+        self._metadata = metadata
+        self._parent = parent
+        self._flags_cache = None
+        # A new node may be readonly, is not shared and nothing depends on its value
+        # yet: the checks of `_set_value()` are skipped.
+        self._set_value_impl(value)  # lgtm [py/init-calls-subclass]
 
     def _value(self) -> Any:
         return self._val
@@ -36,7 +47,11 @@ class ValueNode(Node):
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
         if self._get_flag("readonly"):
             raise ReadonlyConfigError("Cannot set value of read-only config node")
+        before_write(self)
+        self._set_value_impl(value)
+        invalidate(self)
 
+    def _set_value_impl(self, value: Any) -> None:
         if isinstance(value, str) and get_value_kind(
             value, strict_interpolation_validation=True
         ) in (
@@ -46,6 +61,43 @@ class ValueNode(Node):
             self._val = value
         else:
             self._val = self.validate_and_convert(value)
+        self._plan = None
+
+    def _get_interpolation_plan(self) -> PlanElement:
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = compile_interpolation(self._val)
+        return plan
+
+    def __copy__(self) -> "ValueNode":
+        res = type(self).__new__(type(self))
+        res.__setstate__(self.__getstate__())
+        # The copy gets its own metadata: setting its flags or key (e.g. when a
+        # copy-on-write copy materializes it) must not modify this node.
+        metadata = res._metadata = copy.copy(self._metadata)
+        if metadata.flags is not None:
+            metadata.flags = dict(metadata.flags)
+        if metadata.resolver_cache is not None:
+            metadata.resolver_cache = dict(metadata.resolver_cache)
+        return res
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The state is a dict, as for the pickles of older versions (where value
+        # nodes had a `__dict__`). Plans and the flags cache are not pickled.
+        state_dict = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in cls.__dict__.get("__slots__", ())
+            if name not in ("_flags_cache", "_plan") and hasattr(self, name)
+        }
+        state_dict.update(getattr(self, "__dict__", {}))
+        return state_dict
+
+    def __setstate__(self, state_dict: Dict[str, Any]) -> None:
+        for name, value in state_dict.items():
+            object.__setattr__(self, name, value)
+        self._flags_cache = None
+        self._plan = None
 
     def _strict_validate_type(self, value: Any) -> None:
         ref_type = self._metadata.ref_type
@@ -101,12 +153,15 @@ class ValueNode(Node):
         return hash(self._val)
 
     def _deepcopy_impl(self, res: Any, memo: Dict[int, Any]) -> None:
-        res.__dict__["_metadata"] = copy.deepcopy(self._metadata, memo=memo)
+        if counters.enabled:
+            counters.incr("deepcopy")
+        res._metadata = copy.deepcopy(self._metadata, memo=memo)
         # shallow copy for value to support non-copyable value
-        res.__dict__["_val"] = self._val
+        res._val = self._val
+        res._plan = self._plan
 
         # parent is retained, but not copied
-        res.__dict__["_parent"] = self._parent
+        res._parent = self._parent
 
     def _is_optional(self) -> bool:
         return self._metadata.optional
@@ -126,6 +181,8 @@ class ValueNode(Node):
 
 
 class AnyNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -164,6 +221,8 @@ class AnyNode(ValueNode):
 
 
 class NoneNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -195,6 +254,8 @@ class NoneNode(ValueNode):
 
 
 class StringNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -233,6 +294,8 @@ class StringNode(ValueNode):
 
 
 class PathNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -274,6 +337,8 @@ class PathNode(ValueNode):
 
 
 class IntegerNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -313,6 +378,8 @@ class IntegerNode(ValueNode):
 
 
 class BytesNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -347,6 +414,8 @@ class BytesNode(ValueNode):
 
 
 class FloatNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -403,6 +472,8 @@ class FloatNode(ValueNode):
 
 
 class BooleanNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -459,6 +530,8 @@ class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
     This is intentional, Please open an issue against OmegaConf if you wish to discuss this decision.
     """
 
+    __slots__ = ("enum_type", "fields")
+
     def __init__(
         self,
         enum_type: Type[Enum],
@@ -540,6 +613,8 @@ class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
 
 
 class LiteralNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
+    __slots__ = ("ref_type",)
+
     def __init__(
         self,
         ref_type: Any,
@@ -600,6 +675,8 @@ class InterpolationResultNode(ValueNode):
     Special node type, used to wrap interpolation results.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any,
@@ -621,6 +698,9 @@ class InterpolationResultNode(ValueNode):
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
         if self._get_flag("readonly"):
             raise ReadonlyConfigError("Cannot set value of read-only config node")
+        self._set_value_impl(value)
+
+    def _set_value_impl(self, value: Any) -> None:
         self._val = self.validate_and_convert(value)
 
     def _validate_and_convert_impl(self, value: Any) -> Any:
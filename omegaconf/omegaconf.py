@@ -10,7 +10,8 @@ import re
 import sys
 import warnings
 from collections import defaultdict
-from contextlib import contextmanager, nullcontext
+from concurrent.futures import Executor
+from contextlib import ExitStack, contextmanager, nullcontext
 from enum import Enum
 from textwrap import dedent
 from typing import (
@@ -34,10 +35,13 @@ from typing import (
     get_type_hints,
     overload,
 )
+from weakref import WeakKeyDictionary
 
 import yaml
 
-from . import DictConfig, DictKeyType, ListConfig
+from . import DictConfig, DictKeyType, ListConfig, _diff, counters, resolver_stats
+from ._async_resolution import call_resolver
+from ._merge import MERGE_ERRORS, PreparedMerge, fold_configs
 from ._utils import (
     _DEFAULT_MARKER_,
     NoneType,
@@ -64,6 +68,7 @@ from ._utils import (
     type_str,
 )
 from ._yaml import _DEFAULT_MAX_YAML_EXPANDED_NODES, get_yaml_loader
+from .analysis import InterpolationReport, analyze
 from .base import Box, Container, Node, SCMode, UnionNode
 from .basecontainer import BaseContainer
 from .errors import (
@@ -90,6 +95,8 @@ from .nodes import (
     StringNode,
     ValueNode,
 )
+from .resolver_cache import ResolverCache, _shared_caches
+from .resolver_stats import ResolverStats
 from .tupleconfig import TupleConfig
 
 MISSING: Any = "???"
@@ -100,6 +107,18 @@ _RESOLVER_ANNOTATION_VALIDATION_POLICIES = ("off", "warn", "error")
 _SPECIAL_RESOLVER_PARAMETERS = ("_parent_", "_node_", "_root_")
 _STRICT_PRIMITIVE_TYPES = (bool, bytes, float, int, str)
 
+# Resolvers registered with `thread_safe=True` (see `OmegaConf.resolve()`), mapped to
+# the two steps of their calls, that run on the calling thread:
+#   - `begin(config, parent, node, args, args_str)` returns `(output, None)` if the
+#     output is cached, and `(_DEFAULT_MARKER_, call)` otherwise: `call()` only calls
+#     the resolver with its arguments, and may run on another thread,
+#   - `end(config, node, args_str, output)` validates (and caches) the output of
+#     `call()`, and returns it.
+_ResolverSteps = Tuple[Callable[..., Any], Callable[..., Any]]
+_thread_safe_resolvers: "WeakKeyDictionary[Callable[..., Any], _ResolverSteps]" = (
+    WeakKeyDictionary()
+)
+
 
 def _resolver_warning_stacklevel() -> int:
     package_dir = pathlib.Path(__file__).parent.resolve()
@@ -421,6 +440,7 @@ class OmegaConf:
         file_: Union[str, pathlib.Path, IO[Any]],
         *,
         max_yaml_expanded_nodes: Optional[int] = _DEFAULT_MAX_YAML_EXPANDED_NODES,
+        flags: Optional[Dict[str, bool]] = None,
     ) -> Union[DictConfig, ListConfig]:
         """
         Load a YAML config from a file path or file-like object.
@@ -432,6 +452,8 @@ class OmegaConf:
             otherwise ``10_000``. Explicit arguments override the environment.
             Pass ``None`` only for trusted input. See
             https://omegaconf.readthedocs.io/en/latest/yaml_aliases.html.
+        :param flags: Flags of the created config, as in ``OmegaConf.create()``
+            (e.g. ``{"lazy": True}``, see :ref:`lazy-flag`).
         :return: A ``DictConfig`` or ``ListConfig`` parsed from the YAML content.
         """
         if isinstance(file_, (str, pathlib.Path)):
@@ -457,9 +479,11 @@ class OmegaConf:
 
         ret: Union[DictConfig, ListConfig]
         if obj is None:
-            ret = OmegaConf.create()
+            ret = OmegaConf.create(flags=flags)
         else:
-            ret = OmegaConf.create(obj, max_yaml_expanded_nodes=max_yaml_expanded_nodes)
+            ret = OmegaConf.create(
+                obj, flags=flags, max_yaml_expanded_nodes=max_yaml_expanded_nodes
+            )
         return ret
 
     @staticmethod
@@ -555,9 +579,32 @@ class OmegaConf:
         :return: the merged config object.
         """
         assert len(configs) > 0
-        target = copy.deepcopy(configs[0])
-        target = _ensure_container(target)
-        assert isinstance(target, (DictConfig, ListConfig, TupleConfig))
+
+        def copy_first() -> Union[DictConfig, ListConfig, TupleConfig]:
+            first = configs[0]
+            if isinstance(first, (DictConfig, ListConfig)) and first._get_flag(
+                "readonly"
+            ):
+                # The result shares the subtrees left untouched by the merge with the
+                # readonly config (see `with_updates()`).
+                target = copy.copy(first)
+            else:
+                target = copy.deepcopy(first)
+            target = _ensure_container(target)
+            assert isinstance(target, (DictConfig, ListConfig, TupleConfig))
+            return target
+
+        target = copy_first()
+        if isinstance(target, DictConfig):
+            # Plain configs are folded, to be merged in a single pass (see `_merge`).
+            folded = fold_configs(target, configs[1:])
+            if folded is not None:
+                try:
+                    target._merge_with(folded, _allow_readonly_target=True)
+                    return target
+                except MERGE_ERRORS:
+                    # Raise the error of the pairwise merges.
+                    target = copy_first()
 
         target._merge_with(
             *configs[1:],
@@ -607,6 +654,25 @@ class OmegaConf:
 
         return target
 
+    @staticmethod
+    def prepare_merge(config: Any) -> PreparedMerge:
+        """
+        Prepare a config to be merged with other configs many times, typically a
+        structured config schema merged with user configs.
+
+        ``OmegaConf.prepare_merge(schema).merge(*others)`` returns the same result as
+        ``OmegaConf.merge(schema, *others)``. The schema is copied and inspected once:
+        when `others` are plain configs (primitive dicts or untyped configs, e.g.
+        loaded from YAML), each merge only visits their keys, validating their values
+        with the nodes of the schema, and shares the rest of the schema with the
+        result (see ``copy.copy()``).
+
+        :param config: the config to prepare (copied, later changes are ignored)
+        :return: an object whose ``merge(*others)`` method merges other configs into
+            a copy of `config`
+        """
+        return PreparedMerge(config)
+
     @staticmethod
     def register_resolver(
         name: str,
@@ -615,6 +681,10 @@ class OmegaConf:
         replace: bool = False,
         use_cache: bool = False,
         annotation_validation: Literal["off", "warn", "error"] = "warn",
+        thread_safe: bool = False,
+        cache_max_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        shared_cache: bool = False,
     ) -> None:
         """
         Register a resolver.
@@ -622,7 +692,9 @@ class OmegaConf:
         :param name: Name of the resolver.
         :param resolver: Callable whose arguments are provided in the interpolation,
             e.g., with ${foo:x,0,${y.z}} these arguments are respectively "x" (str),
-            0 (int) and the value of ``y.z``.
+            0 (int) and the value of ``y.z``. Interpolations using a coroutine function
+            can only be resolved with ``OmegaConf.resolve_async()`` and
+            ``OmegaConf.to_container_async()``.
         :param replace: If set to ``False`` (default), then a ``ValueError`` is raised if
             an existing resolver has already been registered with the same name.
             If set to ``True``, then the new resolver replaces the previous one.
@@ -632,12 +704,24 @@ class OmegaConf:
             based only on the string literals representing the resolver arguments, e.g.,
             ${foo:${bar}} will always return the same value regardless of the value of
             ``bar`` if the cache is enabled for ``foo``.
+            The cache of each config is an ``omegaconf.resolver_cache.ResolverCache``
+            in ``OmegaConf.get_cache(cfg)[name]``, which also counts its hits and misses.
         :param annotation_validation: Runtime policy for resolver parameter and return
             annotations. ``"off"`` disables validation, ``"warn"`` emits
             ``UserWarning`` and preserves the value, and ``"error"`` rejects
             registration problems with ``TypeError``. Validation mismatches during
             interpolation resolution are exposed as ``InterpolationResolutionError``.
             Defaults to ``"warn"`` in OmegaConf 2.4.
+        :param thread_safe: Whether the resolver can be called from several threads at
+            once. Calls to thread-safe resolvers may run concurrently when an executor
+            is passed to ``OmegaConf.resolve()``.
+        :param cache_max_size: With ``use_cache=True``, the maximum number of cached
+            outputs, the least recently used ones being evicted first.
+        :param cache_ttl: With ``use_cache=True``, the number of seconds after which
+            a cached output expires.
+        :param shared_cache: With ``use_cache=True``, use a single process-wide cache
+            for all configs (see ``OmegaConf.get_shared_cache()``) instead of a cache
+            per config.
         """
         if annotation_validation not in _RESOLVER_ANNOTATION_VALIDATION_POLICIES:
             raise TypeError(
@@ -652,6 +736,19 @@ class OmegaConf:
 
         if not replace and OmegaConf.has_resolver(name):
             raise ValueError(f"resolver '{name}' is already registered")
+        if not use_cache and (
+            cache_max_size is not None or cache_ttl is not None or shared_cache
+        ):
+            raise ValueError(
+                "cache_max_size, cache_ttl and shared_cache require use_cache=True"
+            )
+        # Also validates the cache policy.
+        shared = ResolverCache(max_size=cache_max_size, ttl=cache_ttl)
+
+        is_async = any(
+            inspect.iscoroutinefunction(f)
+            for f in (resolver, getattr(resolver, "__call__", None))
+        )
 
         def handle_registration_failure(message: str) -> None:
             if annotation_validation == "error":
@@ -824,13 +921,30 @@ class OmegaConf:
                 )
             )
 
-        def resolver_wrapper(
+        def get_resolver_cache(config: BaseContainer) -> ResolverCache:
+            if shared_cache:
+                return shared
+            caches = OmegaConf.get_cache(config)
+            cache = caches.get(name)
+            if (
+                not isinstance(cache, ResolverCache)
+                or cache.max_size != cache_max_size
+                or cache.ttl != cache_ttl
+            ):
+                # Outputs cached before the cache policy was known, or under the
+                # policy of a previous registration of the resolver, are kept.
+                cache = caches[name] = ResolverCache(
+                    cache, max_size=cache_max_size, ttl=cache_ttl
+                )
+            return cache
+
+        def begin_call(
             config: BaseContainer,
             parent: Container,
             node: Node,
             args: Tuple[Any, ...],
             args_str: Tuple[str, ...],
-        ) -> Any:
+        ) -> Tuple[Any, Optional[Callable[[], Any]]]:
             kwargs: Dict[str, Node] = {}
             if pass_parent:
                 kwargs["_parent_"] = parent
@@ -842,24 +956,45 @@ class OmegaConf:
             validate_arguments(args, kwargs, node)
 
             if use_cache:
-                cache = OmegaConf.get_cache(config)[name]
-                try:
-                    ret = cache[args_str]
-                except KeyError:
-                    ret = resolver(*args)
-                    validate_return(ret, node)
-                    cache[args_str] = ret
-                    return ret
+                ret = get_resolver_cache(config).lookup(args_str, _DEFAULT_MARKER_)
+                if ret is _DEFAULT_MARKER_:
+                    return ret, lambda: resolver(*args)
                 validate_return(ret, node, cached=True)
-                return ret
+                if resolver_stats.enabled:
+                    resolver_stats.note_cache_hit()
+                return ret, None
 
-            # Call resolver.
-            ret = resolver(*args, **kwargs)
+            return _DEFAULT_MARKER_, lambda: resolver(*args, **kwargs)
+
+        def end_call(
+            config: BaseContainer, node: Node, args_str: Tuple[str, ...], ret: Any
+        ) -> Any:
             validate_return(ret, node)
+            if use_cache:
+                get_resolver_cache(config)[args_str] = ret
             return ret
 
+        def resolver_wrapper(
+            config: BaseContainer,
+            parent: Container,
+            node: Node,
+            args: Tuple[Any, ...],
+            args_str: Tuple[str, ...],
+        ) -> Any:
+            ret, call = begin_call(config, parent, node, args, args_str)
+            if call is None:
+                return ret
+            ret = call_resolver(name, args_str, call, is_async)
+            return end_call(config, node, args_str, ret)
+
         # noinspection PyProtectedMember
         BaseContainer._resolvers[name] = resolver_wrapper
+        if thread_safe:
+            _thread_safe_resolvers[resolver_wrapper] = (begin_call, end_call)
+        if shared_cache:
+            _shared_caches[name] = shared
+        else:
+            _shared_caches.pop(name, None)
 
     @staticmethod
     def register_new_resolver(
@@ -924,7 +1059,12 @@ class OmegaConf:
                     f"https://github.com/omry/omegaconf/issues/426 for migration instructions)."  # noqa: E231
                 )
             key = args_str
-            val = cache[key] if key in cache else resolver(*args_unesc)
+            if key in cache:
+                val = cache[key]
+                if resolver_stats.enabled:
+                    resolver_stats.note_cache_hit()
+            else:
+                val = resolver(*args_unesc)
             cache[key] = val
             return val
 
@@ -948,6 +1088,7 @@ class OmegaConf:
         Clear(remove) all OmegaConf resolvers, then re-register OmegaConf's default resolvers.
         """
         BaseContainer._resolvers = {}
+        _shared_caches.clear()
         register_default_resolvers()
 
     @classmethod
@@ -965,6 +1106,7 @@ class OmegaConf:
         """
         if cls.has_resolver(name):
             BaseContainer._resolvers.pop(name)
+            _shared_caches.pop(name, None)
             return True
         else:
             # return False if resolver does not exist
@@ -976,9 +1118,57 @@ class OmegaConf:
         Return the resolver cache for ``conf``.
 
         :param conf: An OmegaConf container.
-        :return: The resolver cache dict (resolver name -> cached values).
+        :return: The resolver cache dict (resolver name -> cached values). The cached
+            values of resolvers registered with ``use_cache=True`` are held in an
+            ``omegaconf.resolver_cache.ResolverCache``, whose ``stats`` count the
+            cache hits, misses, evictions and expirations.
+        """
+        metadata = conf._metadata
+        if metadata.resolver_cache is None:
+            metadata.resolver_cache = defaultdict(dict)
+        return metadata.resolver_cache
+
+    @staticmethod
+    def get_shared_cache(name: str) -> Optional[ResolverCache]:
+        """
+        Return the process-wide cache of a resolver registered with
+        ``shared_cache=True``.
+
+        :param name: Name of the resolver.
+        :return: The ``omegaconf.resolver_cache.ResolverCache`` of the resolver, or
+            ``None`` if the resolver does not use a process-wide cache.
+        """
+        return _shared_caches.get(name)
+
+    @staticmethod
+    def enable_resolver_stats(enabled: bool = True) -> None:
+        """
+        Enable (or disable) the recording of the statistics of resolver calls,
+        returned by `OmegaConf.resolver_stats()`.
+
+        Statistics are not recorded by default, in which case resolvers are called
+        without any overhead.
+
+        :param enabled: ``False`` to stop recording, keeping the statistics recorded
+            so far.
+        """
+        if enabled:
+            resolver_stats.enable()
+        else:
+            resolver_stats.disable()
+
+    @staticmethod
+    def resolver_stats(*, reset: bool = False) -> Dict[str, ResolverStats]:
         """
-        return conf._metadata.resolver_cache
+        Return the statistics of the resolver calls recorded while enabled by
+        `OmegaConf.enable_resolver_stats()`.
+
+        :param reset: Reset the statistics after reading them.
+        :return: A dict mapping the name of each called resolver to its
+            ``omegaconf.resolver_stats.ResolverStats`` (number of calls, cache hits
+            and errors, cumulative and maximum wall time).
+        """
+        return resolver_stats.get_stats(reset=reset)
 
     @staticmethod
     def set_cache(conf: BaseContainer, cache: Dict[str, Any]) -> None:
@@ -1060,6 +1250,43 @@ class OmegaConf:
         # noinspection PyProtectedMember
         return conf._get_flag("struct")
 
+    @staticmethod
+    def set_memoized(conf: Container, value: bool) -> None:
+        """
+        Enable or disable the memoization of resolved interpolations in ``conf``.
+
+        When enabled, the result of each node interpolation (e.g. ``${foo}`` or
+        ``http://${host}:${port}``) is kept along with the nodes it was computed from,
+        and is only resolved again once one of them is modified (through assignment,
+        deletion, merge, or any other mutation of the config). Interpolations using
+        custom resolvers are always resolved again.
+
+        Memoization is not preserved by copies and serialization.
+
+        :param conf: A root OmegaConf container.
+        :param value: ``True`` to enable memoization, ``False`` to disable it.
+        :raises ValueError: If ``conf`` is not a root container.
+        """
+        from ._resolution_index import ResolutionIndex
+
+        if not isinstance(conf, Container) or conf._get_parent() is not None:
+            raise ValueError("Memoization can only be set on a root config")
+        if value:
+            if "_resolution_index" not in conf.__dict__:
+                conf.__dict__["_resolution_index"] = ResolutionIndex()
+        else:
+            conf.__dict__.pop("_resolution_index", None)
+
+    @staticmethod
+    def is_memoized(conf: Node) -> bool:
+        """
+        Return whether resolved interpolations are memoized in the config of ``conf``.
+
+        :param conf: An OmegaConf node.
+        :return: ``True`` if memoization is enabled on the root config of ``conf``.
+        """
+        return "_resolution_index" in conf._get_root().__dict__
+
     @staticmethod
     def masked_copy(conf: DictConfig, keys: Union[str, List[str]]) -> DictConfig:
         """
@@ -1446,6 +1673,91 @@ class OmegaConf:
             else:
                 assert False
 
+    @staticmethod
+    def with_updates(
+        cfg: Union[DictConfig, ListConfig],
+        updates: Dict[str, Any],
+        *,
+        merge: bool = True,
+    ) -> Union[DictConfig, ListConfig]:
+        """
+        Return a readonly variant of a config, with the values of `updates` set at their
+        key paths (see `update()`). `cfg` is not modified.
+
+        The variant shares the subtrees that are not updated with `cfg` (see
+        `copy.copy()`), and its interpolations resolve against the variant itself:
+        the memory used by a variant grows with the number of updates (and of the
+        paths accessed in it), not with the size of `cfg`. Merging a readonly config
+        (`OmegaConf.merge(variant, ...)`) shares its subtrees in the same way.
+
+        The variant of a sub-config is a root config, with the flags that the
+        sub-config inherits from its parents. Readonly nodes on the key paths of
+        `updates` are updated too.
+
+        :param cfg: input config
+        :param updates: a dict from key paths (dot/bracket notation) to values
+        :param merge: If a value is a dict or a list, True (default) to merge
+                      into the destination, False to replace the destination.
+        :return: the readonly variant
+        """
+        res = copy.copy(cfg)
+        parent = cfg._get_parent()
+        if parent is not None:
+            names: Set[str] = set()
+            while parent is not None:
+                names.update(parent._metadata.flags or ())
+                parent = parent._get_parent()
+            inherited = {name: cfg._get_flag(name) for name in names}
+            res._set_parent(None)
+            for name, value in inherited.items():
+                if value is not None and res._get_node_flag(name) is None:
+                    res._set_flag(name, value)
+        with flag_override(res, "readonly", False):
+            for key, value in updates.items():
+                with ExitStack() as stack:
+                    for node in _readonly_nodes_on_path(res, key):
+                        stack.enter_context(flag_override(node, "readonly", False))
+                    OmegaConf.update(res, key, value, merge=merge)
+        OmegaConf.set_readonly(res, True)
+        return res
+
+    @staticmethod
+    def diff(a: Any, b: Any) -> Dict[str, Any]:
+        """
+        Return a patch turning config `a` into config `b` (see `apply_patch()`).
+
+        The patch is a primitive dict that can be saved to YAML or JSON:
+        ``{"added": {path: value}, "removed": [path], "changed": {path: value}}``,
+        where paths are key paths (see `update()`) and values are primitive values or
+        containers, with unresolved interpolations and enums converted to their names.
+        Dicts are compared key by key, and lists of the same length item by item
+        (other lists are changed as a whole). Flags and types are ignored.
+
+        Subtrees shared by `a` and `b` are skipped: diffing a config and a copy-on-write
+        copy of it (see `copy.copy()` and `with_updates()`) only visits the paths to
+        the nodes modified in either of them.
+
+        :param a: the original config (or primitive dict or list)
+        :param b: the modified config (or primitive dict or list)
+        :return: the patch
+        :raises ValueError: if `a` and `b` are not both dicts or lists of the same
+            length, or if a modified dict at the root has a key that is not a string
+        """
+        return _diff.diff(a, b)
+
+    @staticmethod
+    def apply_patch(cfg: Container, patch: Any) -> None:
+        """
+        Apply a patch returned by `diff()` to a config in place: keys are removed, then
+        values are set at their key paths (see `update()`, with ``merge=False``).
+        Only the paths of the patch are visited. Keys are removed and added even in
+        struct mode (see `open_dict()`), but not in a readonly config.
+
+        :param cfg: the config to modify
+        :param patch: the patch, as a dict or a config (e.g. loaded from YAML)
+        """
+        _diff.apply_patch(cfg, patch)
+
     @staticmethod
     def to_yaml(
         cfg: Any,
@@ -1475,19 +1787,30 @@ class OmegaConf:
         )
 
     @staticmethod
-    def resolve(cfg: Container) -> None:
+    def resolve(cfg: Container, *, executor: Optional[Executor] = None) -> None:
         """
         Resolves all interpolations in the given config object in-place.
 
+        Each interpolation is resolved once, after the interpolations it depends on
+        (see ``OmegaConf.analyze()``), and cycles between interpolations are reported
+        before anything is resolved.
+
         This function works correctly for configs that use only node interpolations
         (``${key}``) with no custom resolvers. When custom resolvers are involved,
-        results may depend on the depth-first, key insertion order traversal, because
-        custom resolvers can do anything — they may be stateful, have side effects, or
-        return different values on each call — and this function has no way to account
-        for that.
+        results may depend on the order in which the interpolations are resolved,
+        because custom resolvers can do anything — they may be stateful, have side
+        effects, or return different values on each call — and this function has no
+        way to account for that.
 
         :param cfg: An OmegaConf container.
+        :param executor: If set, interpolations that are a call to a resolver
+            registered with ``thread_safe=True`` (e.g. ``${read_secret:db}``) and
+            that do not depend on each other are resolved concurrently: the resolver
+            calls are submitted to this executor (typically a
+            ``concurrent.futures.ThreadPoolExecutor``), and their results are written
+            back to the config in the same order as without an executor.
         :raises ValueError: If the input object is not an OmegaConf container.
+        :raises InterpolationResolutionError: On cycles between interpolations.
         """
         import omegaconf._impl
 
@@ -1497,7 +1820,63 @@ class OmegaConf:
             raise ValueError(
                 f"Invalid config type ({type(cfg).__name__}), expected an OmegaConf Container"
             )
-        omegaconf._impl._resolve(cfg)
+        omegaconf._impl._resolve_in_order(cfg, executor=executor)
+
+    @staticmethod
+    async def resolve_async(cfg: Container) -> None:
+        """
+        Like ``OmegaConf.resolve()``, with support for asynchronous resolvers.
+
+        Interpolations using resolvers that are coroutine functions can only be
+        resolved this way. Interpolations that do not depend on each other are
+        resolved concurrently: the resolvers they use are awaited together.
+
+        :param cfg: An OmegaConf container.
+        :raises ValueError: If the input object is not an OmegaConf container.
+        :raises InterpolationResolutionError: On cycles between interpolations.
+        """
+        import omegaconf._impl
+
+        if not OmegaConf.is_config(cfg):
+            raise ValueError(
+                f"Invalid config type ({type(cfg).__name__}), expected an OmegaConf Container"
+            )
+        await omegaconf._impl._resolve_in_order_async(cfg)
+
+    @staticmethod
+    async def to_container_async(
+        cfg: Any,
+        *,
+        resolve: bool = False,
+        throw_on_missing: bool = False,
+        enum_to_str: bool = False,
+        structured_config_mode: SCMode = SCMode.DICT,
+    ) -> Union[Dict[DictKeyType, Any], List[Any], Tuple[Any, ...], None, str, Any]:
+        """
+        Like ``OmegaConf.to_container()``, with support for asynchronous resolvers
+        (see ``OmegaConf.resolve_async()``) when ``resolve`` is ``True``.
+
+        ``cfg`` is left unchanged: a copy of its root config is resolved.
+        """
+        if not OmegaConf.is_config(cfg):
+            raise ValueError(
+                f"Input cfg is not an OmegaConf config object ({type_str(type(cfg))})"
+            )
+        if resolve:
+            # `cfg` is copied along with its root, so that it can still refer to any
+            # node of the root config.
+            memo: Dict[int, Any] = {}
+            copy.deepcopy(cfg._get_root(), memo)
+            cfg = memo[id(cfg)]
+            await OmegaConf.resolve_async(cfg)
+
+        return OmegaConf.to_container(
+            cfg,
+            resolve=resolve,
+            throw_on_missing=throw_on_missing,
+            enum_to_str=enum_to_str,
+            structured_config_mode=structured_config_mode,
+        )
 
     @staticmethod
     def missing_keys(cfg: Any, *, resolve_custom_resolvers: bool = False) -> Set[str]:
@@ -1588,6 +1967,24 @@ class OmegaConf:
         gather(cfg)
         return missings
 
+    @staticmethod
+    def analyze(cfg: Any) -> InterpolationReport:
+        """
+        Analyze the interpolations of a config, without resolving them.
+
+        The report lists, for each interpolated node, the keys it references (and
+        whether they exist) and the resolvers it uses, along with the dependencies
+        between interpolated nodes: cycles, and an order in which the interpolations
+        can be resolved. For a sub-config, the report covers its interpolated nodes
+        and the interpolated nodes they depend on, by full key from the root.
+
+        :param cfg: An ``OmegaConf.Container``,
+                    or a convertible object via ``OmegaConf.create`` (dict, list, ...).
+        :return: An ``omegaconf.analysis.InterpolationReport``.
+        :raises ValueError: On input not representing a config.
+        """
+        return analyze(_ensure_container(cfg))
+
     # === private === #
 
     @staticmethod
@@ -1829,6 +2226,8 @@ def _node_wrap(
     key: Any,
     ref_type: Any = Any,
 ) -> Node:
+    if counters.enabled:
+        counters.incr("node_wrap")
     node: Node
     if is_dict_annotation(ref_type) or (is_primitive_dict(value) and ref_type is Any):
         key_type, element_type = get_dict_key_value_types(ref_type)
@@ -2008,6 +2407,26 @@ def _select_one(
     return val, ret_key
 
 
+def _readonly_nodes_on_path(cfg: Container, key: str) -> List[Node]:
+    """Return the existing nodes on the key path `key` with their own readonly flag."""
+    nodes: List[Node] = []
+    current: Node = cfg
+    for part in split_key(key):
+        if not isinstance(current, Container) or current._is_none():
+            break
+        if current._is_missing() or current._is_interpolation():
+            break
+        child, _ = _select_one(
+            current, part, throw_on_missing=False, throw_on_type_error=False
+        )
+        if child is None:
+            break
+        if child._get_node_flag("readonly"):
+            nodes.append(child)
+        current = child
+    return nodes
+
+
 def _get_update_interpolation_target(
     node: Node, memo: Optional[Set[int]] = None
 ) -> Optional[Container]:
@@ -0,0 +1,176 @@
+"""
+Caches of the outputs of custom resolvers registered with ``use_cache=True``
+(see `OmegaConf.register_resolver()`).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterator, MutableMapping, Optional
+
+# Process-wide caches of the resolvers registered with `shared_cache=True`, by name.
+_shared_caches: Dict[str, "ResolverCache"] = {}
+
+
+@dataclass(frozen=True)
+class ResolverCacheStats:
+    """
+    Counters of a `ResolverCache`.
+
+    :ivar hits: Lookups that found a cached output.
+    :ivar misses: Lookups that did not find a cached output (including expired ones).
+    :ivar evictions: Outputs removed to keep the cache within its ``max_size``.
+    :ivar expirations: Outputs removed because they were older than the ``ttl``.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResolverCache(MutableMapping[Hashable, Any]):
+    """
+    Thread-safe cache of the outputs of a resolver, keyed by the string literals of
+    its arguments.
+
+    :param max_size: Maximum number of cached outputs, the least recently used ones
+        being evicted first. ``None`` (default) for no limit.
+    :param ttl: Number of seconds after which a cached output expires. ``None``
+        (default) for outputs that never expire.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[Hashable, Any]] = None,
+        *,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        if max_size is not None and max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Expiration time of each entry, when there is a ttl.
+        self._expires: Dict[Hashable, float] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        if entries is not None:
+            self.update(entries)
+
+    @property
+    def stats(self) -> ResolverCacheStats:
+        with self._lock:
+            return ResolverCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def lookup(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached output for `key`, or `default` if there is none.
+
+        Unlike `cache[key]`, this updates the statistics of the cache.
+        """
+        with self._lock:
+            self._expire(key)
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._hits += 1
+            if self.max_size is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _expire(self, key: Hashable) -> None:
+        # Must be called with `self._lock` held.
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._expirations += 1
+            self._remove(key)
+
+    def _expire_all(self) -> None:
+        # Must be called with `self._lock` held.
+        if self._expires:
+            now = time.monotonic()
+            for key, expires in list(self._expires.items()):
+                if expires <= now:
+                    self._expirations += 1
+                    self._remove(key)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        # Unlike `lookup()`, this neither updates the statistics (except for the
+        # expirations) nor marks the output as recently used.
+        with self._lock:
+            self._expire(key)
+            return self._entries[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    oldest, _ = self._entries.popitem(last=False)
+                    self._expires.pop(oldest, None)
+                    self._evictions += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        # Must be called with `self._lock` held.
+        del self._entries[key]
+        self._expires.pop(key, None)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # Iterate over a snapshot of the keys, which other threads may modify.
+        with self._lock:
+            self._expire_all()
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire_all()
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._expires.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks can be neither pickled nor copied.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        with self._lock:
+            self._expire_all()
+            entries = dict(self._entries)
+        return (
+            f"ResolverCache({entries!r}, max_size={self.max_size}, ttl={self.ttl})"
+        )
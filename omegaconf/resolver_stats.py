@@ -0,0 +1,205 @@
+"""
+Opt-in instrumentation of custom resolvers: number of calls, wall time and cache hits
+of each resolver (see `OmegaConf.resolver_stats()`).
+
+The instrumentation is disabled by default. When disabled, resolvers are called
+directly and nothing is recorded.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from . import _async_resolution
+
+
+@dataclass(frozen=True)
+class ResolverStats:
+    """
+    Statistics of a resolver, accumulated while the instrumentation is enabled.
+
+    :ivar calls: Number of times the resolver was called by an interpolation.
+    :ivar cache_hits: Calls whose output was found in the resolver cache
+        (see ``use_cache`` in `OmegaConf.register_resolver()`).
+    :ivar errors: Calls that raised an exception.
+    :ivar total_time: Cumulative wall time of the calls, in seconds.
+    :ivar max_time: Wall time of the slowest call, in seconds.
+    """
+
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class ResolverCall:
+    """
+    A resolver call, as passed to the callbacks registered with `add_callback()`.
+
+    :ivar name: Name of the resolver.
+    :ivar elapsed: Wall time of the call, in seconds.
+    :ivar cache_hit: Whether the output was found in the resolver cache.
+    :ivar failed: Whether the call raised an exception.
+    """
+
+    name: str
+    elapsed: float
+    cache_hit: bool
+    failed: bool
+
+
+ResolverCallback = Callable[[ResolverCall], None]
+
+# Read on every resolver call: this is the only cost of the disabled instrumentation.
+enabled = False
+
+_lock = threading.Lock()
+_stats: Dict[str, ResolverStats] = {}
+_callbacks: List[ResolverCallback] = []
+# Stack of the resolver calls in progress in the current thread (resolvers may
+# resolve other interpolations, and thus call other resolvers).
+_calls = threading.local()
+
+
+class _Frame:
+    __slots__ = ("cache_hit", "replayed")
+
+    def __init__(self) -> None:
+        self.cache_hit = False
+        self.replayed = False
+
+
+def enable() -> None:
+    """Start recording the statistics of resolver calls."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording the statistics of resolver calls (they are kept)."""
+    global enabled
+    enabled = False
+
+
+def is_enabled() -> bool:
+    return enabled
+
+
+def get_stats(reset: bool = False) -> Dict[str, ResolverStats]:
+    """
+    Return the statistics of each resolver called since they were last reset.
+
+    :param reset: Reset the statistics after reading them.
+    """
+    with _lock:
+        stats = dict(_stats)
+        if reset:
+            _stats.clear()
+    return stats
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def add_callback(callback: ResolverCallback) -> None:
+    """
+    Call `callback` with a `ResolverCall` after each resolver call, while the
+    instrumentation is enabled (e.g. to forward it to a metrics system).
+
+    Callbacks are called in the thread resolving the interpolation, and should thus
+    be fast and not raise exceptions.
+    """
+    with _lock:
+        _callbacks.append(callback)
+
+
+def remove_callback(callback: ResolverCallback) -> None:
+    with _lock:
+        _callbacks.remove(callback)
+
+
+def call(name: str, fn: Callable[[], Any]) -> Any:
+    """Return `fn()`, the call of resolver `name`, recording its statistics."""
+    stack = _stack()
+    frame = _Frame()
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        ret = fn()
+    except _async_resolution.AwaitRequired:
+        # An asynchronous resolver returned an awaitable: the time to await it is not
+        # included, and the resolution starting over replays the result.
+        _record(name, time.perf_counter() - start, frame, failed=False)
+        raise
+    except Exception:
+        if not frame.replayed:
+            _record(name, time.perf_counter() - start, frame, failed=True)
+        raise
+    else:
+        if not frame.replayed:
+            _record(name, time.perf_counter() - start, frame, failed=False)
+        return ret
+    finally:
+        stack.pop()
+
+
+def note_cache_hit() -> None:
+    """Mark the resolver call in progress as served by the resolver cache."""
+    frame = _current()
+    if frame is not None:
+        frame.cache_hit = True
+
+
+def note_replay() -> None:
+    """
+    Mark the resolver call in progress as the replay of a call that was already
+    recorded (see `OmegaConf.resolve_async()`).
+    """
+    frame = _current()
+    if frame is not None:
+        frame.replayed = True
+
+
+def _stack() -> List[_Frame]:
+    try:
+        return _calls.stack  # type: ignore
+    except AttributeError:
+        stack: List[_Frame] = []
+        _calls.stack = stack
+        return stack
+
+
+def _current() -> Optional[_Frame]:
+    stack = getattr(_calls, "stack", None)
+    return stack[-1] if stack else None
+
+
+def _record(name: str, elapsed: float, frame: _Frame, failed: bool) -> None:
+    with _lock:
+        stats = _stats.get(name, _EMPTY)
+        _stats[name] = ResolverStats(
+            calls=stats.calls + 1,
+            cache_hits=stats.cache_hits + frame.cache_hit,
+            errors=stats.errors + failed,
+            total_time=stats.total_time + elapsed,
+            max_time=max(stats.max_time, elapsed),
+        )
+        callbacks = list(_callbacks)
+    if callbacks:
+        event = ResolverCall(
+            name=name, elapsed=elapsed, cache_hit=frame.cache_hit, failed=failed
+        )
+        for callback in callbacks:
+            callback(event)
+
+
+_EMPTY = ResolverStats()
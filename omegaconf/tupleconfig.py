@@ -3,6 +3,9 @@ import operator
 from collections.abc import Sequence
 from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from . import counters
+from ._copy_on_write import before_write
+from ._resolution_index import invalidate
 from ._utils import (
     ValueKind,
     _get_value,
@@ -94,6 +97,8 @@ class TupleConfig(BaseContainer, Sequence[Any]):
         )
 
     def __deepcopy__(self, memo: Dict[int, Any]) -> "TupleConfig":
+        if counters.enabled:
+            counters.incr("deepcopy")
         res = TupleConfig(None)
         res.__dict__["_metadata"] = copy.deepcopy(self.__dict__["_metadata"], memo)
         res.__dict__["_flags_cache"] = copy.deepcopy(
@@ -104,14 +109,14 @@ class TupleConfig(BaseContainer, Sequence[Any]):
         if isinstance(src_content, list):
             content_copy: List[Node] = []
             for value in src_content:
-                old_parent = value.__dict__["_parent"]
+                old_parent = value._parent
                 try:
-                    value.__dict__["_parent"] = None
+                    object.__setattr__(value, "_parent", None)
                     value_copy = copy.deepcopy(value, memo)
-                    value_copy.__dict__["_parent"] = res
+                    object.__setattr__(value_copy, "_parent", res)
                     content_copy.append(value_copy)
                 finally:
-                    value.__dict__["_parent"] = old_parent
+                    object.__setattr__(value, "_parent", old_parent)
         else:
             content_copy = src_content  # type: ignore[assignment]
 
@@ -228,6 +233,7 @@ class TupleConfig(BaseContainer, Sequence[Any]):
         """Replace an element while materializing an interpolation in-place."""
         from omegaconf.omegaconf import _maybe_wrap
 
+        before_write(self)
         content = self.__dict__["_content"]
         assert isinstance(content, list)
         optional, item_type = _resolve_optional(self._item_type(key))
@@ -238,6 +244,7 @@ class TupleConfig(BaseContainer, Sequence[Any]):
             is_optional=optional,
             parent=self,
         )
+        invalidate(self)
 
     def __delitem__(self, key: Any) -> None:
         self._raise_immutable(key=key)
@@ -450,6 +457,7 @@ class TupleConfig(BaseContainer, Sequence[Any]):
         return self * count
 
     def _set_value(self, value: Any, flags: Optional[Dict[str, bool]] = None) -> None:
+        before_write(self)
         previous_content = self.__dict__["_content"]
         previous_metadata = self.__dict__["_metadata"]
         try:
@@ -458,6 +466,7 @@ class TupleConfig(BaseContainer, Sequence[Any]):
             self.__dict__["_content"] = previous_content
             self.__dict__["_metadata"] = previous_metadata
             raise
+        invalidate(self)
 
     def _set_value_impl(
         self, value: Any, flags: Optional[Dict[str, bool]] = None
@@ -0,0 +1,152 @@
+import asyncio
+from typing import Any, List
+
+from pytest import raises, warns
+
+from omegaconf import OmegaConf
+from omegaconf.errors import InterpolationResolutionError
+
+
+async def twice(x: Any) -> Any:
+    await asyncio.sleep(0)
+    return x * 2
+
+
+def test_async_resolver_sync_access(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("twice", twice)
+    cfg = OmegaConf.create({"a": "${twice:1}", "b": 1})
+    assert cfg.b == 1
+    with raises(
+        InterpolationResolutionError,
+        match=r"Resolver 'twice' is asynchronous.*OmegaConf\.resolve_async\(\)",
+    ):
+        cfg.a
+
+
+def test_resolve_async(restore_resolvers: Any) -> None:
+    calls: List[Any] = []
+
+    def record(x: Any) -> Any:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("twice", twice)
+    OmegaConf.register_resolver("record", record)
+    cfg = OmegaConf.create(
+        {
+            "a": "${twice:1}",
+            "b": "${twice:${a}}_${record:b}_${twice:x}",
+            "c": {"d": "${record:${twice:${a}}}"},
+            "e": ["${twice:[1]}", "${c.d}"],
+            "f": "${a}",
+        }
+    )
+    asyncio.run(OmegaConf.resolve_async(cfg))
+    assert OmegaConf.to_container(cfg) == {
+        "a": 2,
+        "b": "4_b_xx",
+        "c": {"d": 4},
+        "e": [[1, 1], 4],
+        "f": 2,
+    }
+    # Resolvers are called once for each interpolation, even though resolving "b"
+    # and "c.d" is started over after awaiting `twice`.
+    assert sorted(calls, key=str) == [4, "b"]
+
+
+def test_resolve_async_is_concurrent(restore_resolvers: Any) -> None:
+    started = []
+
+    async def gather(name: str) -> str:
+        started.append(name)
+        while len(started) < 3:
+            await asyncio.sleep(0)
+        return name
+
+    async def main() -> None:
+        await asyncio.wait_for(OmegaConf.resolve_async(cfg), timeout=10)
+
+    OmegaConf.register_resolver("gather", gather)
+    cfg = OmegaConf.create(
+        {"a": "${gather:a}", "b": {"c": "${gather:c}"}, "d": ["${gather:d}"]}
+    )
+    asyncio.run(main())
+    assert cfg == {"a": "a", "b": {"c": "c"}, "d": ["d"]}
+
+
+def test_resolve_async_error(restore_resolvers: Any) -> None:
+    async def fail(x: Any) -> Any:
+        await asyncio.sleep(0)
+        raise ValueError(x)
+
+    OmegaConf.register_resolver("fail", fail)
+    cfg = OmegaConf.create({"a": {"b": "x_${fail:1}"}})
+    with raises(
+        InterpolationResolutionError,
+        match="ValueError raised while resolving interpolation: 1",
+    ):
+        asyncio.run(OmegaConf.resolve_async(cfg))
+
+
+def test_resolve_async_cached_resolver(restore_resolvers: Any) -> None:
+    calls = []
+
+    async def count(x: Any) -> Any:
+        calls.append(x)
+        return len(calls)
+
+    OmegaConf.register_resolver("count", count, use_cache=True)
+    cfg = OmegaConf.create({"a": "${count:x}", "b": "${count:x}", "c": "${count:y}"})
+    asyncio.run(OmegaConf.resolve_async(cfg))
+    assert cfg.a == cfg.b
+    assert sorted([cfg.a, cfg.c]) == [1, 2]
+    assert sorted(calls) == ["x", "y"]
+
+
+def test_resolve_async_cached_sync_resolver(restore_resolvers: Any) -> None:
+    calls = []
+
+    def upper(x: Any) -> Any:
+        calls.append(x)
+        return f"S{x}"
+
+    # The cached resolver is called on the first attempt only: the calls of `twice`
+    # replayed on the next attempts must still get their own results.
+    OmegaConf.register_resolver("s", upper, use_cache=True)
+    OmegaConf.register_resolver("twice", twice)
+    cfg = OmegaConf.create({"a": "${s:1}-${twice:2}-${s:3}-${twice:4}"})
+    asyncio.run(OmegaConf.resolve_async(cfg))
+    assert cfg.a == "S1-4-S3-8"
+    assert calls == [1, 3]
+
+
+def test_resolve_async_annotation_validation(restore_resolvers: Any) -> None:
+    async def as_text(x: Any) -> str:
+        return x
+
+    OmegaConf.register_resolver("as_text", as_text)
+    cfg = OmegaConf.create({"a": "${as_text:1}"})
+    with warns(UserWarning, match="return value expected str, got int"):
+        asyncio.run(OmegaConf.resolve_async(cfg))
+    assert cfg.a == 1
+
+
+def test_resolve_async_invalid_input() -> None:
+    with raises(ValueError):
+        asyncio.run(OmegaConf.resolve_async("aaa"))  # type: ignore
+
+
+def test_to_container_async(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("twice", twice)
+    cfg = OmegaConf.create({"a": "${twice:1}", "b": {"c": "${twice:${a}}"}})
+    assert asyncio.run(OmegaConf.to_container_async(cfg, resolve=True)) == {
+        "a": 2,
+        "b": {"c": 4},
+    }
+    assert asyncio.run(OmegaConf.to_container_async(cfg.b, resolve=True)) == {"c": 4}
+    assert asyncio.run(OmegaConf.to_container_async(cfg.b)) == {"c": "${twice:${a}}"}
+    # `cfg` is not modified.
+    assert OmegaConf.to_container(cfg) == {
+        "a": "${twice:1}",
+        "b": {"c": "${twice:${a}}"},
+    }
@@ -1,11 +1,17 @@
+import copy
+import pickle
 import random
+import itertools
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from pytest import mark, param, raises, warns
 
 from omegaconf import OmegaConf, Resolver
 from omegaconf.nodes import InterpolationResultNode
+from omegaconf.resolver_cache import ResolverCache, ResolverCacheStats
 from tests import User
 from tests.interpolation import dereference_node
 
@@ -206,6 +212,158 @@ def test_resolver_cache_4_interpolation(restore_resolvers: Any) -> None:
     assert c.x == 0  # cache is based on string literals
 
 
+def test_resolver_cache_max_size(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("test", lambda x: [x], use_cache=True, cache_max_size=2)
+    c = OmegaConf.create({"a": "${test:a}", "b": "${test:b}", "c": "${test:c}"})
+    a = c.a
+    assert c.b == ["b"]
+    assert c.a is a  # "a" is now more recently used than "b"
+    assert c.c == ["c"]  # evicts "b"
+    assert c.a is a
+    cache = OmegaConf.get_cache(c)["test"]
+    assert isinstance(cache, ResolverCache)
+    assert cache == {("a",): ["a"], ("c",): ["c"]}
+    assert cache.stats == ResolverCacheStats(hits=2, misses=3, evictions=1)
+    cache.reset_stats()
+    assert cache.stats == ResolverCacheStats()
+
+
+def test_resolver_cache_ttl(mocker: Any, restore_resolvers: Any) -> None:
+    monotonic = mocker.patch("omegaconf.resolver_cache.time.monotonic")
+    monotonic.return_value = 100.0
+    OmegaConf.register_resolver("test", lambda x: [x], use_cache=True, cache_ttl=10)
+    c = OmegaConf.create({"a": "${test:a}"})
+    a = c.a
+    monotonic.return_value = 109.0
+    assert c.a is a
+    monotonic.return_value = 110.0
+    assert c.a is not a
+    assert OmegaConf.get_cache(c)["test"].stats == ResolverCacheStats(
+        hits=1, misses=2, expirations=1
+    )
+
+
+def test_resolver_cache_ttl_mapping(mocker: Any) -> None:
+    monotonic = mocker.patch("omegaconf.resolver_cache.time.monotonic")
+    monotonic.return_value = 100.0
+    cache = ResolverCache({("a",): 1}, ttl=10)
+    cache[("b",)] = 2
+    monotonic.return_value = 110.0
+    assert len(cache) == 0
+    with raises(KeyError):
+        cache[("a",)]
+    assert list(cache) == [] and cache == {}
+    assert cache.stats == ResolverCacheStats(expirations=2)
+
+
+def test_resolver_cache_policy_replaced(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("test", lambda x: [x], use_cache=True, cache_max_size=1)
+    c = OmegaConf.create({"a": "${test:a}", "b": "${test:b}"})
+    a = c.a
+    OmegaConf.register_resolver("test", lambda x: [x], use_cache=True, replace=True)
+    assert c.a is a
+    b = c.b
+    assert c.a is a and c.b is b
+    cache = OmegaConf.get_cache(c)["test"]
+    assert cache.max_size is None and cache.ttl is None
+    assert cache == {("a",): ["a"], ("b",): ["b"]}
+
+
+def test_resolver_shared_cache(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver(
+        "random", lambda _: random.randint(0, 10000000), use_cache=True
+    )
+    OmegaConf.register_resolver(
+        "shared",
+        lambda _: random.randint(0, 10000000),
+        use_cache=True,
+        shared_cache=True,
+    )
+    c1 = OmegaConf.create({"k": "${shared:__}"})
+    c2 = OmegaConf.create({"k": "${shared:__}"})
+    assert c1.k == c2.k
+    assert OmegaConf.get_cache(c1) == {}
+    cache = OmegaConf.get_shared_cache("shared")
+    assert cache is not None
+    assert cache.stats == ResolverCacheStats(hits=1, misses=1)
+    assert OmegaConf.get_shared_cache("random") is None
+
+    OmegaConf.register_resolver("shared", lambda _: 0, replace=True)
+    assert OmegaConf.get_shared_cache("shared") is None
+
+
+def test_resolver_cache_threads(mocker: Any) -> None:
+    ticks = itertools.count()
+
+    def monotonic() -> float:
+        # Let other threads run in the middle of the cache operations.
+        time.sleep(0)
+        return float(next(ticks))
+
+    mocker.patch("omegaconf.resolver_cache.time.monotonic", monotonic)
+    # Outputs expire after a few cache operations, and are evicted after 4 stores.
+    cache = ResolverCache(max_size=4, ttl=20)
+    lookups = 500
+
+    def work(thread: int) -> None:
+        for i in range(lookups):
+            key = (i % 8,)
+            if cache.lookup(key) is None:
+                cache[key] = thread
+            if i % 100 == 0:
+                cache.clear()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+    stats = cache.stats
+    assert stats.hits + stats.misses == 8 * lookups
+    assert stats.expirations > 0
+    assert len(cache) <= 4
+
+
+def test_resolver_cache_copy() -> None:
+    cache = ResolverCache({("a",): 1}, max_size=2)
+    for cache_copy in [copy.deepcopy(cache), pickle.loads(pickle.dumps(cache))]:
+        assert cache_copy == cache
+        assert cache_copy.max_size == 2
+        cache_copy[("b",)] = 2
+        assert cache_copy.lookup(("b",)) == 2
+        assert ("b",) not in cache
+
+
+def test_resolver_cache_keeps_existing_outputs(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("test", lambda x: x, use_cache=True, cache_max_size=1)
+    c = OmegaConf.create({"a": "${test:a}"})
+    OmegaConf.set_cache(c, {"test": {("a",): "cached"}})
+    assert c.a == "cached"
+
+
+@mark.parametrize(
+    ("kwargs", "msg"),
+    [
+        param({"cache_max_size": 10}, "require use_cache=True", id="no_cache_size"),
+        param({"cache_ttl": 10}, "require use_cache=True", id="no_cache_ttl"),
+        param({"shared_cache": True}, "require use_cache=True", id="no_cache_shared"),
+        param(
+            {"use_cache": True, "cache_max_size": 0},
+            "max_size must be at least 1, got 0",
+            id="max_size",
+        ),
+        param(
+            {"use_cache": True, "cache_ttl": -1},
+            "ttl must be positive, got -1",
+            id="ttl",
+        ),
+    ],
+)
+def test_register_resolver_invalid_cache_policy(
+    kwargs: Any, msg: str, restore_resolvers: Any
+) -> None:
+    with raises(ValueError, match=re.escape(msg)):
+        OmegaConf.register_resolver("test", lambda x: x, **kwargs)
+    assert not OmegaConf.has_resolver("test")
+
+
 def test_resolver_no_cache(restore_resolvers: Any) -> None:
     OmegaConf.register_resolver(
         "random", lambda _: random.uniform(0, 1), use_cache=False
@@ -0,0 +1,229 @@
+import copy
+import pickle
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+from pytest import mark, param, raises
+
+from omegaconf import MISSING, DictConfig, IntegerNode, OmegaConf, flag_override
+from omegaconf._resolution_index import ResolutionIndex
+from omegaconf.errors import InterpolationKeyError, InterpolationValidationError
+from tests import User
+from tests.interpolation import dereference_node
+
+
+def memoized(content: Any) -> Any:
+    cfg = OmegaConf.create(content)
+    OmegaConf.set_memoized(cfg, True)
+    return cfg
+
+
+def get_index(cfg: Any) -> ResolutionIndex:
+    index = cfg.__dict__["_resolution_index"]
+    assert isinstance(index, ResolutionIndex)
+    return index
+
+
+def test_set_memoized() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}})
+    assert not OmegaConf.is_memoized(cfg)
+    OmegaConf.set_memoized(cfg, True)
+    assert OmegaConf.is_memoized(cfg)
+    assert OmegaConf.is_memoized(cfg.a)
+    index = get_index(cfg)
+    OmegaConf.set_memoized(cfg, True)
+    assert get_index(cfg) is index
+    OmegaConf.set_memoized(cfg, False)
+    assert not OmegaConf.is_memoized(cfg)
+    OmegaConf.set_memoized(cfg, False)
+
+
+def test_set_memoized_on_child_node() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}})
+    with raises(ValueError, match="Memoization can only be set on a root config"):
+        OmegaConf.set_memoized(cfg.a, True)
+
+
+@mark.parametrize(
+    "copy_func",
+    [
+        param(copy.copy, id="copy"),
+        param(copy.deepcopy, id="deepcopy"),
+        param(lambda cfg: pickle.loads(pickle.dumps(cfg)), id="pickle"),
+    ],
+)
+def test_memoization_not_copied(copy_func: Any) -> None:
+    cfg = memoized({"a": 1, "b": "${a}"})
+    assert cfg.b == 1
+    cfg2 = copy_func(cfg)
+    assert not OmegaConf.is_memoized(cfg2)
+    assert cfg2.b == 1
+
+
+def test_memoization_dropped_when_attached() -> None:
+    cfg = OmegaConf.create({})
+    child = memoized({"a": 1})
+    with flag_override(cfg, "no_deepcopy_set_nodes", True):
+        cfg.child = child
+    assert cfg._get_node("child") is child
+    assert "_resolution_index" not in child.__dict__
+
+
+@mark.parametrize("key", ["b", "c", "d"])
+def test_memoized_result_is_reused(key: str) -> None:
+    cfg = memoized({"a": 1, "b": "${a}", "c": "x_${a}", "d": "${b}"})
+    node = dereference_node(cfg, key)
+    assert dereference_node(cfg, key) is node
+    assert get_index(cfg).get(cfg._get_node(key)) is node
+
+
+@mark.parametrize(
+    "mutate",
+    [
+        param(lambda cfg: cfg.__setattr__("a", 2), id="setattr"),
+        param(lambda cfg: cfg.__setitem__("a", 2), id="setitem"),
+        param(lambda cfg: cfg._get_node("a")._set_value(2), id="set_value"),
+        param(lambda cfg: OmegaConf.update(cfg, "a", 2), id="update"),
+        param(lambda cfg: cfg.merge_with({"a": 2}), id="merge_with"),
+        param(lambda cfg: cfg.__setattr__("a", "${z}"), id="to_interpolation"),
+        param(lambda cfg: cfg.__setattr__("b", "${z}"), id="intermediate"),
+    ],
+)
+def test_invalidation(mutate: Callable[[DictConfig], None]) -> None:
+    cfg = memoized({"a": 1, "b": "${a}", "c": "x_${b}", "z": 2})
+    assert cfg.c == "x_1"
+    mutate(cfg)
+    assert cfg.c == "x_2"
+    assert cfg.c == "x_2"
+
+
+def test_unrelated_mutation_keeps_results() -> None:
+    cfg = memoized({"a": 1, "b": "${a}", "c": "x_${b}", "d": {"e": 1}})
+    node = dereference_node(cfg, "c")
+    cfg.d.e = 2
+    cfg.z = 3
+    del cfg["z"]
+    assert len(get_index(cfg)) == 2
+    assert dereference_node(cfg, "c") is node
+
+
+def test_invalidation_on_delete() -> None:
+    cfg = memoized({"a": 1, "b": "${a}", "c": "${b}"})
+    assert cfg.c == 1
+    del cfg.a
+    with raises(InterpolationKeyError):
+        cfg.c
+    cfg.a = 3
+    assert cfg.c == 3
+    cfg.pop("a")
+    with raises(InterpolationKeyError):
+        cfg.c
+
+
+def test_invalidation_of_relative_interpolation() -> None:
+    cfg = memoized({"a": 1, "d": {"a": 2, "x": "${..a}", "y": "${.a}"}})
+    assert (cfg.d.x, cfg.d.y) == (1, 2)
+    cfg.a = 3
+    cfg.d.a = 4
+    assert (cfg.d.x, cfg.d.y) == (3, 4)
+    cfg["d"] = {"a": 5, "x": "${.a}"}
+    assert cfg.d.x == 5
+
+
+@mark.parametrize(
+    ("mutate", "expected"),
+    [
+        param(lambda lst: lst.__setitem__(0, 7), 7, id="setitem"),
+        param(lambda lst: lst.__setitem__(slice(0, 1), [7]), 7, id="setitem_slice"),
+        param(lambda lst: lst.append(7), 1, id="append"),
+        param(lambda lst: lst.insert(0, 7), 7, id="insert"),
+        param(lambda lst: lst.pop(0), 2, id="pop"),
+        param(lambda lst: lst.__delitem__(0), 2, id="delitem"),
+        param(lambda lst: lst.sort(reverse=True), 2, id="sort"),
+        param(lambda lst: lst._set_value([7]), 7, id="set_value"),
+        param(lambda lst: lst.merge_with([7]), 7, id="merge_with"),
+    ],
+)
+def test_invalidation_in_list(mutate: Callable[[Any], None], expected: Any) -> None:
+    cfg = memoized({"lst": [1, 2], "x": "${lst[0]}", "y": "y_${x}"})
+    assert (cfg.x, cfg.y) == (1, "y_1")
+    mutate(cfg.lst)
+    assert (cfg.x, cfg.y) == (expected, f"y_{expected}")
+
+
+@dataclass
+class Users:
+    users: List[User] = MISSING
+
+
+def test_invalidation_on_merge_of_missing_structured_list() -> None:
+    cfg = memoized({"users": [{"name": "a"}], "x": "${users[0]}"})
+    assert cfg.x == {"name": "a"}
+    cfg.merge_with(Users)
+    assert cfg.x == {"name": "a", "age": MISSING}
+
+
+def test_invalidation_in_tuple() -> None:
+    cfg = memoized({"a": 1, "t": ("${a}", 2), "x": "${t[0]}"})
+    assert cfg.x == 1
+    cfg.t = (3, 4)
+    assert cfg.x == 3
+    cfg.t = ("${a}", 4)
+    OmegaConf.resolve(cfg)
+    assert cfg.x == 1
+
+
+def test_container_result() -> None:
+    cfg = memoized({"c": {"v": 1}, "b": "${c}", "s": "s_${c}", "t": "${b}"})
+    assert cfg.b is cfg.c
+    assert cfg.s == "s_{'v': 1}"
+    assert cfg.t is cfg.c
+    # Results formatted from containers are not memoized since they depend on the
+    # whole content of these containers.
+    assert len(get_index(cfg)) == 2
+    cfg.c.v = 2
+    assert cfg.b.v == 2
+    assert cfg.s == "s_{'v': 2}"
+    cfg.c = {"v": 3}
+    assert cfg.b.v == 3
+    assert cfg.t.v == 3
+
+
+def test_typed_result() -> None:
+    cfg = memoized({"a": "5", "b": IntegerNode("${a}"), "c": "${b}"})
+    assert cfg.c == 5
+    cfg.a = "6"
+    assert cfg.c == 6
+    cfg.a = "x"
+    with raises(InterpolationValidationError):
+        cfg.c
+    with raises(InterpolationValidationError):
+        cfg.c
+
+
+def test_resolvers_are_not_memoized(restore_resolvers: Any) -> None:
+    calls = []
+
+    def count() -> int:
+        calls.append(1)
+        return len(calls)
+
+    OmegaConf.register_resolver("count", count)
+    cfg = memoized({"a": 1, "x": "${count:}", "y": "${a}_${count:}", "z": "${y}"})
+    assert (cfg.x, cfg.x) == (1, 2)
+    assert (cfg.y, cfg.z) == ("1_3", "1_4")
+    assert len(get_index(cfg)) == 0
+
+
+def test_results_computed_during_mutation_are_not_memoized() -> None:
+    cfg = memoized({"a": 1, "b": "${a}"})
+    index = get_index(cfg)
+    frame = index.push_frame()
+    try:
+        resolved = dereference_node(cfg, "a")
+        cfg.a = 2
+    finally:
+        index.pop_frame(frame)
+    index.store(cfg._get_node("b"), resolved, frame, allow_container=False)
+    assert len(index) == 0
+    assert cfg.b == 2
@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any, Iterator, List
+
+from pytest import fixture, raises
+
+from omegaconf import OmegaConf, resolver_stats
+from omegaconf.errors import InterpolationResolutionError
+from omegaconf.resolver_stats import ResolverCall, ResolverStats
+
+
+@fixture
+def stats(restore_resolvers: Any) -> Iterator[None]:
+    OmegaConf.enable_resolver_stats()
+    resolver_stats.reset_stats()
+    yield
+    OmegaConf.enable_resolver_stats(False)
+    resolver_stats.reset_stats()
+
+
+def test_resolver_stats_disabled_by_default(restore_resolvers: Any) -> None:
+    assert not resolver_stats.is_enabled()
+    OmegaConf.register_resolver("plus", lambda x, y: x + y)
+    cfg = OmegaConf.create({"a": "${plus:1,2}"})
+    assert cfg.a == 3
+    assert OmegaConf.resolver_stats() == {}
+
+
+def test_resolver_stats(stats: Any) -> None:
+    def fail() -> None:
+        raise ValueError("fail")
+
+    OmegaConf.register_resolver("plus", lambda x, y: x + y)
+    OmegaConf.register_resolver("fail", fail)
+    cfg = OmegaConf.create({"a": "${plus:1,2}", "b": "${plus:${a},1}", "c": "${fail:}"})
+    assert cfg.b == 4
+    with raises(InterpolationResolutionError):
+        cfg.c
+
+    result = OmegaConf.resolver_stats()
+    assert set(result) == {"plus", "fail"}
+    plus = result["plus"]
+    assert (plus.calls, plus.cache_hits, plus.errors) == (2, 0, 0)
+    assert 0 <= plus.max_time <= plus.total_time
+    assert plus.mean_time == plus.total_time / 2
+    assert (result["fail"].calls, result["fail"].errors) == (1, 1)
+
+
+def test_resolver_stats_cache_hits(stats: Any) -> None:
+    OmegaConf.register_resolver("plus", lambda x, y: x + y, use_cache=True)
+    cfg = OmegaConf.create({"a": "${plus:1,2}", "b": "${plus:1,2}", "c": "${plus:1,3}"})
+    assert (cfg.a, cfg.b, cfg.c) == (3, 3, 4)
+    assert OmegaConf.resolver_stats()["plus"].calls == 3
+    assert OmegaConf.resolver_stats()["plus"].cache_hits == 1
+
+
+def test_resolver_stats_nested_calls(stats: Any) -> None:
+    OmegaConf.register_resolver("const", lambda: 1, use_cache=True)
+    OmegaConf.register_resolver("get", lambda key, _root_: _root_[key])
+    cfg = OmegaConf.create({"a": "${const:}", "b": "${get:a}", "c": "${const:}"})
+    assert cfg.c == 1
+    assert cfg.b == 1
+    result = OmegaConf.resolver_stats()
+    # The cache hit of `const` called by `get` is not attributed to `get`.
+    assert (result["const"].calls, result["const"].cache_hits) == (2, 1)
+    assert (result["get"].calls, result["get"].cache_hits) == (1, 0)
+
+
+def test_resolver_stats_reset(stats: Any) -> None:
+    OmegaConf.register_resolver("one", lambda: 1)
+    cfg = OmegaConf.create({"a": "${one:}"})
+    cfg.a
+    assert OmegaConf.resolver_stats(reset=True)["one"].calls == 1
+    assert OmegaConf.resolver_stats() == {}
+    cfg.a
+    OmegaConf.enable_resolver_stats(False)
+    cfg.a
+    # Statistics are kept, but no longer recorded, while disabled.
+    assert OmegaConf.resolver_stats()["one"].calls == 1
+
+
+def test_resolver_stats_callback(stats: Any) -> None:
+    calls: List[ResolverCall] = []
+    OmegaConf.register_resolver("one", lambda: 1, use_cache=True)
+    cfg = OmegaConf.create({"a": "${one:}", "b": "${one:}"})
+    resolver_stats.add_callback(calls.append)
+    try:
+        assert cfg.a == cfg.b == 1
+    finally:
+        resolver_stats.remove_callback(calls.append)
+    cfg.a
+    assert [(c.name, c.cache_hit, c.failed) for c in calls] == [
+        ("one", False, False),
+        ("one", True, False),
+    ]
+    assert all(c.elapsed >= 0 for c in calls)
+
+
+def test_resolver_stats_async(stats: Any) -> None:
+    calls = []
+
+    async def twice(x: Any) -> Any:
+        await asyncio.sleep(0)
+        return x * 2
+
+    def record(x: Any) -> Any:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("twice", twice)
+    OmegaConf.register_resolver("record", record)
+    cfg = OmegaConf.create({"a": "${record:1}_${twice:1}_${twice:2}"})
+    asyncio.run(OmegaConf.resolve_async(cfg))
+    assert cfg.a == "1_2_4"
+    # Calls replayed when the resolution starts over are not counted again.
+    result = OmegaConf.resolver_stats()
+    assert result["record"] == ResolverStats(
+        calls=1,
+        total_time=result["record"].total_time,
+        max_time=result["record"].max_time,
+    )
+    assert result["twice"].calls == 2
@@ -0,0 +1,318 @@
+import copy
+from typing import Any, Dict, List
+
+from pytest import mark, param, raises
+
+from omegaconf import (
+    MISSING,
+    SI,
+    AnyNode,
+    DictConfig,
+    ListConfig,
+    OmegaConf,
+    StringNode,
+)
+from omegaconf.analysis import InterpolationInfo, InterpolationReport
+from tests import UnionAnnotations, User
+
+
+def info(key: str, **kwargs: Any) -> InterpolationInfo:
+    return InterpolationInfo(key=key, **kwargs)
+
+
+@mark.parametrize(
+    ("cfg", "expected"),
+    [
+        param({"a": 1, "b": 2}, {}, id="no_interpolation"),
+        param(
+            {"a": 1, "b": "${a}"},
+            {"b": info("b", references=["a"], targets=["a"])},
+            id="node",
+        ),
+        param(
+            {"a": 1, "b": "x_${a}_${a}"},
+            {"b": info("b", references=["a", "a"], targets=["a", "a"])},
+            id="string",
+        ),
+        param(
+            {"a": {"b": 1, "c": "${.b}", "d": {"e": "${..b}"}}},
+            {
+                "a.c": info("a.c", references=[".b"], targets=["a.b"]),
+                "a.d.e": info("a.d.e", references=["..b"], targets=["a.b"]),
+            },
+            id="relative",
+        ),
+        param(
+            {"a": [1, "${a[0]}", "${a.0}"]},
+            {
+                "a[1]": info("a[1]", references=["a[0]"], targets=["a[0]"]),
+                "a[2]": info("a[2]", references=["a.0"], targets=["a[0]"]),
+            },
+            id="list",
+        ),
+        param(
+            {"a": {"b": 1}, "c": "${a}", "d": "${c.b}"},
+            {
+                "c": info("c", references=["a"], targets=["a"]),
+                "d": info("d", references=["c.b"], targets=["a.b"]),
+            },
+            id="through_interpolation",
+        ),
+        param(
+            {"a": "${foo:1,${b}}", "b": 1},
+            {"a": info("a", references=["b"], targets=["b"], resolvers=["foo"])},
+            id="resolver",
+        ),
+        param(
+            {"a": "${foo:[${b}],{k:${b}}}", "b": 1},
+            {
+                "a": info(
+                    "a", references=["b", "b"], targets=["b", "b"], resolvers=["foo"]
+                )
+            },
+            id="resolver_containers",
+        ),
+        param(
+            {"a": "${b}", "c": "${.b}", "d": {"e": "${...b}"}, "f": [1], "g": "${f.x}"},
+            {
+                "a": info("a", references=["b"], dangling=["b"]),
+                "c": info("c", references=[".b"], dangling=[".b"]),
+                "d.e": info("d.e", references=["...b"], dangling=["...b"]),
+                "g": info("g", references=["f.x"], dangling=["f.x"]),
+            },
+            id="dangling",
+        ),
+        param(
+            {"a": 1, "b": "${a.c}", "c": [1], "d": "${c[0].x}"},
+            {
+                "b": info("b", references=["a.c"], dangling=["a.c"]),
+                "d": info("d", references=["c[0].x"], dangling=["c[0].x"]),
+            },
+            id="dangling_not_a_container",
+        ),
+        param(
+            {"a": "${b.${c}}", "b": {"x": 1}, "c": "x", "d": "${${c}:1}"},
+            {
+                "a": info("a", references=["c"], targets=["c"], static=False),
+                "d": info("d", references=["c"], targets=["c"], static=False),
+            },
+            id="dynamic_key",
+        ),
+        param(
+            {"a": "${b.x}", "b": MISSING, "c": "${d.x}", "d": {"e": MISSING}},
+            {
+                "a": info("a", references=["b.x"], static=False),
+                "c": info("c", references=["d.x"], targets=[], dangling=["d.x"]),
+            },
+            id="missing",
+        ),
+        param(
+            {"a": "${b.x}", "b": "${oc.create:{x: 1}}"},
+            {
+                "a": info("a", references=["b.x"], static=False),
+                "b": info("b", resolvers=["oc.create"]),
+            },
+            id="through_resolver",
+        ),
+    ],
+)
+def test_analyze_interpolations(
+    cfg: Any, expected: Dict[str, InterpolationInfo]
+) -> None:
+    assert OmegaConf.analyze(cfg).interpolations == expected
+
+
+def test_analyze_missing_and_none_containers() -> None:
+    cfg = OmegaConf.create(
+        {"a": "${b.x}", "b": DictConfig(MISSING), "c": "${d.x}", "d": ListConfig(None)}
+    )
+    assert OmegaConf.analyze(cfg).interpolations == {
+        "a": info("a", references=["b.x"], static=False),
+        "c": info("c", references=["d.x"], static=False),
+    }
+
+
+@mark.parametrize(
+    ("cfg", "dependencies", "cycles", "resolution_order"),
+    [
+        param(
+            {"a": "${b}", "b": "${c}", "c": 1},
+            {"a": ["b"], "b": []},
+            [],
+            ["b", "a"],
+            id="chain",
+        ),
+        param(
+            {"a": "${b}", "b": "${a}", "c": "${a}", "d": "${d}"},
+            {"a": ["b"], "b": ["a"], "c": ["a"], "d": ["d"]},
+            [["a", "b"], ["d"]],
+            ["c"],
+            id="cycles",
+        ),
+        param(
+            {"a": {"b": "${c}", "d": 1}, "c": "x_${a}", "e": "${a}"},
+            {"a.b": ["c"], "c": ["a.b"], "e": []},
+            [["a.b", "c"]],
+            ["e"],
+            id="stringified_container",
+        ),
+        param(
+            {"a": {"b": "x_${a}"}},
+            {"a.b": ["a.b"]},
+            [["a.b"]],
+            [],
+            id="stringified_parent",
+        ),
+        param(
+            {"a": {"b": "${c}"}, "c": 1, "d": "${a.b}", "e": "${f.b}", "f": "${a}"},
+            {"a.b": [], "d": ["a.b"], "e": ["f", "a.b"], "f": []},
+            [],
+            ["a.b", "d", "f", "e"],
+            id="intermediate",
+        ),
+        param(
+            {"a": {"x": 1}, "b": "${a}", "c": "${b}", "d": "${c.x}"},
+            {"b": [], "c": ["b"], "d": ["c"]},
+            [],
+            ["b", "c", "d"],
+            id="intermediate_chain",
+        ),
+        param(
+            {"a": "${b.x}", "b": "${c}", "c": "${b}"},
+            {"a": ["b"], "b": ["c"], "c": ["b"]},
+            [["b", "c"]],
+            ["a"],
+            id="intermediate_cycle",
+        ),
+        param(
+            {"a": "${b.x}", "b": "${a}"},
+            {"a": ["b"], "b": ["a"]},
+            [["a", "b"]],
+            [],
+            id="intermediate_self_reference",
+        ),
+    ],
+)
+def test_analyze_dependencies(
+    cfg: Any,
+    dependencies: Dict[str, List[str]],
+    cycles: List[List[str]],
+    resolution_order: List[str],
+) -> None:
+    report = OmegaConf.analyze(cfg)
+    assert report.dependencies == dependencies
+    assert report.cycles == cycles
+    assert report.resolution_order == resolution_order
+
+
+def test_analyze_long_chain() -> None:
+    # Deep dependency chains must not hit the recursion limit.
+    size = 5000
+    cfg: Dict[str, Any] = {f"k{i}": f"${{k{i + 1}}}" for i in range(size)}
+    cfg[f"k{size}"] = 0
+    report = OmegaConf.analyze(cfg)
+    assert report.cycles == []
+    assert report.resolution_order == [f"k{i}" for i in reversed(range(size))]
+
+
+def test_analyze_report() -> None:
+    cfg = OmegaConf.create(
+        {
+            "paths": {"root": "/data", "out": "${.root}/out"},
+            "a": "${paths.out}",
+            "b": "${oc.env:HOME}_${a}",
+            "c": "${foo:${missing}}",
+            "d": "${a}${b}",
+        }
+    )
+    report = OmegaConf.analyze(cfg)
+    assert isinstance(report, InterpolationReport)
+    assert report.dangling == {"c": ["missing"]}
+    assert report.resolvers == {"oc.env", "foo"}
+    assert report.reachable("b") == {"a", "paths.out", "paths.root"}
+    assert report.reachable("c") == set()
+    assert report.reachable("d") == {"a", "b", "paths.out", "paths.root"}
+
+
+def test_analyze_does_not_resolve(mocker: Any) -> None:
+    resolve = mocker.patch("omegaconf.base.Container._resolve_interpolation_string")
+    report = OmegaConf.analyze({"a": "${b}", "b": "${oc.env:HOME}"})
+    assert report.resolution_order == ["b", "a"]
+    resolve.assert_not_called()
+
+
+@mark.parametrize(
+    "create",
+    [
+        param(lambda d: OmegaConf.create(d, flags={"lazy": True}), id="lazy"),
+        param(lambda d: copy.copy(OmegaConf.create(d)), id="copy_on_write"),
+    ],
+)
+def test_analyze_does_not_modify_config(create: Any) -> None:
+    data = {
+        "a": 1,
+        "b": {"c": "${a}", "d": [2, "${...a}"]},
+        "e": "${b.d[0]}",
+        "f": "${b.c}",
+    }
+    cfg = create(data)
+    content = dict(cfg.__dict__["_content"])
+    report = OmegaConf.analyze(cfg)
+    assert report.interpolations == {
+        "b.c": info("b.c", references=["a"], targets=["a"]),
+        "b.d[1]": info("b.d[1]", references=["...a"], targets=["a"]),
+        "e": info("e", references=["b.d[0]"], targets=["b.d[0]"]),
+        "f": info("f", references=["b.c"], targets=["b.c"]),
+    }
+    assert report.resolution_order == ["b.c", "b.d[1]", "e", "f"]
+    # Raw values and shared children are not replaced with nodes.
+    assert all(cfg.__dict__["_content"][key] is content[key] for key in content)
+    assert cfg == data
+
+
+@mark.parametrize("flags", [param({}, id="eager"), param({"lazy": True}, id="lazy")])
+def test_analyze_subconfig(flags: Dict[str, bool]) -> None:
+    cfg = OmegaConf.create(
+        {
+            "a": 1,
+            "b": "${a}",
+            "c": "${b}",
+            "sub": {"x": "${b}", "y": "${..a}", "z": "${missing}"},
+        },
+        flags=flags,
+    )
+    report = OmegaConf.analyze(cfg.sub)
+    # Only the interpolations of "sub", and the ones they depend on, are reported.
+    assert report.interpolations == {
+        "b": info("b", references=["a"], targets=["a"]),
+        "sub.x": info("sub.x", references=["b"], targets=["b"]),
+        "sub.y": info("sub.y", references=["..a"], targets=["a"]),
+        "sub.z": info("sub.z", references=["missing"], dangling=["missing"]),
+    }
+    assert report.dependencies == {"b": [], "sub.x": ["b"], "sub.y": [], "sub.z": []}
+    assert report.resolution_order == ["b", "sub.x", "sub.y", "sub.z"]
+    assert report.reachable("sub.x") == {"a", "b"}
+    assert cfg.__dict__["_content"]["a"] == 1
+    assert type(cfg.__dict__["_content"]["a"]) is (int if flags else AnyNode)
+
+
+def test_analyze_structured_config() -> None:
+    cfg = OmegaConf.structured(User(name="${.other}"))
+    cfg_with_union = OmegaConf.create(
+        {"u": UnionAnnotations(oubf=SI("${.ubf}")), "v": StringNode("${u.ubf}")}
+    )
+    assert OmegaConf.analyze(cfg).dangling == {"name": [".other"]}
+    assert OmegaConf.analyze(cfg_with_union).interpolations == {
+        "u.oubf": info("u.oubf", references=[".ubf"], targets=["u.ubf"]),
+        "v": info("v", references=["u.ubf"], targets=["u.ubf"]),
+    }
+
+
+def test_analyze_root_interpolation() -> None:
+    cfg = OmegaConf.create("${foo}")
+    assert OmegaConf.analyze(cfg).interpolations == {}
+
+
+def test_analyze_invalid_input() -> None:
+    with raises(ValueError):
+        OmegaConf.analyze(1)
@@ -16,6 +16,7 @@ from omegaconf import (
     StringNode,
     UnionNode,
     ValidationError,
+    base,
     flag_override,
     open_dict,
     read_write,
@@ -184,6 +185,24 @@ def test_set_flags() -> None:
         c._set_flag(["readonly", "struct"], [True, False, False])
 
 
+def test_flags_allocated_when_set() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": {"c": 2}})
+    assert cfg.b._metadata.flags is None
+    assert cfg._get_node("a")._metadata.flags is None  # type: ignore
+    cfg.b._set_flag("readonly", True)
+    assert cfg.b._metadata.flags == {"readonly": True}
+    cfg.b._set_flag("readonly", None)
+    assert cfg.b._metadata.flags is None
+    assert not cfg.b._get_flag("readonly")
+
+
+def test_resolver_cache_allocated_when_used() -> None:
+    cfg = OmegaConf.create({"a": 1})
+    assert cfg._metadata.resolver_cache is None
+    assert OmegaConf.get_cache(cfg) == {}
+    assert cfg._metadata.resolver_cache is OmegaConf.get_cache(cfg)
+
+
 @mark.parametrize("no_deepcopy_set_nodes", [True, False])
 @mark.parametrize("node", [20, {"b": 10}, [1, 2]])
 def test_get_flag_after_dict_assignment(no_deepcopy_set_nodes: bool, node: Any) -> None:
@@ -191,9 +210,9 @@ def test_get_flag_after_dict_assignment(no_deepcopy_set_nodes: bool, node: Any)
     cfg._set_flag("foo", True)
     nc: Any = cfg._get_node("c")
     assert nc is not None
-    assert nc._flags_cache is None
+    assert nc._flags_cache is None or nc._flags_cache[0] != base._flags_epoch
     assert nc._get_flag("foo") is True
-    assert nc._flags_cache == {"foo": True}
+    assert nc._flags_cache == (base._flags_epoch, {"foo": True})
 
     cfg2 = OmegaConf.create(flags={"no_deepcopy_set_nodes": no_deepcopy_set_nodes})
     cfg2._set_flag("foo", False)
@@ -203,6 +222,24 @@ def test_get_flag_after_dict_assignment(no_deepcopy_set_nodes: bool, node: Any)
     assert nc._get_flag("foo") is False
 
 
+def test_flag_change_invalidates_cached_descendants() -> None:
+    cfg = OmegaConf.create({"a": {"b": {"c": 1}}, "l": [{"d": 1}]})
+    c = cfg.a.b._get_node("c")
+    d = cfg.l[0]._get_node("d")
+    assert not c._get_flag("readonly") and not d._get_flag("readonly")
+    epoch = base._flags_epoch
+    OmegaConf.set_readonly(cfg, True)
+    assert base._flags_epoch == epoch + 1
+    assert c._get_flag("readonly") and d._get_flag("readonly")
+    with read_write(cfg.a):
+        assert not c._get_flag("readonly") and d._get_flag("readonly")
+    assert c._get_flag("readonly")
+    # Nodes whose cache is stale do not start a new epoch.
+    epoch = base._flags_epoch
+    OmegaConf.set_struct(cfg.l, True)
+    assert base._flags_epoch == epoch
+
+
 @mark.parametrize("src", [[], [1, 2, 3], dict(), dict(a=10), StructuredWithMissing])
 class TestDeepCopy:
     def test_deepcopy(self, src: Any) -> None:
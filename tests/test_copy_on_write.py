@@ -0,0 +1,268 @@
+import copy
+import gc
+import pickle
+from typing import Any
+
+from pytest import fixture, mark, param, raises
+
+from omegaconf import DictConfig, ListConfig, OmegaConf, ReadonlyConfigError
+from omegaconf.errors import InterpolationKeyError
+from omegaconf._copy_on_write import Shared, _shared
+
+
+@fixture
+def cfg() -> Any:
+    return OmegaConf.create(
+        {
+            "a": 1,
+            "b": {"c": 2, "d": {"e": 3}, "f": "${..a}"},
+            "l": [1, {"g": 4}, [5]],
+            "i": "${b.c}",
+        }
+    )
+
+
+def test_copy_shares_children(cfg: Any) -> None:
+    cfg2 = copy.copy(cfg)
+    content = cfg2.__dict__["_content"]
+    assert all(type(v) is Shared for v in content.values())
+    assert content["b"].node is cfg._get_node("b")
+    assert cfg2 == cfg
+
+
+def test_access_copies_path(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    assert cfg2.b.d.e == 3
+    b2 = cfg2._get_node("b")
+    assert b2 is not cfg._get_node("b")
+    assert b2._get_parent() is cfg2
+    assert b2._get_node("d")._get_parent() is b2
+    # Siblings of the accessed nodes are still shared.
+    assert type(cfg2.__dict__["_content"]["l"]) is Shared
+    assert type(b2.__dict__["_content"]["c"]) is Shared
+    assert cfg2.b._get_full_key("d") == "b.d"
+
+
+def test_modify_copy(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    cfg2.a = 10
+    cfg2.b.d.e = 30
+    cfg2.l[1].g = 40
+    cfg2.l.append(6)
+    del cfg2.b.c
+    assert cfg2 == {
+        "a": 10,
+        "b": {"d": {"e": 30}, "f": "${..a}"},
+        "l": [1, {"g": 40}, [5], 6],
+        "i": "${b.c}",
+    }
+    assert cfg == {
+        "a": 1,
+        "b": {"c": 2, "d": {"e": 3}, "f": "${..a}"},
+        "l": [1, {"g": 4}, [5]],
+        "i": "${b.c}",
+    }
+
+
+def test_modify_source(cfg: Any) -> None:
+    b = cfg.b
+    d = cfg.b.d
+    cfg2 = cfg.copy()
+    cfg.a = 10
+    d.e = 30
+    b.c = 20
+    cfg.l[2].append(6)
+    del cfg.l[0]
+    OmegaConf.set_readonly(cfg.b, True)
+    assert cfg2 == {
+        "a": 1,
+        "b": {"c": 2, "d": {"e": 3}, "f": "${..a}"},
+        "l": [1, {"g": 4}, [5]],
+        "i": "${b.c}",
+    }
+    assert not OmegaConf.is_readonly(cfg2.b)
+    assert cfg.b.d.e == 30 and cfg.l == [{"g": 4}, [5, 6]]
+    assert cfg.b is b and cfg.b.d is d
+
+
+def test_interpolations(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    cfg2.a = 10
+    cfg2.b.c = 20
+    assert (cfg2.b.f, cfg2.i) == (10, 20)
+    assert (cfg.b.f, cfg.i) == (1, 2)
+    cfg.b.c = 30
+    assert (cfg2.i, cfg.i) == (20, 30)
+
+
+def test_copy_of_copy(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    cfg2.b.c = 20
+    cfg3 = cfg2.copy()
+    cfg2.b.c = 200
+    cfg.b.d.e = 30
+    assert cfg3.b == {"c": 20, "d": {"e": 3}, "f": "${..a}"}
+    assert cfg2.b.d.e == 3
+    cfg3.b.d.e = 300
+    assert (cfg.b.d.e, cfg2.b.d.e) == (30, 3)
+
+
+def test_flags(cfg: Any) -> None:
+    OmegaConf.set_struct(cfg, True)
+    OmegaConf.set_readonly(cfg.b, True)
+    cfg2 = cfg.copy()
+    with raises(ReadonlyConfigError):
+        cfg2.b.d.e = 30
+    with raises(AttributeError):
+        cfg2.b.x
+    OmegaConf.set_readonly(cfg2.b, False)
+    cfg2.b.d.e = 30
+    assert OmegaConf.is_readonly(cfg.b)
+    assert cfg.b.d.e == 3
+
+
+def test_list_copy() -> None:
+    lst = OmegaConf.create([1, {"a": 2}, [3]])
+    lst2 = copy.copy(lst)
+    assert isinstance(lst2, ListConfig)
+    assert all(type(v) is Shared for v in lst2.__dict__["_content"])
+    assert list(lst2) == [1, {"a": 2}, [3]]
+    lst2.insert(0, 0)
+    lst2[2].a = 20
+    lst2.sort(key=str)
+    assert lst2 == [0, 1, [3], {"a": 20}]
+    assert lst == [1, {"a": 2}, [3]]
+
+
+@mark.parametrize(
+    "copy_func",
+    [
+        param(copy.deepcopy, id="deepcopy"),
+        param(lambda cfg: pickle.loads(pickle.dumps(cfg)), id="pickle"),
+    ],
+)
+def test_copy_shared(cfg: Any, copy_func: Any) -> None:
+    cfg2 = cfg.copy()
+    cfg3 = copy_func(cfg2)
+    cfg.b.c = 20
+    cfg3.b.d.e = 30
+    assert cfg3.b.c == 2
+    assert cfg2.b == {"c": 2, "d": {"e": 3}, "f": "${..a}"}
+
+
+def test_merge_copy(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    merged = OmegaConf.merge(cfg2, {"b": {"d": {"h": 1}}, "l": [0]})
+    assert merged.b.d == {"e": 3, "h": 1}
+    assert merged.l == [0]
+    cfg2.merge_with({"b": {"c": 20}})
+    assert (cfg2.b.c, cfg.b.c) == (20, 2)
+
+
+def test_shared_nodes_are_released(cfg: Any) -> None:
+    gc.collect()
+    shared = len(_shared)
+    cfg2 = cfg.copy()
+    assert len(_shared) == shared + 4
+    cfg2.b.c
+    # "a", "l", "i", "b.d" and "b.f" are still shared.
+    assert len(_shared) == shared + 5
+    del cfg2
+    gc.collect()
+    assert len(_shared) == shared
+
+
+def test_to_container(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    assert OmegaConf.to_container(cfg2, resolve=True) == {
+        "a": 1,
+        "b": {"c": 2, "d": {"e": 3}, "f": 1},
+        "l": [1, {"g": 4}, [5]],
+        "i": 2,
+    }
+    assert repr(cfg2) == repr(cfg)
+    assert isinstance(DictConfig(cfg2).b, DictConfig)
+
+
+def test_with_updates(cfg: Any) -> None:
+    OmegaConf.set_readonly(cfg, True)
+    variant = OmegaConf.with_updates(cfg, {"a": 10, "b.d": {"x": 1}, "l[0]": 0})
+    # Only the updated paths are copied.
+    assert type(variant.__dict__["_content"]["i"]) is Shared
+    assert type(variant.b.__dict__["_content"]["c"]) is Shared
+    assert type(variant.l.__dict__["_content"][2]) is Shared
+    assert variant == {
+        "a": 10,
+        "b": {"c": 2, "d": {"e": 3, "x": 1}, "f": "${..a}"},
+        "l": [0, {"g": 4}, [5]],
+        "i": "${b.c}",
+    }
+    assert variant.b.f == 10 and cfg.b.f == 1
+    assert OmegaConf.is_readonly(variant)
+    with raises(ReadonlyConfigError):
+        variant.a = 1
+
+
+def test_with_updates_replace(cfg: Any) -> None:
+    variant = OmegaConf.with_updates(cfg, {"b.d": {"x": 1}}, merge=False)
+    assert variant.b.d == {"x": 1}
+    assert cfg.b.d == {"e": 3}
+    assert not OmegaConf.is_readonly(cfg)
+
+
+def test_with_updates_of_variant(cfg: Any) -> None:
+    variant = OmegaConf.with_updates(cfg, {"b.c": 20})
+    variant2 = OmegaConf.with_updates(variant, {"b.d.e": 30})
+    assert (variant2.i, variant2.b.d.e) == (20, 30)
+    assert (variant.i, variant.b.d.e) == (20, 3)
+    assert (cfg.i, cfg.b.d.e) == (2, 3)
+
+
+def test_with_updates_of_subconfig(cfg: Any) -> None:
+    OmegaConf.set_struct(cfg, True)
+    variant = OmegaConf.with_updates(cfg.b, {"c": 20})
+    assert variant._get_parent() is None
+    assert OmegaConf.is_struct(variant) and OmegaConf.is_readonly(variant)
+    assert variant == {"c": 20, "d": {"e": 3}, "f": "${..a}"}
+    cfg.a = 99
+    with raises(InterpolationKeyError):
+        variant.f
+    assert cfg.b.c == 2 and cfg.b.f == 99
+
+
+def test_with_updates_readonly_subtrees(cfg: Any) -> None:
+    OmegaConf.set_readonly(cfg.b, True)
+    OmegaConf.set_readonly(cfg.b.d, True)
+    variant = OmegaConf.with_updates(cfg, {"b.d.e": 30, "l[1].g": 40})
+    assert (variant.b.d.e, variant.l[1].g) == (30, 40)
+    assert OmegaConf.is_readonly(variant.b.d)
+    assert variant.b.d._get_node_flag("readonly")
+    assert (cfg.b.d.e, cfg.l[1].g) == (3, 4)
+
+
+def test_merge_readonly_shares_subtrees(cfg: Any) -> None:
+    OmegaConf.set_readonly(cfg, True)
+    merged = OmegaConf.merge(cfg, {"b": {"c": 20}})
+    assert type(merged.__dict__["_content"]["l"]) is Shared
+    assert merged.b == {"c": 20, "d": {"e": 3}, "f": "${..a}"}
+    assert OmegaConf.is_readonly(merged)
+    assert cfg.b.c == 2
+
+
+def test_leaf_flags(cfg: Any) -> None:
+    cfg2 = cfg.copy()
+    OmegaConf.set_readonly(cfg2.b._get_node("c"), True)
+    with raises(ReadonlyConfigError):
+        cfg2.b.c = 20
+    assert cfg.b._get_node("c")._get_node_flag("readonly") is None
+    cfg.b.c = 20
+    assert cfg2.b.c == 2
+
+
+def test_with_updates_leaf_flags(cfg: Any) -> None:
+    variant = OmegaConf.with_updates(cfg, {"a": 10})
+    OmegaConf.set_readonly(variant.b._get_node("c"), False)
+    assert cfg.b._get_node("c")._get_node_flag("readonly") is None
+    variant2 = OmegaConf.with_updates(cfg, {"b.c": 20})
+    assert variant2.b._get_node("c")._get_node_flag("readonly") is None
+    assert variant2.b.c == 20
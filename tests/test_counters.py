@@ -0,0 +1,60 @@
+import copy
+from typing import Iterator
+
+from pytest import fixture
+
+from omegaconf import OmegaConf, counters
+
+
+@fixture
+def reset_counters() -> Iterator[None]:
+    counters.reset()
+    yield
+    counters.disable()
+    counters.reset()
+
+
+def test_disabled_by_default(reset_counters: None) -> None:
+    assert not counters.is_enabled()
+    cfg = OmegaConf.create({"a": 1, "b": "${a}"})
+    assert cfg.b == 1
+    assert counters.snapshot() == {}
+
+
+def test_measure(reset_counters: None) -> None:
+    with counters.measure() as counts:
+        assert counts == {}
+        cfg = OmegaConf.create({"a": 1, "b": {"c": "${oc.select:x,${a}}"}})
+        assert cfg.b.c == 1
+        OmegaConf.to_container(cfg)
+        OmegaConf.merge(cfg, {"b": {"d": 2}})
+        copy.deepcopy(cfg.b)
+    assert not counters.is_enabled()
+    assert counts["parse"] >= 1
+    assert counts["parse_cache_hits"] >= 1
+    assert counts["select"] >= 1
+    assert counts["to_content"] >= 1
+    assert counts["map_merge"] >= 1
+    assert counts["node_wrap"] >= 2
+    # `copy.deepcopy(cfg.b)` copies "b" and "c".
+    assert counts["deepcopy"] >= 2
+    assert counters.snapshot() == counts
+
+
+def test_measure_excludes_previous_counts(reset_counters: None) -> None:
+    counters.enable()
+    OmegaConf.create({"a": 1})
+    previous = counters.snapshot()["node_wrap"]
+    with counters.measure() as counts:
+        OmegaConf.create({"a": 1})
+    assert counters.is_enabled()
+    assert counts == {"node_wrap": 1}
+    assert counters.snapshot()["node_wrap"] == previous + 1
+
+
+def test_incr_and_reset(reset_counters: None) -> None:
+    counters.incr("custom")
+    counters.incr("custom", 2)
+    assert counters.snapshot() == {"custom": 3}
+    counters.reset()
+    assert counters.snapshot() == {}
@@ -0,0 +1,139 @@
+import copy
+import json
+from typing import Any
+
+import yaml
+from pytest import mark, param, raises
+
+from omegaconf import EnumNode, OmegaConf, ReadonlyConfigError
+from omegaconf.errors import ConfigAttributeError
+from tests import Color, User
+
+
+def patch(added: Any = None, removed: Any = None, changed: Any = None) -> Any:
+    return {"added": added or {}, "removed": removed or [], "changed": changed or {}}
+
+
+@mark.parametrize(
+    "a, b, expected",
+    [
+        param({"a": 1}, {"a": 1}, patch(), id="same"),
+        param({"a": 1}, {"a": 2}, patch(changed={"a": 2}), id="changed"),
+        param({"a": 1}, {"a": 1, "b": [2]}, patch(added={"b": [2]}), id="added"),
+        param({"a": 1, "b": 2}, {"a": 1}, patch(removed=["b"]), id="removed"),
+        param({"a": {"b": 1}}, {"a": {"b": 2}}, patch(changed={"a.b": 2}), id="nested"),
+        param({"a": 1}, {"a": "${b}"}, patch(changed={"a": "${b}"}), id="interp"),
+        param({"a": 1}, {"a": "???"}, patch(changed={"a": "???"}), id="missing"),
+        param({"a": 1}, {"a": True}, patch(changed={"a": True}), id="type"),
+        param({"a": {"b": 1}}, {"a": None}, patch(changed={"a": None}), id="none"),
+        param({"a": 1}, {"a": [1]}, patch(changed={"a": [1]}), id="dict_to_list"),
+        param({"l": [1, 2]}, {"l": [1, 3]}, patch(changed={"l[1]": 3}), id="list_item"),
+        param(
+            {"l": [{"a": 1}]},
+            {"l": [{"a": 2}]},
+            patch(changed={"l[0].a": 2}),
+            id="list_nested",
+        ),
+        param({"l": [1, 2]}, {"l": [1]}, patch(changed={"l": [1]}), id="list_length"),
+        param([1, {"a": 1}], [2, {"a": 1}], patch(changed={"[0]": 2}), id="list_root"),
+        param(
+            {"a.b": {"c[0]": 1, "d": 1}},
+            {"a.b": {"c[0]": 2}},
+            patch(removed=[r"a\.b.d"], changed={r"a\.b.c\[0\]": 2}),
+            id="escaped_keys",
+        ),
+        param(
+            {"a": {1: "x"}},
+            {"a": {1: "y"}},
+            patch(changed={"a": {1: "y"}}),
+            id="non_string_key",
+        ),
+        param(
+            OmegaConf.create({"u": User}),
+            {"u": {"name": "Bond", "age": "???"}},
+            patch(changed={"u.name": "Bond"}),
+            id="structured",
+        ),
+        param(
+            {"c": EnumNode(Color, Color.RED)},
+            {"c": Color.BLUE},
+            patch(changed={"c": "BLUE"}),
+            id="enum",
+        ),
+    ],
+)
+def test_diff(a: Any, b: Any, expected: Any) -> None:
+    a = OmegaConf.create(a)
+    b = OmegaConf.create(b)
+    assert OmegaConf.diff(a, b) == expected
+    OmegaConf.apply_patch(a, expected)
+    assert OmegaConf.diff(a, b) == patch()
+
+
+def test_diff_lazy() -> None:
+    a = OmegaConf.create({"a": {"b": 1}, "l": [1]}, flags={"lazy": True})
+    b = OmegaConf.create({"a": {"b": 2}, "l": [2]})
+    assert OmegaConf.diff(a, b) == patch(changed={"a.b": 2, "l[0]": 2})
+    assert OmegaConf.diff(a, {"a": {"b": 1}, "l": [1]}) == patch()
+
+
+def test_diff_copy_on_write() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}, "c": {"d": {"e": 1}}})
+    variant = OmegaConf.with_updates(cfg, {"c.d.e": 2})
+    cfg.a.b = 10
+    assert OmegaConf.diff(cfg, variant) == patch(changed={"a.b": 1, "c.d.e": 2})
+    assert OmegaConf.diff(variant, copy.copy(variant)) == patch()
+
+
+@mark.parametrize(
+    "a, b",
+    [
+        param({"a": 1}, [1], id="dict_and_list"),
+        param([1], [1, 2], id="list_length"),
+        param({1: 1}, {1: 2}, id="non_string_key"),
+    ],
+)
+def test_diff_errors(a: Any, b: Any) -> None:
+    with raises(ValueError):
+        OmegaConf.diff(a, b)
+
+
+@mark.parametrize(
+    "serialize",
+    [
+        param(lambda p: OmegaConf.create(yaml.safe_dump(p)), id="yaml"),
+        param(lambda p: json.loads(json.dumps(p)), id="json"),
+    ],
+)
+def test_apply_serialized_patch(serialize: Any) -> None:
+    a = OmegaConf.create({"a": {"b": 1, "c": "${a.b}"}, "d": [1, 2], "e": 1, "x": 0})
+    b = OmegaConf.create({"a": {"b": 2, "c": "${e}"}, "d": [1, 3], "e": 1, "f": {}})
+    OmegaConf.apply_patch(a, serialize(OmegaConf.diff(a, b)))
+    assert a == b
+
+
+@mark.parametrize(
+    "a",
+    [
+        param({"a": 1, "b": {"c": 1, "d": [1]}}, id="dict"),
+        param(User, id="structured"),
+    ],
+)
+def test_apply_patch_struct(a: Any) -> None:
+    a = OmegaConf.create(a)
+    OmegaConf.set_struct(a, True)
+    b = OmegaConf.create({"b": {"d": [2], "e": 2}, "f": {"g": 1}, "name": "Bond"})
+    OmegaConf.apply_patch(a, OmegaConf.diff(a, b))
+    assert a == b
+    assert OmegaConf.is_struct(a)
+    assert OmegaConf.is_struct(a.b)
+    with raises(ConfigAttributeError):
+        a.x = 1
+
+
+def test_apply_patch_readonly() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": 2}, flags={"readonly": True})
+    with raises(ReadonlyConfigError):
+        OmegaConf.apply_patch(cfg, patch(changed={"a": 2}))
+    with raises(ReadonlyConfigError):
+        OmegaConf.apply_patch(cfg, patch(removed=["b"]))
@@ -2,18 +2,21 @@ import math
 import re
 import threading
 import time
+import warnings
 from contextlib import nullcontext
 from typing import Any, Callable, List, Optional, Set, Tuple
 
-from pytest import mark, param, raises, warns
+from pytest import fixture, mark, param, raises, warns
 
 from omegaconf import (
     AnyNode,
     Container,
     DictConfig,
     ListConfig,
+    Node,
     OmegaConf,
     _utils,
+    grammar_compiler,
     grammar_parser,
     grammar_visitor,
 )
@@ -611,39 +614,39 @@ class TestOmegaConfGrammar:
         self._visit(visit, expected)
 
 
-@mark.parametrize(
-    "expression",
-    [
-        "${foo}",
-        "${foo.bar}",
-        "${a_b.c123}",
-        "${  foo \t}",
-        "x ${ab.cd.ef.gh} y",
-        "$ ${foo} ${bar} ${boz} $",
-        "${foo:bar}",
-        "${foo-bar:bar-foo}",
-        "${foo : bar, baz, boz}",
-        "${foo:bar,0,a-b+c*d/$.%@?|}",
-        r"\${foo}",
-        "${foo.bar:boz}",
-        "${$foo.bar$.x$y}",
-        "${$0.1.2$}",
-        "${0foo}",
-        # getitem syntax
-        "${foo[bar]}",
-        "${foo.bar[baz]}",
-        "${foo[bar].baz}",
-        "${foo[bar].baz[boz]}",
-        "${[foo]}",
-        "${[foo].bar}",
-        "${[foo][bar]}",
-        # relative interpolations
-        "${..foo}",
-        "${..foo.bar}",
-        "${..foo[bar]}",
-        "${..[foo].bar}",
-    ],
-)
+SIMPLE_INTERPOLATIONS = [
+    "${foo}",
+    "${foo.bar}",
+    "${a_b.c123}",
+    "${  foo \t}",
+    "x ${ab.cd.ef.gh} y",
+    "$ ${foo} ${bar} ${boz} $",
+    "${foo:bar}",
+    "${foo-bar:bar-foo}",
+    "${foo : bar, baz, boz}",
+    "${foo:bar,0,a-b+c*d/$.%@?|}",
+    r"\${foo}",
+    "${foo.bar:boz}",
+    "${$foo.bar$.x$y}",
+    "${$0.1.2$}",
+    "${0foo}",
+    # getitem syntax
+    "${foo[bar]}",
+    "${foo.bar[baz]}",
+    "${foo[bar].baz}",
+    "${foo[bar].baz[boz]}",
+    "${[foo]}",
+    "${[foo].bar}",
+    "${[foo][bar]}",
+    # relative interpolations
+    "${..foo}",
+    "${..foo.bar}",
+    "${..foo[bar]}",
+    "${..[foo].bar}",
+]
+
+
+@mark.parametrize("expression", SIMPLE_INTERPOLATIONS)
 class TestMatchSimpleInterpolationPattern:
     def test_regex(self, expression: str) -> None:
         assert grammar_parser.SIMPLE_INTERPOLATION_PATTERN.match(expression) is not None
@@ -804,10 +807,12 @@ def test_grammar_cache_is_thread_safe() -> None:
     lexer_ids = []
     stop = threading.Event()
 
-    def check_cache_lexer_id() -> None:
+    def check_cache_lexer_id(idx: int) -> None:
         # Parse a dummy string to make sure the grammar cache is populated
         # (this also checks that multiple threads can parse in parallel).
-        grammar_parser.parse("foo")
+        # The string is unique to each thread so that it is not served by
+        # the parse cache without reaching the lexer.
+        grammar_parser.parse(f"foo_{idx}")
         # Keep track of the ID of the cached lexer.
         lexer_ids.append(id(grammar_parser._grammar_cache.data[0]))
         # Wait until we are done.
@@ -817,7 +822,7 @@ def test_grammar_cache_is_thread_safe() -> None:
     # Launch threads.
     threads = []
     for i in range(n_threads):
-        threads.append(threading.Thread(target=check_cache_lexer_id))
+        threads.append(threading.Thread(target=check_cache_lexer_id, args=(i,)))
         threads[-1].start()
 
     # Wait until all threads have reported their lexer ID.
@@ -831,3 +836,329 @@ def test_grammar_cache_is_thread_safe() -> None:
 
     # Check that each thread used a unique lexer.
     assert len(set(lexer_ids)) == n_threads
+
+
+class TestParseCache:
+    @fixture(autouse=True)
+    def clean_parse_cache(self) -> Any:
+        grammar_parser.clear_parse_cache()
+        yield
+        grammar_parser.set_parse_cache_size(grammar_parser.DEFAULT_PARSE_CACHE_SIZE)
+        grammar_parser.clear_parse_cache()
+
+    def test_hit_returns_same_tree(self) -> None:
+        tree = grammar_parser.parse("${foo}")
+        assert grammar_parser.parse("${foo}") is tree
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_key_includes_rule_and_mode(self) -> None:
+        tree = grammar_parser.parse("${foo}")
+        other = grammar_parser.parse(
+            "${foo}", parser_rule="singleElement", lexer_mode="VALUE_MODE"
+        )
+        assert other is not tree
+        assert grammar_parser.get_parse_cache_stats()["size"] == 2
+
+    def test_lru_eviction(self) -> None:
+        grammar_parser.set_parse_cache_size(2)
+        a = grammar_parser.parse("${a}")
+        grammar_parser.parse("${b}")
+        # Touch `a` so that `b` becomes the least recently used entry.
+        assert grammar_parser.parse("${a}") is a
+        grammar_parser.parse("${c}")
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["evictions"] == 1
+        assert stats["size"] == 2
+        assert grammar_parser.parse("${a}") is a
+        misses = grammar_parser.get_parse_cache_stats()["misses"]
+        grammar_parser.parse("${b}")
+        assert grammar_parser.get_parse_cache_stats()["misses"] == misses + 1
+
+    def test_shrink_evicts(self) -> None:
+        for i in range(5):
+            grammar_parser.parse(f"${{k{i}}}")
+        grammar_parser.set_parse_cache_size(3)
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats == {
+            "hits": 0,
+            "misses": 5,
+            "evictions": 2,
+            "size": 3,
+            "max_size": 3,
+        }
+
+    def test_disabled(self) -> None:
+        grammar_parser.set_parse_cache_size(0)
+        tree = grammar_parser.parse("${foo}")
+        assert grammar_parser.parse("${foo}") is not tree
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["hits"] == stats["misses"] == stats["size"] == 0
+
+    def test_errors_are_not_cached(self) -> None:
+        for _ in range(2):
+            with raises(GrammarParseError):
+                grammar_parser.parse("${foo")
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["misses"] == 2
+        assert stats["size"] == 0
+
+    def test_cached_tree_resolves_against_each_config(self) -> None:
+        # Nested interpolations are not handled by the non-ANTLR fast path.
+        cfg1 = OmegaConf.create({"k": "x", "x": 1, "y": "${${k}}"})
+        cfg2 = OmegaConf.create({"k": "x", "x": 2, "y": "${${k}}"})
+        assert cfg1.y == 1
+        assert cfg2.y == 2
+        assert grammar_parser.get_parse_cache_stats()["hits"] >= 1
+
+    @mark.parametrize("max_size", [-1, 1.5, True, "10"])
+    def test_invalid_size(self, max_size: Any) -> None:
+        with raises(ValueError, match="max_size must be a non-negative integer"):
+            grammar_parser.set_parse_cache_size(max_size)
+
+    def test_warm_up_does_not_fill_cache(self) -> None:
+        grammar_parser.warm_up()
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["size"] == stats["hits"] == stats["misses"] == 0
+
+    def test_thread_safety(self) -> None:
+        grammar_parser.set_parse_cache_size(8)
+        errors = []
+
+        def work(idx: int) -> None:
+            try:
+                for i in range(200):
+                    value = f"${{key_{(idx + i) % 16}}}"
+                    tree = grammar_parser.parse(value)
+                    assert tree.getText() == value + "<EOF>"
+            except Exception as exc:  # pragma: no cover
+                errors.append(exc)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stats = grammar_parser.get_parse_cache_stats()
+        assert stats["hits"] + stats["misses"] == 8 * 200
+        assert stats["size"] <= 8
+
+
+def _strategy_inputs() -> List[Any]:
+    inputs = []
+    for data, rule, mode in (
+        (PARAMS_SINGLE_ELEMENT_NO_INTERPOLATION, "singleElement", "VALUE_MODE"),
+        (PARAMS_SINGLE_ELEMENT_WITH_INTERPOLATION, "singleElement", "VALUE_MODE"),
+        (PARAMS_CONFIG_VALUE, "configValue", "DEFAULT_MODE"),
+    ):
+        inputs += [param(definition, rule, mode, id=key) for key, definition, _ in data]
+    return inputs
+
+
+class TestParseStrategy:
+    @fixture(autouse=True)
+    def restore_strategy(self) -> Any:
+        yield
+        grammar_parser.set_parse_strategy(grammar_parser.ParseStrategy.LL)
+
+    def _tree(self, definition: str, rule: str, mode: str) -> Any:
+        def walk(node: Any) -> Any:
+            if isinstance(node, grammar_visitor.TerminalNode):
+                return node.symbol.type, node.getText()  # type: ignore[attr-defined]
+            return type(node).__name__, [walk(child) for child in node.getChildren()]
+
+        try:
+            return walk(grammar_parser._parse(definition, rule, mode))
+        except GrammarParseError as exc:
+            return GrammarParseError, str(exc)
+
+    @mark.parametrize(("definition", "rule", "mode"), _strategy_inputs())
+    def test_sll_same_as_ll(self, definition: str, rule: str, mode: str) -> None:
+        assert grammar_parser.get_parse_strategy() is grammar_parser.ParseStrategy.LL
+        expected = self._tree(definition, rule, mode)
+        grammar_parser.set_parse_strategy(grammar_parser.ParseStrategy.SLL)
+        assert self._tree(definition, rule, mode) == expected
+        # The LL fallback must leave the parser ready for the next input.
+        assert self._tree("${foo}", "configValue", "DEFAULT_MODE")[0] == (
+            "ConfigValueContext"
+        )
+
+    def test_invalid_strategy(self) -> None:
+        with raises(ValueError, match="Invalid parse strategy: 'SLL'"):
+            grammar_parser.set_parse_strategy("SLL")  # type: ignore[arg-type]
+
+
+def _differential_inputs() -> List[Any]:
+    """
+    All the strings used as inputs in this file, to be used as `configValue`
+    expressions by the differential tests of resolution plans.
+    """
+    inputs = []
+    for data in (
+        PARAMS_SINGLE_ELEMENT_NO_INTERPOLATION,
+        PARAMS_SINGLE_ELEMENT_WITH_INTERPOLATION,
+        PARAMS_CONFIG_VALUE,
+    ):
+        for key, definition, _ in data:
+            inputs.append(param(definition, id=key))
+            # Also use the definition as a resolver argument.
+            inputs.append(param(f"${{test:{definition}}}", id=f"{key}:as_arg"))
+    inputs += [param(expr, id=f"simple:{expr}") for expr in SIMPLE_INTERPOLATIONS]
+    # Missing elements in sequences (deprecated, they trigger a warning).
+    inputs += [
+        param(expr, id=f"missing:{expr}")
+        for expr in ("${test:a,,b}", "${test:,}", "${test:[1,]}", "${test:${str},}")
+    ]
+    return inputs
+
+
+class TestPlanDifferential:
+    """
+    Resolution plans (`grammar_compiler`) must produce the exact same results as
+    `GrammarVisitor`. The non-ANTLR fast path (`compile_simple()`) may also decline
+    an expression.
+    """
+
+    def _resolve(self, resolve: Callable[[], Any]) -> Tuple[str, Any]:
+        try:
+            with warnings.catch_warnings(record=True) as record:
+                warnings.simplefilter("always")
+                value = _utils._get_value(resolve())
+            return "ok", (value, [str(w.message) for w in record])
+        except Exception as exc:
+            return "error", (type(exc), str(exc))
+
+    def _check_same_result(self, plan: Any, ref: Any) -> None:
+        if isinstance(ref, (Node, Container)):
+            assert plan is ref
+        elif isinstance(ref, float) and math.isnan(ref):
+            assert isinstance(plan, float) and math.isnan(plan)
+        else:
+            assert type(plan) is type(ref)
+            assert plan == ref
+            if isinstance(ref, (list, tuple)):
+                for plan_item, ref_item in zip(plan, ref):
+                    self._check_same_result(plan_item, ref_item)
+
+    def _visit(self, cfg: Container, node: Node, definition: str) -> Any:
+        # What `Container.resolve_parse_tree()` used to do before plans.
+        visitor = grammar_visitor.GrammarVisitor(
+            node_interpolation_callback=lambda inter_key, memo: (
+                cfg._resolve_node_interpolation(inter_key=inter_key, memo=memo)
+            ),
+            resolver_interpolation_callback=lambda name, args, args_str: (
+                cfg._evaluate_custom_resolver(
+                    key=None,
+                    node=node,
+                    inter_type=name,
+                    inter_args=args,
+                    inter_args_str=args_str,
+                )
+            ),
+            memo=None,
+        )
+        try:
+            return visitor.visit(grammar_parser.parse(definition))
+        except InterpolationResolutionError:
+            raise
+        except Exception as exc:
+            raise InterpolationResolutionError(
+                f"{type(exc).__name__} raised while resolving interpolation: {exc}"
+            )
+
+    @mark.parametrize("compile_simple", [True, False])
+    @mark.parametrize("definition", _differential_inputs())
+    def test_same_result_as_grammar_visitor(
+        self, restore_resolvers: Any, definition: str, compile_simple: bool
+    ) -> None:
+        OmegaConf.register_resolver(
+            "test", lambda *args: args[0] if len(args) == 1 else list(args)
+        )
+        OmegaConf.register_resolver("ns1.ns2.test", lambda *args: list(args))
+        if compile_simple:
+            plan = grammar_compiler.compile_simple(definition)
+            if plan is None:
+                return
+        else:
+            try:
+                tree = grammar_parser.parse(definition)
+            except GrammarParseError:
+                return
+            plan = grammar_compiler.compile_tree(tree)
+
+        cfg = BASE_TEST_CFG
+        node = AnyNode(None, parent=cfg)
+        ref = self._resolve(lambda: self._visit(cfg, node, definition))
+        res = self._resolve(
+            lambda: cfg._resolve_plan(
+                plan, node=node, key=None, memo=None, resolved_node_cache=None
+            )
+        )
+        assert res[0] == ref[0]
+        if ref[0] == "error":
+            assert res[1] == ref[1]
+        else:
+            self._check_same_result(res[1][0], ref[1][0])
+            assert res[1][1] == ref[1][1]  # same warnings
+
+    def test_compile_tree_is_memoized(self) -> None:
+        tree = grammar_parser.parse("${foo:${bar}}")
+        assert grammar_compiler.compile_tree(tree) is grammar_compiler.compile_tree(
+            tree
+        )
+
+    @mark.parametrize("expression", [e for e in SIMPLE_INTERPOLATIONS if "\\" not in e])
+    def test_accepts_simple_interpolations(self, expression: str) -> None:
+        assert grammar_compiler.compile_simple(expression) is not None
+
+    @mark.parametrize(
+        "expression",
+        [
+            "no interpolation",
+            "${foo",
+            "x ${foo",
+            "${foo}${",
+            "${:foo}",
+            "${foo\n}",
+            r"\${foo}",
+            "${foo.${bar}}",
+            "${foo:${bar}}",
+            "${foo:'hello'}",
+            "${foo:a,,b}",
+            "${foo:[1,2]}",
+        ],
+    )
+    def test_declines_other_strings(self, expression: str) -> None:
+        assert grammar_compiler.compile_simple(expression) is None
+
+    @mark.parametrize(
+        ("expression", "args", "args_str"),
+        [
+            param("${foo:}", (), (), id="no_args"),
+            param("${foo: \t}", (), (), id="no_args_ws"),
+            param(
+                "${ns.foo : a , 1\t,2.5,null,TRUE,-}",
+                ("a", 1, 2.5, None, True, "-"),
+                ("a", "1", "2.5", "null", "TRUE", "-"),
+                id="typed_args",
+            ),
+            param("${foo:007,1e}", ("007", "1e"), ("007", "1e"), id="multi_token"),
+        ],
+    )
+    def test_resolver_args(self, expression: str, args: Any, args_str: Any) -> None:
+        inter = grammar_compiler.compile_simple(expression)
+        assert isinstance(inter, grammar_compiler.ResolverInterpolation)
+        assert all(isinstance(arg, grammar_compiler.Constant) for arg in inter.args)
+        assert (
+            tuple(
+                arg.value
+                for arg in inter.args
+                if isinstance(arg, grammar_compiler.Constant)
+            )
+            == args
+        )
+        assert inter.args_str == args_str
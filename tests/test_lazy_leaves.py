@@ -0,0 +1,262 @@
+import copy
+import pickle
+from pathlib import Path
+from typing import Any
+
+from pytest import mark, param, raises
+
+from omegaconf import (
+    AnyNode,
+    DictConfig,
+    IntegerNode,
+    ListConfig,
+    OmegaConf,
+    ReadonlyConfigError,
+    counters,
+)
+from omegaconf.errors import (
+    ConfigAttributeError,
+    InterpolationToMissingValueError,
+    KeyValidationError,
+    UnsupportedValueType,
+)
+from tests import User
+
+
+def lazy(content: Any) -> Any:
+    return OmegaConf.create(content, flags={"lazy": True})
+
+
+def test_leaves_are_stored_raw() -> None:
+    cfg = lazy({"a": 1, "b": {"c": "x", "d": [1.5, True]}})
+    assert cfg.__dict__["_content"]["a"] == 1
+    assert cfg.b.__dict__["_content"]["c"] == "x"
+    assert cfg.b.d.__dict__["_content"] == [1.5, True]
+
+
+def test_subtrees_are_stored_raw() -> None:
+    cfg = lazy({"a": {"b": {"c": 1}}, "l": [[1], {"d": 2}]})
+    assert cfg.__dict__["_content"] == {"a": {"b": {"c": 1}}, "l": [[1], {"d": 2}]}
+    assert isinstance(cfg.a, DictConfig)
+    assert cfg.__dict__["_content"]["a"] is cfg.a
+    assert cfg.a.__dict__["_content"]["b"] == {"c": 1}
+    assert cfg.l[0] == [1]
+    assert isinstance(cfg.l[1], DictConfig)
+    assert cfg.l.__dict__["_content"][1]._get_parent() is cfg.l
+    assert OmegaConf.is_dict(cfg.a.b) and cfg.a.b._get_full_key("c") == "a.b.c"
+
+
+def test_subtrees_are_copied() -> None:
+    content = {"a": {"b": {"c": 1}}, "l": [[1], {"d": 2}]}
+    cfg = lazy(content)
+    assert cfg.__dict__["_content"]["a"] is not content["a"]
+    content["a"]["b"]["c"] = 2
+    content["l"][0].append(2)
+    content["l"][1]["d"] = 3
+    assert cfg == {"a": {"b": {"c": 1}}, "l": [[1], {"d": 2}]}
+    items = [{"a": [1]}]
+    lst = ListConfig(items, flags={"lazy": True})
+    assert lst.__dict__["_content"][0] is not items[0]
+    items[0]["a"].append(2)
+    assert lst == [{"a": [1]}]
+
+
+def test_subtrees_flags() -> None:
+    cfg = lazy({"a": {"b": {"c": 1}}, "l": [{"d": 2}]})
+    OmegaConf.set_struct(cfg, True)
+    OmegaConf.set_readonly(cfg, True)
+    with raises(ConfigAttributeError):
+        cfg.a.b.x
+    with raises(ReadonlyConfigError):
+        cfg.a.b.c = 2
+    with raises(ReadonlyConfigError):
+        cfg.l[0].d = 3
+    assert OmegaConf.is_readonly(cfg.a.b)
+    assert cfg == {"a": {"b": {"c": 1}}, "l": [{"d": 2}]}
+
+
+def test_subtrees_interpolations() -> None:
+    cfg = lazy({"a": {"b": "${c.d}", "e": "${..f}"}, "c": {"d": "???"}, "f": [1]})
+    assert cfg.a.e == [1]
+    with raises(InterpolationToMissingValueError):
+        cfg.a.b
+    assert OmegaConf.is_missing(cfg.c, "d")
+    cfg.c.d = 2
+    assert cfg.a.b == 2
+
+
+@mark.parametrize(
+    "content, expected",
+    [
+        param({"a": {"b": object()}}, UnsupportedValueType, id="dict_value"),
+        param({"a": [[object()]]}, UnsupportedValueType, id="list_item"),
+        param({"a": {(1, 2): 1}}, KeyValidationError, id="dict_key"),
+    ],
+)
+def test_subtrees_are_validated(content: Any, expected: Any) -> None:
+    with raises(expected):
+        lazy(content)
+
+
+def test_subtrees_with_objects_are_wrapped() -> None:
+    user = User(name="Bond", age=7)
+    content = {"a": {"u": user, "b": {"c": 1}}, "d": {"e": 1}}
+    cfg = lazy(content)
+    assert isinstance(cfg.__dict__["_content"]["a"], DictConfig)
+    assert cfg.__dict__["_content"]["d"] == {"e": 1}
+    user.name = "Joe"
+    assert cfg.a.u == {"name": "Bond", "age": 7}
+    assert cfg.a.b == {"c": 1}
+
+
+@mark.parametrize(
+    "content",
+    [
+        param({"a": None}, id="none"),
+        param({"a": "???"}, id="missing"),
+        param({"a": "${b}", "b": 1}, id="interpolation"),
+        param({"a": "x_${b}", "b": 1}, id="string_interpolation"),
+    ],
+)
+def test_special_values_are_wrapped(content: Any) -> None:
+    cfg = lazy(content)
+    assert isinstance(cfg.__dict__["_content"]["a"], AnyNode)
+
+
+def test_not_lazy_by_default() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": [2]})
+    assert isinstance(cfg.__dict__["_content"]["a"], AnyNode)
+    assert isinstance(cfg.b.__dict__["_content"][0], AnyNode)
+
+
+def test_typed_containers_wrap_leaves() -> None:
+    cfg = DictConfig({"a": 1}, element_type=int, flags={"lazy": True})
+    assert isinstance(cfg.__dict__["_content"]["a"], IntegerNode)
+    lst = ListConfig([1], element_type=int, flags={"lazy": True})
+    assert isinstance(lst.__dict__["_content"][0], IntegerNode)
+    cfg = DictConfig({1: 1}, key_type=int, flags={"lazy": True})
+    assert isinstance(cfg.__dict__["_content"][1], AnyNode)
+
+
+def test_access() -> None:
+    cfg = lazy({"a": 1, "b": "${a}", "l": [1, "${a}", 3]})
+    assert cfg.a == 1
+    assert cfg["a"] == 1
+    assert cfg.get("a") == 1
+    assert cfg.l[0] == 1
+    assert cfg.l[-1] == 3
+    assert cfg.l.get(2) == 3
+    # Reading a leaf does not wrap it in a node.
+    assert type(cfg.__dict__["_content"]["a"]) is int
+    assert cfg.l.__dict__["_content"] == [1, "${a}", 3]
+    assert type(cfg.l.__dict__["_content"][0]) is int
+    assert cfg.b == 1
+    assert cfg.l[0] == 1
+    assert cfg.l[1] == 1
+    assert cfg.l[-1] == 3
+    assert cfg.l[0:2] == [1, 1]
+    assert cfg.l.get(2) == 3
+    assert list(cfg.l) == [1, 1, 3]
+    assert 3 in cfg.l
+    assert dict(cfg.items()) == {"a": 1, "b": 1, "l": [1, 1, 3]}
+    assert cfg == {"a": 1, "b": "${a}", "l": [1, "${a}", 3]}
+
+
+def test_get_node_materializes_leaf() -> None:
+    cfg = lazy({"a": 1, "l": [1, 2, 3]})
+    node = cfg._get_node("a")
+    assert isinstance(node, AnyNode)
+    assert node._key() == "a"
+    assert node._get_parent() is cfg
+    assert cfg._get_node("a") is node
+    assert cfg.l._get_node(-1)._key() == 2
+    nodes = cfg.l._get_node(slice(0, 2))
+    assert [n._key() for n in nodes] == [0, 1]
+    assert cfg.l.__dict__["_content"][:2] == nodes
+    assert OmegaConf.get_type(cfg, "a") is int
+    assert cfg._get_full_key("a") == "a"
+
+
+def test_modification() -> None:
+    cfg = lazy({"a": 1, "l": [1, 2]})
+    cfg.a = 2
+    cfg.l[0] = 3
+    cfg.l.append(4)
+    cfg.l.insert(0, 5)
+    assert [cfg.l._get_node(i)._key() for i in range(4)] == [0, 1, 2, 3]
+    cfg.l.sort()
+    assert cfg == {"a": 2, "l": [2, 3, 4, 5]}
+    del cfg["a"]
+    assert cfg.l.pop(0) == 2
+    assert cfg == {"l": [3, 4, 5]}
+
+
+def test_readonly() -> None:
+    cfg = lazy({"a": 1, "l": [1]})
+    OmegaConf.set_readonly(cfg, True)
+    assert cfg.a == 1
+    with raises(ReadonlyConfigError):
+        cfg.a = 2
+    with raises(ReadonlyConfigError):
+        cfg.l[0] = 2
+    assert cfg == {"a": 1, "l": [1]}
+
+
+@mark.parametrize(
+    "copy_func",
+    [
+        param(copy.copy, id="copy"),
+        param(copy.deepcopy, id="deepcopy"),
+        param(lambda cfg: pickle.loads(pickle.dumps(cfg)), id="pickle"),
+    ],
+)
+def test_copy(copy_func: Any) -> None:
+    cfg = lazy({"a": 1, "b": {"c": [1, 2]}, "d": {"e": 1}})
+    cfg2 = copy_func(cfg)
+    assert cfg2 == cfg
+    assert cfg2.__dict__["_content"]["a"] == 1
+    cfg2.b.c[0] = 3
+    assert cfg.b.c[0] == 1
+    cfg2.d.e = 2
+    assert cfg.d.e == 1
+
+
+def test_conversions() -> None:
+    content = {"a": 1, "b": {"c": "x", "d": "${a}"}, "l": [1.5, False]}
+    cfg = lazy(content)
+    assert OmegaConf.to_container(cfg) == content
+    assert OmegaConf.to_container(cfg, resolve=True) == {
+        "a": 1,
+        "b": {"c": "x", "d": 1},
+        "l": [1.5, False],
+    }
+    assert OmegaConf.to_yaml(cfg) == OmegaConf.to_yaml(OmegaConf.create(content))
+    # Converting does not materialize the leaves.
+    assert cfg.__dict__["_content"]["a"] == 1
+
+
+def test_load(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("a:\n  b: 1\nc: [1, 2]\n")
+    cfg = OmegaConf.load(path, flags={"lazy": True})
+    assert cfg.__dict__["_content"] == {"a": {"b": 1}, "c": [1, 2]}
+    assert cfg == {"a": {"b": 1}, "c": [1, 2]}
+
+
+def test_merge() -> None:
+    cfg = lazy({"a": 1, "b": {"c": 2}, "l": [1]})
+    merged = OmegaConf.merge(cfg, {"b": {"d": 3}, "l": [2]})
+    assert merged == {"a": 1, "b": {"c": 2, "d": 3}, "l": [2]}
+
+
+def test_resolve() -> None:
+    cfg = lazy({"a": 1, "b": "${a}", "l": ["${b}"]})
+    OmegaConf.resolve(cfg)
+    assert cfg == {"a": 1, "b": 1, "l": [1]}
+
+
+def test_fewer_nodes_are_created() -> None:
+    with counters.measure() as counts:
+        lazy({"a": 1, "b": [1, {"c": 2}], "d": "${a}"})
+    # Only the interpolation is wrapped.
+    assert counts["node_wrap"] == 1
@@ -28,6 +28,8 @@ from omegaconf import (
     UnionNode,
     ValidationError,
 )
+from omegaconf import _merge
+from omegaconf._copy_on_write import Shared
 from omegaconf._utils import (
     ValueKind,
     _ensure_container,
@@ -75,14 +77,31 @@ def _register_resolver(register_func: Any, name: str, resolver: Any) -> None:
         register_func(name, resolver)
 
 
-@mark.parametrize(
-    ("merge_function", "input_unchanged"),
-    [
-        param(OmegaConf.merge, True, id="merge"),
-        param(OmegaConf.unsafe_merge, False, id="unsafe_merge"),
-    ],
-)
-@mark.parametrize(
+def prepared_merge(*configs: Any) -> Any:
+    return OmegaConf.prepare_merge(configs[0]).merge(*configs[1:])
+
+
+def pairwise_merge(*configs: Any) -> Any:
+    # `OmegaConf.merge()`, merging the configs one after the other.
+    target = _ensure_container(copy.deepcopy(configs[0]))
+    target._merge_with(*configs[1:], _allow_readonly_target=True)
+    return target
+
+
+def folded_merge(*configs: Any) -> Any:
+    # `OmegaConf.merge()`, folding the configs (even a single one) to merge them in a
+    # single pass when they are plain (see `omegaconf._merge`).
+    target = _ensure_container(copy.deepcopy(configs[0]))
+    if isinstance(target, DictConfig):
+        folded = _merge.fold_configs(target, configs[1:], min_configs=1)
+        if folded is not None:
+            target._merge_with(folded, _allow_readonly_target=True)
+            return target
+    target._merge_with(*configs[1:], _allow_readonly_target=True)
+    return target
+
+
+merge_cases = mark.parametrize(
     "inputs, expected",
     [
         # dictionaries
@@ -433,6 +452,17 @@ def _register_resolver(register_func: Any, name: str, resolver: Any) -> None:
         ),
     ],
 )
+
+
+@mark.parametrize(
+    ("merge_function", "input_unchanged"),
+    [
+        param(OmegaConf.merge, True, id="merge"),
+        param(prepared_merge, True, id="prepare_merge"),
+        param(OmegaConf.unsafe_merge, False, id="unsafe_merge"),
+    ],
+)
+@merge_cases
 def test_merge(
     inputs: Any,
     expected: Any,
@@ -459,6 +489,37 @@ def test_merge(
             merge_function(*configs)
 
 
+def assert_same_nodes(actual: Node, expected: Node) -> None:
+    assert type(actual) is type(expected)
+    assert actual._metadata == expected._metadata
+    if not isinstance(expected, (DictConfig, ListConfig)) or (
+        expected._is_none() or expected._is_missing() or expected._is_interpolation()
+    ):
+        assert actual._value() == expected._value()
+        return
+    assert isinstance(actual, (DictConfig, ListConfig))
+    assert len(actual) == len(expected)
+    keys = expected.keys() if isinstance(expected, DictConfig) else range(len(expected))
+    for key in keys:
+        assert_same_nodes(actual._get_node(key), expected._get_node(key))
+
+
+def assert_folded_merge_is_pairwise_merge(*configs: Any) -> None:
+    # Folding the configs must give the result (or the error) of the pairwise merges.
+    try:
+        pairwise = pairwise_merge(*configs)
+    except Exception as exc:
+        with raises(type(exc)):
+            folded_merge(*configs)
+    else:
+        assert_same_nodes(folded_merge(*configs), pairwise)
+
+
+@merge_cases
+def test_folded_merge(inputs: Any, expected: Any) -> None:
+    assert_folded_merge_is_pairwise_merge(*[OmegaConf.create(c) for c in inputs])
+
+
 def test_merge_missing_structured_keeps_interpolation_target() -> None:
     @dataclass
     class Defaults:
@@ -1345,7 +1406,7 @@ def test_merge_restores_nested_readonly_flag(merge: Any) -> None:
 
 @mark.parametrize(
     "merge, input_unchanged",
-    [(OmegaConf.merge, True), (OmegaConf.unsafe_merge, False)],
+    [(OmegaConf.merge, True), (prepared_merge, True), (OmegaConf.unsafe_merge, False)],
 )
 def test_merge_inner_node_inherits_readonly(merge: Any, input_unchanged: bool) -> None:
     cfg = OmegaConf.create({"inner": {"x": 1}})
@@ -1812,3 +1873,106 @@ def test_merge_structured_list_with_content_into_plain_list_preserves_element_ty
     assert result.aa[0].num == 42
     with raises(ValidationError):
         result.aa.append(123)
+
+
+@mark.parametrize(
+    "configs, foldable",
+    [
+        param([{"a": {"b": 1}}, {"a": {"c": 2}, "d": 1}], True, id="dicts"),
+        param([{"d": 1}, {"d": 2}, {"d": "???"}], True, id="values"),
+        param([{"d": [1]}, {"d": 2}], True, id="list_and_value"),
+        param([{"a": 1}, {"a": {"b": 1}}, {"a": 2}], False, id="dict_and_value"),
+        param([{"a": "${b}"}, {"a": 1}], False, id="replaced_interpolation"),
+        param([{"b": {"c": 1}}, {"b": {"c": 2}}], False, id="into_interpolation"),
+        param([{"x": 1}, {"x": 2}], False, id="into_typed"),
+        param(
+            [{"a": 1}, OmegaConf.create({"a": 2}, flags={"struct": True})],
+            False,
+            id="flags",
+        ),
+        param([{"a": 1}, {"a": IllegalType()}], False, id="object"),
+    ],
+)
+def test_fold_configs(configs: List[Any], foldable: bool) -> None:
+    dest = OmegaConf.create({"a": {"c": 0}, "b": "${a}", "x": IntegerNode(0)})
+    folded = _merge.fold_configs(dest, configs)
+    assert (folded is not None) is foldable
+    assert_folded_merge_is_pairwise_merge(dest, *configs)
+
+
+def test_folded_merge_error_is_pairwise_error() -> None:
+    cfg = OmegaConf.create({"a": {"x": 0}, "b": {"y": 0}}, flags={"struct": True})
+    # Merging the folded configs fails on "a.bad_a" first.
+    configs = [{"a": {"x": 1}, "b": {"bad_b": 1}}, {"a": {"bad_a": 1}}]
+    with raises(ConfigKeyError, match="bad_b"):
+        OmegaConf.merge(cfg, *configs)
+
+
+@mark.parametrize(
+    "others",
+    [
+        param([{"group": {"admin": {"name": "Bond", "age": 7}}}], id="typed_values"),
+        param([{"group": {"admin": {"age": "???"}}}, {"extra": [1]}], id="several"),
+        param([OmegaConf.create({"group": {"admin": None}})], id="none"),
+        param([{"group": {"admin": User(name="Bond")}}], id="structured"),
+        param([], id="nothing"),
+    ],
+)
+def test_prepare_merge(others: List[Any]) -> None:
+    schema = OmegaConf.create({"group": Group(admin=User(age=1)), "extra": "???"})
+    prepared = OmegaConf.prepare_merge(schema)
+    expected = OmegaConf.merge(schema, *others)
+    for _ in range(2):
+        merged = prepared.merge(*others)
+        assert merged == expected
+        assert OmegaConf.get_type(merged.group) is Group
+        assert merged.group._get_node("admin")._metadata == (
+            expected.group._get_node("admin")._metadata
+        )
+    assert schema == {"group": {"admin": {"name": "???", "age": 1}}, "extra": "???"}
+
+
+def test_prepare_merge_shares_untouched_nodes() -> None:
+    schema = OmegaConf.create({"a": {"b": IntegerNode(1), "c": {"d": 2}}, "e": [1]})
+    prepared = OmegaConf.prepare_merge(schema)
+    merged = prepared.merge({"a": {"b": 10}})
+    assert type(merged.__dict__["_content"]["e"]) is Shared
+    assert type(merged.a.__dict__["_content"]["c"]) is Shared
+    assert merged == {"a": {"b": 10, "c": {"d": 2}}, "e": [1]}
+    assert prepared.merge({"a": {"c": {"d": 3}}}).a == {"b": 1, "c": {"d": 3}}
+
+
+@mark.parametrize(
+    "schema, other, expected",
+    [
+        param(
+            {"a": {"b": IntegerNode(1)}},
+            {"a": {"b": "x"}},
+            raises(ValidationError, match=re.escape("full_key: a.b")),
+            id="validation",
+        ),
+        param(
+            OmegaConf.create({"a": {"b": 1}}, flags={"struct": True}),
+            {"a": {"c": 1}},
+            raises(ConfigKeyError, match=re.escape("full_key: a.c")),
+            id="struct",
+        ),
+    ],
+)
+def test_prepare_merge_errors(
+    schema: Any, other: Any, expected: AbstractContextManager[Any]
+) -> None:
+    prepared = OmegaConf.prepare_merge(schema)
+    with expected:
+        prepared.merge(other)
+    with expected:
+        OmegaConf.merge(schema, other)
+
+
+def test_prepare_merge_results_do_not_modify_prototype() -> None:
+    prepared = OmegaConf.prepare_merge({"a": 1, "b": {"c": IntegerNode(1)}})
+    merged = prepared.merge({"a": 2})
+    OmegaConf.set_readonly(merged._get_node("a"), True)
+    OmegaConf.set_readonly(merged.b._get_node("c"), True)
+    assert prepared.merge({"a": 3, "b": {"c": 3}}) == {"a": 3, "b": {"c": 3}}
+    assert merged == {"a": 2, "b": {"c": 1}}
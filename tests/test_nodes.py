@@ -1,5 +1,6 @@
 import copy
 import functools
+import pickle
 import re
 import sys
 from enum import Enum
@@ -25,6 +26,7 @@ from omegaconf import (
     StringNode,
     UnionNode,
     ValueNode,
+    grammar_compiler,
 )
 from omegaconf._utils import BUILTIN_VALUE_TYPES, type_str
 from omegaconf.errors import (
@@ -773,9 +775,11 @@ def test_deepcopy(obj: Any) -> None:
     cp = copy.deepcopy(obj)
     assert cp == obj
     assert id(cp) != id(obj)
-    assert obj.__dict__.keys() == cp.__dict__.keys()
-    for k in obj.__dict__.keys():
-        assert obj.__dict__[k] == cp.__dict__[k]
+    # Value nodes have no `__dict__`: compare their (pickled) state instead.
+    state, cp_state = obj.__getstate__(), cp.__getstate__()
+    assert state.keys() == cp_state.keys()
+    for k in state.keys():
+        assert state[k] == cp_state[k]
 
 
 @mark.parametrize(
@@ -1070,6 +1074,21 @@ def test_set_flags_in_init(type_: Any, flags: Dict[str, bool]) -> None:
         assert node._get_flag(f) is v
 
 
+@mark.parametrize(
+    "type_",
+    [AnyNode, IntegerNode, functools.partial(EnumNode, enum_type=Color)],
+)
+def test_init_does_not_set_flags(type_: Any, monkeypatch: Any) -> None:
+    def fail(*args: Any, **kwargs: Any) -> None:
+        assert False
+
+    # The value of a new node is set without overriding its readonly flag.
+    monkeypatch.setattr(Node, "_set_flag", fail)
+    node = type_(value="${x}", flags={"readonly": True})
+    assert node._value() == "${x}"
+    assert node._metadata.flags == {"readonly": True}
+
+
 @mark.parametrize(
     "flags",
     [
@@ -1096,6 +1115,83 @@ def test_interpolation_result_readonly(flags: Any) -> None:
         assert node._get_node_flag("readonly")
 
 
+class TestInterpolationPlan:
+    def test_plan_is_kept_by_node(self, mocker: Any) -> None:
+        cfg = OmegaConf.create({"a": 1, "b": "${oc.select:a,'x'}"})
+        parse = mocker.spy(grammar_compiler, "parse")
+        node = cfg._get_node("b")
+        assert isinstance(node, ValueNode)
+        assert cfg.b == 1
+        assert cfg.b == 1
+        assert parse.call_count == 1
+        assert node._get_interpolation_plan() is node._get_interpolation_plan()
+
+    def test_set_value_invalidates_plan(self) -> None:
+        cfg = OmegaConf.create({"a": 1, "b": 2, "c": "${a}"})
+        assert cfg.c == 1
+        cfg._get_node("c")._set_value("${b}")  # type: ignore[union-attr]
+        assert cfg.c == 2
+        cfg.c = "${a}_${b}"
+        assert cfg.c == "1_2"
+
+    def test_plan_not_pickled(self) -> None:
+        node = StringNode("${foo}")
+        plan = node._get_interpolation_plan()
+        assert "_plan" not in node.__getstate__()
+        loaded = pickle.loads(pickle.dumps(node))
+        assert loaded._get_interpolation_plan() is not plan
+        assert OmegaConf.create({"foo": "x", "bar": loaded}).bar == "x"
+
+    def test_deepcopy_shares_plan(self) -> None:
+        node = AnyNode("${foo}")
+        plan = node._get_interpolation_plan()
+        assert copy.deepcopy(node)._get_interpolation_plan() is plan
+
+
+class TestSlots:
+    @mark.parametrize(
+        "node",
+        [
+            AnyNode(1),
+            IntegerNode(1),
+            StringNode("${foo}"),
+            EnumNode(Color, "RED"),
+            LiteralNode(Literal["a", "b"], "a"),
+        ],
+    )
+    def test_value_nodes_have_no_dict(self, node: ValueNode) -> None:
+        assert not hasattr(node, "__dict__")
+        loaded = pickle.loads(pickle.dumps(node))
+        assert loaded == node
+        assert loaded._metadata == node._metadata
+
+    def test_set_state_of_older_versions(self) -> None:
+        # Pickles of older versions hold the `__dict__` of value nodes.
+        node = IntegerNode(1, key="a")
+        state = dict(node.__getstate__(), _flags_cache={"readonly": True})
+        loaded = IntegerNode.__new__(IntegerNode)
+        loaded.__setstate__(state)
+        assert loaded == 1
+        assert loaded._key() == "a"
+        assert loaded._flags_cache is None
+        assert loaded._get_flag("readonly") is None
+
+    def test_subclass_without_slots(self) -> None:
+        class UpperNode(StringNode):
+            def _validate_and_convert_impl(self, value: Any) -> str:
+                return str(value).upper()
+
+        node = UpperNode("a")
+        node.extra = 1  # type: ignore[attr-defined]
+        assert node == "A"
+        assert node.__getstate__() == {
+            "_metadata": node._metadata,
+            "_parent": None,
+            "_val": "A",
+            "extra": 1,
+        }
+
+
 @mark.skipif(
     sys.version_info < (3, 12),
     reason="Hash collision between Path and str only exists in Python 3.12+",
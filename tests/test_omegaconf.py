@@ -1,5 +1,8 @@
+import copy
 import pathlib
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Union
@@ -30,6 +33,7 @@ from omegaconf.errors import (
     InterpolationToMissingValueError,
     UnsupportedInterpolationType,
 )
+from omegaconf.resolver_cache import ResolverCache
 from tests import Color, ConcretePlugin, IllegalType, StructuredWithMissing
 
 
@@ -594,6 +598,201 @@ def test_resolve_does_not_raise_when_resolver_returns_dict_config(
     assert result["merged"] == {"x": 1, "y": 2, "z": 3}
 
 
+def test_resolve_resolves_each_interpolation_once(restore_resolvers: Any) -> None:
+    calls = []
+
+    def count(x: Any) -> Any:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("count", count)
+    cfg = OmegaConf.create(
+        {
+            "a": "${b}_${b}",
+            "b": "${c}",
+            "c": "${count:${d.e}}",
+            "d": {"e": 1, "f": "${c}"},
+        }
+    )
+    OmegaConf.resolve(cfg)
+    assert cfg == {"a": "1_1", "b": 1, "c": 1, "d": {"e": 1, "f": 1}}
+    assert calls == [1]
+
+
+@mark.parametrize(
+    "flags",
+    [param({}, id="eager"), param({"lazy": True}, id="lazy")],
+)
+def test_resolve_nested_resolves_each_interpolation_once(
+    flags: Any, restore_resolvers: Any
+) -> None:
+    calls = []
+
+    def once(x: Any) -> Any:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("once", once)
+    cfg = OmegaConf.create(
+        {"s": {"k0": "${once:0}", "k1": "${once:1}", "l": ["${once:2}"]}, "a": 1},
+        flags=flags,
+    )
+    OmegaConf.resolve(cfg)
+    assert cfg == {"s": {"k0": 0, "k1": 1, "l": [2]}, "a": 1}
+    assert calls == [0, 1, 2]
+
+
+@mark.parametrize(
+    ("cfg", "match"),
+    [
+        param({"a": "${b}", "b": "${a}"}, "between: a, b", id="cycle"),
+        param({"a": {"b": "${.b}"}}, "between: a.b", id="self"),
+        param({"a": "${b.c}", "b": "${a}"}, "between: a, b", id="intermediate"),
+    ],
+)
+def test_resolve_raises_on_cycle(cfg: Any, match: str, restore_resolvers: Any) -> None:
+    calls = []
+    OmegaConf.register_resolver("count", lambda: calls.append(1))
+    cfg = OmegaConf.create({"x": "${count:}", **cfg})
+    with raises(InterpolationResolutionError, match=f"Recursive .* {match}"):
+        OmegaConf.resolve(cfg)
+    assert calls == []
+    assert cfg._get_node("x")._value() == "${count:}"
+
+
+def test_resolve_with_executor(restore_resolvers: Any) -> None:
+    # "${wait:a}" and "${wait:f}" must run at the same time to get past the barrier.
+    barrier = threading.Barrier(2, timeout=10)
+    threads = {}
+
+    def wait(x: Any) -> Any:
+        if x in ("a", "f"):
+            barrier.wait()
+        threads[x] = threading.current_thread()
+        return x
+
+    def record(x: Any) -> Any:
+        threads[x] = threading.current_thread()
+        return x
+
+    OmegaConf.register_resolver("wait", wait, thread_safe=True)
+    OmegaConf.register_resolver("record", record)
+    cfg = OmegaConf.create(
+        {
+            "a": "${wait:a}",
+            "b": {"c": "${wait:${d}_c}", "e": "${record:e}"},
+            "d": "${record:d}",
+            "f": ["${wait:f}", "${a}_${b.c}"],
+        }
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        OmegaConf.resolve(cfg, executor=executor)
+    assert cfg == {
+        "a": "a",
+        "b": {"c": "d_c", "e": "e"},
+        "d": "d",
+        "f": ["f", "a_d_c"],
+    }
+    main = threading.current_thread()
+    assert {x: thread is main for x, thread in threads.items()} == {
+        "a": False,
+        "d": True,
+        "d_c": False,
+        "e": True,
+        "f": False,
+    }
+
+
+@mark.parametrize(
+    "create",
+    [
+        param(OmegaConf.create, id="created"),
+        param(lambda d: copy.copy(OmegaConf.create(d)), id="copy_on_write"),
+        param(lambda d: OmegaConf.create(d, flags={"lazy": True}), id="lazy"),
+    ],
+)
+def test_resolve_with_executor_is_concurrent(
+    create: Any, restore_resolvers: Any
+) -> None:
+    # All the calls must run at the same time to get past the barrier.
+    barrier = threading.Barrier(4, timeout=10)
+
+    def wait(x: Any) -> Any:
+        barrier.wait()
+        return x
+
+    OmegaConf.register_resolver("wait", wait, thread_safe=True)
+    cfg = create(
+        {
+            "a": "${wait:a}",
+            "b": {"c": "${wait:c}", "d": ["${wait:d}"]},
+            "e": "${wait:e}",
+        }
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        OmegaConf.resolve(cfg, executor=executor)
+    assert cfg == {"a": "a", "b": {"c": "c", "d": ["d"]}, "e": "e"}
+
+
+def test_resolve_with_executor_cache(restore_resolvers: Any, monkeypatch: Any) -> None:
+    # The resolver runs on the executor, its cache is only used on the calling thread.
+    cache_threads = []
+    lookup, store = ResolverCache.lookup, ResolverCache.__setitem__
+
+    def record_lookup(self: Any, *args: Any) -> Any:
+        cache_threads.append(threading.current_thread())
+        return lookup(self, *args)
+
+    def record_store(self: Any, *args: Any) -> None:
+        cache_threads.append(threading.current_thread())
+        store(self, *args)
+
+    monkeypatch.setattr(ResolverCache, "lookup", record_lookup)
+    monkeypatch.setattr(ResolverCache, "__setitem__", record_store)
+    resolver_threads = []
+
+    def upper(x: str) -> str:
+        resolver_threads.append(threading.current_thread())
+        return x.upper()
+
+    OmegaConf.register_resolver("upper", upper, use_cache=True, thread_safe=True)
+    cfg = OmegaConf.create({"a": "${upper:x}", "b": "${upper:y}", "c": "${upper:x}"})
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        OmegaConf.resolve(cfg, executor=executor)
+    assert cfg == {"a": "X", "b": "Y", "c": "X"}
+    main = threading.current_thread()
+    assert resolver_threads and all(thread is not main for thread in resolver_threads)
+    assert cache_threads and all(thread is main for thread in cache_threads)
+
+
+def test_resolve_with_executor_error(restore_resolvers: Any) -> None:
+    def fail(x: Any) -> Any:
+        raise ValueError(x)
+
+    OmegaConf.register_resolver("fail", fail, thread_safe=True)
+    cfg = OmegaConf.create({"a": 1, "b": "${fail:${a}}"})
+    with ThreadPoolExecutor() as executor:
+        with raises(
+            InterpolationResolutionError,
+            match="ValueError raised while resolving interpolation: 1",
+        ):
+            OmegaConf.resolve(cfg, executor=executor)
+
+
+def test_resolve_subconfig() -> None:
+    cfg = OmegaConf.create(
+        {"a": "${b}", "b": "${c}", "c": 1, "d": {"e": "${b}", "f": "${a}"}}
+    )
+    OmegaConf.resolve(cfg.d)
+    assert OmegaConf.to_container(cfg, resolve=False) == {
+        "a": "${b}",
+        "b": "${c}",
+        "c": 1,
+        "d": {"e": 1, "f": 1},
+    }
+
+
+
 @mark.parametrize(
     "cfg, expected",
     [